@@ -0,0 +1,79 @@
+"""
+Logging overhead benchmark.
+
+Measures debug logging done by `S3WM._dispatch_event` for every event
+while log level is INFO: f-strings passed to loguru (as before)
+and the same messages passed to `hot_log`.
+
+Run it with `PYTHONPATH=. python benchmarks/hot_log.py`.
+"""
+import logging
+import timeit
+from typing import Any, Callable
+
+from loguru import logger
+from Xlib.protocol.event import KeyPress
+
+from s3wm_core.log import hot_log
+
+REPEATS = 100_000
+
+
+def log_with_fstrings(event: Any) -> None:
+    """
+    Log the way event dispatch did before.
+
+    :param event: X11 event.
+    """
+    logger.debug(f"Received event: {event.__class__}")
+    logger.debug(f"Found event_handler: {'handle_keypress'}")
+    logger.debug(f"Event info: {event}")
+    logger.debug("event handled")
+
+
+def log_with_hot_log(event: Any) -> None:
+    """
+    Log the way event dispatch does now.
+
+    :param event: X11 event.
+    """
+    hot_log.debug("Received event: {}", event.__class__)
+    hot_log.debug("Found event_handler: {}", "handle_keypress")
+    hot_log.debug("Event info: {}", event)
+    hot_log.debug("event handled")
+
+
+def bench(name: str, log: Callable[[Any], None], event: Any) -> float:
+    """
+    Measure logging of a single event.
+
+    :param name: name of the case.
+    :param log: logging function.
+    :param event: X11 event.
+    :return: nanoseconds per event.
+    """
+    elapsed = timeit.timeit(lambda: log(event), number=REPEATS) / REPEATS * 1e9
+    print(f"{name:>10}: {elapsed:8.1f} ns/event")  # noqa: WPS421
+    return elapsed
+
+
+if __name__ == "__main__":
+    logger.remove()
+    logger.add(lambda _: None, level=logging.INFO)
+    hot_log.configure(logging.INFO)
+    key_press = KeyPress(
+        detail=38,
+        time=0,
+        root=0,
+        window=0,
+        child=0,
+        root_x=0,
+        root_y=0,
+        event_x=0,
+        event_y=0,
+        state=0,
+        same_screen=1,
+    )
+    before = bench("f-strings", log_with_fstrings, key_press)
+    after = bench("hot_log", log_with_hot_log, key_press)
+    print(f"{before / after:.0f}x less overhead per event")  # noqa: WPS421
@@ -0,0 +1,96 @@
+"""
+Key dispatch benchmark.
+
+Measures `get_key_combination` for bindings of the default config
+with and without lock modifiers pressed, and compares the number
+of passive grabs with grabbing every possible lock combination.
+X11 connection is replaced with a keyboard that maps keysyms
+to keycodes directly.
+
+Run it with `python benchmarks/keymap_dispatch.py`.
+"""
+import timeit
+from types import SimpleNamespace
+from typing import Any, Iterator, List, Tuple
+
+from loguru import logger
+from Xlib import XK, X
+
+from s3wm_core import keymap
+from s3wm_core.wm_config import default_combinations
+
+REPEATS = 1_000_000
+# NumLock, CapsLock and ScrollLock, as grabbed by many WMs.
+ALL_LOCKS = X.LockMask | X.Mod2Mask | X.Mod5Mask
+
+
+class FakeRoot:
+    """Root window that counts grabs."""
+
+    def __init__(self) -> None:
+        self.grabs = 0
+
+    def grab_key(self, *args: Any) -> None:
+        self.grabs += 1
+
+    def ungrab_key(self, *args: Any) -> None:
+        self.grabs -= 1
+
+
+class FakeDisplay:
+    """Keyboard with NumLock on Mod2 and without ScrollLock."""
+
+    def __init__(self) -> None:
+        self.root = FakeRoot()
+
+    def screen(self) -> Any:
+        return SimpleNamespace(root=self.root)
+
+    def keysym_to_keycodes(self, keysym: int) -> Iterator[Tuple[int, int]]:
+        if keysym != XK.XK_Scroll_Lock:
+            yield keysym % 256, 0
+
+    def get_modifier_mapping(self) -> List[List[int]]:
+        modifiers: List[List[int]] = [[] for _ in range(8)]
+        modifiers[4].append(XK.XK_Num_Lock % 256)
+        return modifiers
+
+
+def bench(name: str, event: Any) -> None:
+    """
+    Measure dispatch of a single event.
+
+    :param name: name of the case.
+    :param event: KeyPress-like event.
+    """
+
+    def dispatch() -> None:
+        keymap.get_key_combination(event)
+
+    elapsed = timeit.timeit(dispatch, number=REPEATS) / REPEATS
+    found = keymap.get_key_combination(event) is not None
+    print(f"{name:>22}: {elapsed * 1e9:6.1f} ns/event, found: {found}")  # noqa: WPS421
+
+
+if __name__ == "__main__":
+    logger.remove()
+    display: Any = FakeDisplay()
+    keymap.set_lock_mask(keymap.get_lock_mask(display))
+    keymap.update_keymap(display, default_combinations)
+    all_variants = 2 ** bin(ALL_LOCKS).count("1")
+    print(  # noqa: WPS421
+        f"{len(keymap.keycode_mapping)} bindings, "
+        f"{display.root.grabs} grabs "
+        f"(every lock combination: {len(keymap.keycode_mapping) * all_variants})",
+    )
+    combination = default_combinations[0]
+    code = combination.key % 256
+    bench("plain", SimpleNamespace(detail=code, state=combination.modifiers))
+    bench(
+        "numlock + capslock",
+        SimpleNamespace(
+            detail=code,
+            state=combination.modifiers | X.Mod2Mask | X.LockMask,
+        ),
+    )
+    bench("unbound", SimpleNamespace(detail=code, state=X.ControlMask))
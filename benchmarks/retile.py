@@ -0,0 +1,78 @@
+"""
+Retile latency benchmark.
+
+Measures how long `Tab.update_layout` takes depending on
+the number of windows on a tab. X11 connection is replaced
+with a recorder, so only WM side cost and number of
+issued requests are measured.
+
+Run it with `python benchmarks/retile.py`.
+"""
+import timeit
+from typing import Any, List
+
+from loguru import logger
+
+from s3wm.layouts.default_tile.tab import Tab
+from s3wm_core.x_models import ScreenGeometry
+
+WINDOW_COUNTS = (1, 2, 5, 10, 20, 50, 100)
+REPEATS = 200
+
+
+class RecordingScreen:
+    """Screen that never talks to X server."""
+
+    geom = ScreenGeometry(width=1920, height=1080)
+
+    def __init__(self) -> None:
+        self.flushes = 0
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+class RecordingWindow:
+    """Window that counts requests instead of sending them."""
+
+    def __init__(self, screen: RecordingScreen, window_id: int) -> None:
+        self.screen = screen
+        self.id = window_id
+        self.requests = 0
+
+    def configure(self, **kwargs: Any) -> None:
+        self.requests += 1
+
+
+def bench(windows_count: int) -> None:
+    """
+    Measure single retile for a number of windows.
+
+    :param windows_count: number of windows on a tab.
+    """
+    screen = RecordingScreen()
+    tab = Tab()
+    windows: List[Any] = [
+        RecordingWindow(screen, window_id) for window_id in range(windows_count)
+    ]
+    tab.set_order(windows)
+
+    def full_retile() -> None:
+        tab.applied_geometry.clear()
+        tab.update_layout()
+
+    elapsed = timeit.timeit(full_retile, number=REPEATS) / REPEATS
+    unchanged = timeit.timeit(tab.update_layout, number=REPEATS) / REPEATS
+    requests = sum(window.requests for window in windows) // REPEATS
+    print(  # noqa: WPS421
+        f"{windows_count:>4} windows: {elapsed * 1e6:9.1f} us/retile, "
+        f"{requests} requests, {screen.flushes // REPEATS} flush; "
+        f"unchanged: {unchanged * 1e6:9.1f} us/retile, "
+        f"{tab.configures_skipped // REPEATS} skipped",
+    )
+
+
+if __name__ == "__main__":
+    logger.remove()
+    for count in WINDOW_COUNTS:
+        bench(count)
@@ -0,0 +1,72 @@
+"""
+Process launch latency benchmark.
+
+Compares starting a process with `subprocess.Popen(shell=True)`
+and with the s3wm launcher. Two numbers are printed:
+time until the call returns (window manager is busy)
+and time until a trivial process exits (how fast the target is executed).
+
+Run it with `python benchmarks/spawn.py`.
+"""
+import os
+import time
+from subprocess import Popen
+from typing import Any, Callable
+
+from loguru import logger
+
+from s3wm_core.launcher import Command, launcher
+
+REPEATS = 200
+COMMAND = "true --some-argument"
+
+
+def report(name: str, start: Callable[[], Callable[[], Any]]) -> None:
+    """
+    Print mean launch time.
+
+    :param name: benchmark name.
+    :param start: function that starts a process and returns its waiter.
+    """
+    returned = 0.0
+    exited = 0.0
+    for _ in range(REPEATS):
+        started_at = time.perf_counter()
+        wait = start()
+        returned += time.perf_counter() - started_at
+        wait()
+        exited += time.perf_counter() - started_at
+    launcher.children.clear()
+    print(  # noqa: WPS421
+        f"{name:>20}: {returned / REPEATS * 1e6:8.1f} us to return, "
+        f"{exited / REPEATS * 1e6:8.1f} us to exit",
+    )
+
+
+def popen_shell() -> Callable[[], Any]:
+    """
+    Start process the old way.
+
+    :return: function to wait for the process.
+    """
+    return Popen(COMMAND, shell=True).wait
+
+
+def spawn(command: Command) -> Callable[[], Any]:
+    """
+    Start process with launcher.
+
+    :param command: parsed command.
+    :return: function to wait for the process.
+    """
+    pid = launcher.spawn(command)
+    return lambda: os.waitpid(pid or -1, 0)
+
+
+if __name__ == "__main__":
+    logger.remove()
+    direct = Command(COMMAND)
+    shell = Command(f"{COMMAND} > /dev/null")
+    report("Popen(shell=True)", popen_shell)
+    report("launcher (direct)", lambda: spawn(direct))
+    report("launcher (sh -c)", lambda: spawn(shell))
@@ -0,0 +1,116 @@
+"""
+X models building benchmark.
+
+Compares building window models from Xlib replies
+with pydantic ORM models and with NamedTuples from `s3wm_core.x_models`.
+Pydantic is not a dependency of s3wm, install it to compare.
+
+Run it with `python benchmarks/x_models.py`.
+"""
+import timeit
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from s3wm_core.x_models import WindowGeometry, XMapState, XWindowAttributes
+
+REPEATS = 100000
+
+GEOMETRY_REPLY = SimpleNamespace(
+    x=10,
+    y=10,
+    width=800,
+    height=600,
+    border_width=0,
+    depth=24,
+    sequence_number=42,
+)
+ATTRIBUTES_REPLY = SimpleNamespace(
+    backing_store=0,
+    sequence_number=42,
+    visual=33,
+    bit_gravity=0,
+    win_gravity=1,
+    backing_bit_planes=0,
+    backing_pixel=0,
+    save_under=0,
+    map_is_installed=1,
+    map_state=2,
+    override_redirect=0,
+    colormap=32,
+    all_event_masks=0,
+    your_event_mask=0,
+    do_not_propagate_mask=0,
+)
+
+
+def report(name: str, build: Callable[[], Any]) -> None:
+    """
+    Print time of building one model.
+
+    :param name: benchmark name.
+    :param build: function that builds a model.
+    """
+    elapsed = timeit.timeit(build, number=REPEATS) / REPEATS
+    print(f"{name:>30}: {elapsed * 1e6:7.2f} us")  # noqa: WPS421
+
+
+def bench_pydantic() -> None:
+    """Measure pydantic models if pydantic is installed."""
+    try:
+        from pydantic import BaseModel  # noqa: WPS433
+    except ImportError:
+        print("pydantic is not installed, skipping.")  # noqa: WPS421
+        return
+
+    class PydanticGeometry(BaseModel):
+        x: int  # noqa: WPS111
+        y: int  # noqa: WPS111
+        width: int
+        height: int
+        border_width: int
+        depth: int
+        sequence_number: int
+
+        class Config:
+            orm_mode = True
+
+    class PydanticAttributes(BaseModel):
+        backing_store: int
+        sequence_number: int
+        visual: int
+        bit_gravity: int
+        win_gravity: int
+        backing_bit_planes: int
+        backing_pixel: int
+        save_under: int
+        map_is_installed: int
+        map_state: XMapState
+        override_redirect: bool
+        colormap: int
+        all_event_masks: int
+        your_event_mask: int
+        do_not_propagate_mask: int
+
+        class Config:
+            orm_mode = True
+
+    report(
+        "pydantic geometry",
+        lambda: PydanticGeometry.from_orm(GEOMETRY_REPLY),
+    )
+    report(
+        "pydantic attributes",
+        lambda: PydanticAttributes.from_orm(ATTRIBUTES_REPLY),
+    )
+
+
+if __name__ == "__main__":
+    bench_pydantic()
+    report(
+        "NamedTuple geometry",
+        lambda: WindowGeometry.from_reply(GEOMETRY_REPLY),
+    )
+    report(
+        "NamedTuple attributes",
+        lambda: XWindowAttributes.from_reply(ATTRIBUTES_REPLY),
+    )
@@ -5,16 +5,16 @@ from Xlib import X
 
 from s3wm.layouts import DefaultTile
 from s3wm.s3wm import S3WM
-from s3wm_core import KeyCombination, kill_wm
+from s3wm_core import KeyCombination, background, kill_wm
 
 layout = DefaultTile  # Default tile layout.
 layout.gaps = 10
 
 
-def send_request_to_httpbin(_: S3WM) -> None:
+def send_request_to_httpbin(wm: S3WM) -> None:
     """Send request to server and notify about the state."""
     # Send response.
-    response = requests.get("https://httpbin.org/get")
+    response = requests.get("https://httpbin.org/get", timeout=10)
     message = "HTTPBIN is down."
     if response.ok:
         message = "HTTPBIN is alive."
@@ -24,6 +24,8 @@ def send_request_to_httpbin(_: S3WM) -> None:
         f'notify-send -u critical -a "HTTPBIN status" "HTTPBIN status" "{message}"',
         shell=True,
     )
+    # Layout must be changed from the event loop.
+    wm.executor.call_in_loop(wm.layout.change_tab, 0)
 
 
 combinations = [
@@ -40,7 +42,8 @@ combinations = [
     KeyCombination(
         modifiers=KeyCombination.default_mod_key | X.ShiftMask,
         key="h",
-        action=send_request_to_httpbin,
+        # Slow actions run in background, so they don't freeze the WM.
+        action=background(send_request_to_httpbin, timeout=10),
     ),
     *layout.get_keys(),
 ]
@@ -1,9 +1,7 @@
-from subprocess import Popen
-
 from Xlib import X
 
 from s3wm.layouts import DefaultTile
-from s3wm_core import KeyCombination, kill_wm
+from s3wm_core import KeyCombination, kill_wm, spawn
 
 layout = DefaultTile  # Default tile layout.
 layout.gaps = 10
@@ -11,7 +9,7 @@ layout.gaps = 10
 
 def startup() -> None:
     """Action to perform on window manager startup."""
-    Popen("nitrogen --restore", shell=True)
+    spawn("nitrogen --restore")
 
 
 combinations = [
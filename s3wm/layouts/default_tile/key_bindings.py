@@ -1,6 +1,7 @@
 from typing import Callable
 
 from s3wm.s3wm import S3WM
+from s3wm_core.autorepeat import RepeatableAction, repeatable
 
 
 def change_tab(tab_index: int) -> Callable[[S3WM], None]:
@@ -22,7 +23,7 @@ def change_tab(tab_index: int) -> Callable[[S3WM], None]:
     return change_layout_tab
 
 
-def move_focus(prev: bool) -> Callable[[S3WM], None]:
+def move_focus(prev: bool) -> RepeatableAction:
     """
     Change currently focused window.
 
@@ -32,16 +33,18 @@ def move_focus(prev: bool) -> Callable[[S3WM], None]:
     :return: function to change focus.
     """
 
-    def change_focus(wm: S3WM) -> None:
+    @repeatable
+    def change_focus(wm: S3WM, count: int) -> None:
         """
         Actually change focus.
 
         :param wm: current window manager.
+        :param count: number of key presses.
         """
         if prev:
-            wm.layout.focus_prev()
+            wm.layout.focus_prev(count)
         else:
-            wm.layout.focus_next()
+            wm.layout.focus_next(count)
 
     return change_focus
 
@@ -74,7 +77,7 @@ def kill_focused_window(wm: S3WM) -> None:
     wm.layout.kill_focused_window()
 
 
-def change_gaps(delta: int) -> Callable[[S3WM], None]:
+def change_gaps(delta: int) -> RepeatableAction:
     """
     Change gaps between windows.
 
@@ -82,18 +85,20 @@ def change_gaps(delta: int) -> Callable[[S3WM], None]:
     :returns: function to change gaps.
     """
 
-    def gap_changer(wm: S3WM) -> None:
+    @repeatable
+    def gap_changer(wm: S3WM, count: int) -> None:
         """
         Actual function to update gaps.
 
         :param wm: window manager.
+        :param count: number of key presses.
         """
-        wm.layout.change_gap_value(delta)
+        wm.layout.change_gap_value(delta * count)
 
     return gap_changer
 
 
-def change_window_size(delta: int) -> Callable[[S3WM], None]:
+def change_window_size(delta: int) -> RepeatableAction:
     """
     Function to generate function to change window size.
 
@@ -101,13 +106,15 @@ def change_window_size(delta: int) -> Callable[[S3WM], None]:
     :returns: function to change window size.
     """
 
-    def size_changer(wm: S3WM) -> None:
+    @repeatable
+    def size_changer(wm: S3WM, count: int) -> None:
         """
         Actually change size.
 
         :param wm: window manager.
+        :param count: number of key presses.
         """
-        wm.layout.change_main_window_size(delta)
+        wm.layout.change_main_window_size(delta * count)
 
     return size_changer
 
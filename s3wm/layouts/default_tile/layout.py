@@ -1,6 +1,7 @@
 from collections import defaultdict
-from typing import DefaultDict, List
+from typing import Any, Callable, DefaultDict, Dict, List, Optional, Set, Tuple
 
+from loguru import logger
 from Xlib.X import ShiftMask
 
 from s3wm.layouts.default_tile.key_bindings import (
@@ -15,6 +16,12 @@ from s3wm.layouts.default_tile.key_bindings import (
 )
 from s3wm.layouts.default_tile.tab import Tab
 from s3wm.s3wm import S3WM
+from s3wm_core.event_stream import (
+    FOCUS_CHANGED,
+    LAYOUT_RETILED,
+    TAB_CHANGED,
+    EventStream,
+)
 from s3wm_core.key_combination import KeyCombination
 from s3wm_core.layout_base import AbstractLayoutManager
 from s3wm_core.s3window import S3window
@@ -33,10 +40,17 @@ class DefaultTile(AbstractLayoutManager):
         :param wm: S3WM instance.
         """
         super().__init__(wm)
+        self.registry = wm.windows
+        self.events: EventStream = wm.events
         self.tab_class.gaps = self.gaps
         self.tabs: DefaultDict[int, Tab] = defaultdict(self.tab_class)
         self.current_tab = 0
         self.tabs[self.current_tab].focus()
+        # Tab index and position of windows from a session snapshot.
+        self._placement: Dict[int, Tuple[int, int]] = {}
+        self._restored_focus: Dict[int, int] = {}
+        # Focused window reported to event subscribers.
+        self._reported_focus: Optional[int] = None
 
     def add_window(self, window: S3window) -> None:
         """
@@ -44,15 +58,38 @@ class DefaultTile(AbstractLayoutManager):
 
         :param window: new window.
         """
-        self.tabs[self.current_tab].add_window(window)
+        if self.registry.get_owner(window.id) is not None:
+            return
+        placement = self._placement.get(window.id)
+        if placement is None:
+            tab = self.tabs[self.current_tab]
+            tab.add_window(window)
+        else:
+            tab = self.tabs[placement[0]]
+            tab.restore_window(window)
+        self.registry.set_owner(window.id, tab)
+
+    def will_show_window(self, window: S3window) -> bool:
+        """
+        Check if window goes to the current tab.
+
+        :param window: window that is going to be added.
+        :return: False if window is restored to a hidden tab.
+        """
+        placement = self._placement.get(window.id)
+        return placement is None or placement[0] == self.current_tab
 
     def remove_window(self, window: S3window) -> None:
         """
-        Remove window from current layout.
+        Remove window from the tab it belongs to.
 
         :param window: removed window.
         """
-        self.tabs[self.current_tab].remove_window(window)
+        tab = self.registry.get_owner(window.id)
+        if tab is None:
+            return
+        self.registry.set_owner(window.id, None)
+        tab.remove_window(window)
 
     def change_tab(self, tab_number: int) -> None:
         """
@@ -63,16 +100,26 @@ class DefaultTile(AbstractLayoutManager):
         if tab_number == self.current_tab:
             return
         self.tabs[self.current_tab].lose_focus()
+        previous = self.current_tab
         self.current_tab = tab_number
         self.tabs[self.current_tab].focus()
+        self.events.emit(TAB_CHANGED, tab=tab_number, previous=previous)
+
+    def focus_next(self, steps: int = 1) -> None:
+        """
+        Focus next window on the current tab.
+
+        :param steps: number of windows to move focus by.
+        """
+        self.tabs[self.current_tab].focus_next(steps)
 
-    def focus_next(self) -> None:
-        """Focus next window on the current tab."""
-        self.tabs[self.current_tab].focus_next()
+    def focus_prev(self, steps: int = 1) -> None:
+        """
+        Focus previous window on the current tab.
 
-    def focus_prev(self) -> None:
-        """Focus previous window on the current tab."""
-        self.tabs[self.current_tab].focus_prev()
+        :param steps: number of windows to move focus by.
+        """
+        self.tabs[self.current_tab].focus_prev(steps)
 
     def move_focused_window(self, tab_index: int) -> None:
         """
@@ -80,14 +127,19 @@ class DefaultTile(AbstractLayoutManager):
 
         :param tab_index: to which tab do we need to move.
         """
+        if tab_index == self.current_tab:
+            return
         window = self.tabs[self.current_tab].pop_focused_window()
         if window:
-            self.tabs[tab_index].add_window(window)
+            tab = self.tabs[tab_index]
+            tab.add_window(window)
+            self.registry.set_owner(window.id, tab)
 
     def kill_focused_window(self) -> None:
         """Kill focused window."""
         window = self.tabs[self.current_tab].pop_focused_window()
         if window:
+            self.registry.set_owner(window.id, None)
             window.destroy()
 
     def change_gap_value(self, gap_delta: int) -> None:
@@ -98,7 +150,7 @@ class DefaultTile(AbstractLayoutManager):
         """
         self.tab_class.gaps = min(self.tab_class.gaps + gap_delta, 100)
         self.tab_class.gaps = max(0, self.tab_class.gaps)
-        self.tabs[self.current_tab].update_layout()
+        self.tabs[self.current_tab].schedule_layout()
 
     def change_main_window_size(self, delta: int) -> None:
         """
@@ -122,7 +174,215 @@ class DefaultTile(AbstractLayoutManager):
 
         :param window: window that pointer focusing at.
         """
-        self.tabs[self.current_tab].change_focused_window(window)
+        tab = self.tabs[self.current_tab]
+        if self.registry.get_owner(window.id) is tab:
+            tab.change_focused_window(window)
+
+    def flush_layout(self) -> None:
+        """
+        Update layout of all tabs that were changed.
+
+        Retiles and focus changes of the whole batch
+        are reported to event subscribers here.
+        """
+        if self._placement:
+            self._finish_restore()
+        for index, tab in self.tabs.items():
+            if not tab.dirty:
+                continue
+            tab.update_layout()
+            if tab.windows and self.events.wants(LAYOUT_RETILED):
+                self.events.emit(
+                    LAYOUT_RETILED,
+                    tab=index,
+                    windows=list(tab.windows),
+                )
+        focused = self.get_focused_window()
+        if focused != self._reported_focus:
+            self._reported_focus = focused
+            self.events.emit(FOCUS_CHANGED, window=focused, tab=self.current_tab)
+
+    def configure_stats(self) -> Tuple[int, int]:
+        """
+        Count configure requests sent by all tabs.
+
+        :return: number of issued and skipped configure requests.
+        """
+        issued = sum(tab.configures_issued for tab in self.tabs.values())
+        skipped = sum(tab.configures_skipped for tab in self.tabs.values())
+        return issued, skipped
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get number of tabs, retile and configure counters of all tabs.
+
+        :return: counters by name.
+        """
+        issued, skipped = self.configure_stats()
+        return {
+            "tabs": len(self.tabs),
+            "retiles": sum(tab.retiles for tab in self.tabs.values()),
+            "configures_issued": issued,
+            "configures_skipped": skipped,
+        }
+
+    def get_window_ids(self) -> Set[int]:
+        """
+        Get ids of windows in all tabs.
+
+        :return: X11 window ids.
+        """
+        return {window_id for tab in self.tabs.values() for window_id in tab.windows}
+
+    def get_tabs(self) -> List[Dict[str, Any]]:
+        """
+        Describe tabs with windows.
+
+        :return: index, visibility, windows and focused window of every tab.
+        """
+        tabs = []
+        for index, tab in sorted(self.tabs.items()):
+            if not tab.windows and index != self.current_tab:
+                continue
+            focused = tab.focused_window
+            tabs.append(
+                {
+                    "index": index,
+                    "visible": tab.visible,
+                    "windows": list(tab.windows),
+                    "focused": focused.id if focused else None,
+                    "main_window_size": tab.main_window_size,
+                },
+            )
+        return tabs
+
+    def get_focused_window(self) -> Optional[int]:
+        """
+        Get focused window of the current tab.
+
+        :return: X11 window id.
+        """
+        focused = self.tabs[self.current_tab].focused_window
+        return focused.id if focused else None
+
+    def get_commands(self) -> Dict[str, Callable[..., Any]]:
+        """
+        Get tab and window operations for the control socket.
+
+        Tabs are numbered from 0. Arguments are converted to int,
+        so tabs aren't created for indexes of other types.
+
+        :return: commands by name.
+        """
+        return {
+            "change_tab": lambda index: self.change_tab(int(index)),
+            "move_focused_window": lambda index: self.move_focused_window(int(index)),
+            "focus_next": lambda steps=1: self.focus_next(int(steps)),
+            "focus_prev": lambda steps=1: self.focus_prev(int(steps)),
+            "kill_focused_window": self.kill_focused_window,
+            "change_gap_value": lambda delta: self.change_gap_value(int(delta)),
+            "change_main_window_size": (
+                lambda delta: self.change_main_window_size(int(delta))
+            ),
+            "move_window_forward": self.move_window_forward,
+            "move_window_backward": self.move_window_backward,
+            "get_current_tab": lambda: self.current_tab,
+            "get_gaps": lambda: self.tab_class.gaps,
+            "get_tabs": self.get_tabs,
+            "get_focused_window": self.get_focused_window,
+        }
+
+    def dump_state(self) -> Dict[str, Any]:
+        """
+        Get tabs state to restore after WM restart.
+
+        :return: current tab, gaps and windows of every tab.
+        """
+        tabs = {}
+        for index, tab in self.tabs.items():
+            if not tab.windows:
+                continue
+            focused = tab.focused_window
+            tabs[str(index)] = {
+                "windows": list(tab.windows),
+                "focused": focused.id if focused else None,
+                "main_window_size": tab.main_window_size,
+            }
+        return {
+            "current_tab": self.current_tab,
+            "gaps": self.tab_class.gaps,
+            "config_gaps": self.gaps,
+            "tabs": tabs,
+        }
+
+    def load_state(self, state: Any) -> None:
+        """
+        Restore tabs saved by `dump_state`.
+
+        Windows are placed to their tabs when they're adopted,
+        ids of windows that don't exist anymore are dropped
+        on the first layout flush.
+
+        :param state: saved state.
+        """
+        try:
+            tabs = {int(index): tab for index, tab in state["tabs"].items()}
+            current_tab = int(state["current_tab"])
+            gaps = int(state["gaps"])
+        except (KeyError, TypeError, ValueError, AttributeError) as err:
+            logger.error(f"Can't restore layout state. Cause: {err}")
+            return
+        # Gaps from the config take precedence if they were changed.
+        if state.get("config_gaps") == self.gaps:
+            self.tab_class.gaps = gaps
+        for index, tab_state in tabs.items():
+            self._load_tab_state(index, tab_state)
+        self.change_tab(current_tab)
+
+    def _load_tab_state(self, index: int, tab_state: Dict[str, Any]) -> None:
+        """
+        Restore tab settings and remember where its windows go.
+
+        :param index: tab index.
+        :param tab_state: saved state of the tab.
+        """
+        tab = self.tabs[index]
+        tab.main_window_size = tab_state.get(
+            "main_window_size",
+            tab.main_window_size,
+        )
+        for position, window_id in enumerate(tab_state.get("windows", [])):
+            self._placement[window_id] = (index, position)
+        if tab_state.get("focused") is not None:
+            self._restored_focus[index] = tab_state["focused"]
+
+    def _finish_restore(self) -> None:
+        """Put restored windows in saved order and restore focus."""
+        positions = {
+            window_id: position for window_id, (_, position) in self._placement.items()
+        }
+        restored_tabs = {index for index, _ in self._placement.values()}
+        last_position = len(positions)
+        for index in restored_tabs:
+            tab = self.tabs[index]
+            tab.set_order(
+                sorted(
+                    tab.windows.values(),
+                    key=lambda window: positions.get(window.id, last_position),
+                ),
+            )
+            focused_id = self._restored_focus.get(index)
+            focused: Optional[S3window] = None
+            if focused_id is not None:
+                focused = tab.windows.get(focused_id)
+            tab.focused_window = focused
+        current = self.tabs[self.current_tab]
+        current.focused_window = current.focused_window or current.last_window()
+        if current.focused_window is not None:
+            current.focused_window.focus()
+        current.schedule_layout()
+        self._placement.clear()
+        self._restored_focus.clear()
 
     @classmethod
     def get_keys(cls) -> List[KeyCombination]:
@@ -1,7 +1,7 @@
-from typing import List, Optional
-
-from loguru import logger
+from typing import Dict, Iterable, List, Optional
 
+from s3wm.layouts.default_tile.tiling import Rectangle, compute_tiles
+from s3wm_core.log import hot_log
 from s3wm_core.s3window import S3window
 
 
@@ -11,52 +11,86 @@ class Tab:
     gaps: int = 0
 
     def __init__(self) -> None:
-        self.windows: List[S3window] = []
+        # Windows by id in stack order. Dict keeps insertion order,
+        # so windows are added, found and removed in constant time.
+        self.windows: Dict[int, S3window] = {}
         self.focused_window: Optional[S3window] = None
         self.main_window_size = 50
+        self.visible = False
+        # Layout must be updated on the next flush.
+        self.dirty = False
+        # Last rectangle sent to X server for every window by its id.
+        self.applied_geometry: Dict[int, Rectangle] = {}
+        self.retiles = 0
+        self.configures_issued = 0
+        self.configures_skipped = 0
 
     def focus(self) -> None:
         """Show all windows from tab and focus on the last one."""
-        for window in self.windows:
+        self.visible = True
+        for window in self.windows.values():
             window.map()
-        self.update_layout()
-        self.focused_window = None
-        if self.windows:
-            self.windows[-1].focus()
+        self.schedule_layout()
+        self.focused_window = self.last_window()
+        if self.focused_window is not None:
+            self.focused_window.focus()
 
     def lose_focus(self) -> None:
         """Hide all windows from the screen."""
-        for window in self.windows:
+        self.visible = False
+        for window in self.windows.values():
             window.unmap()
 
+    def last_window(self) -> Optional[S3window]:
+        """
+        Get the window on top of the stack.
+
+        :return: last added window or None if tab is empty.
+        """
+        return next(reversed(self.windows.values()), None)
+
     def focused_index(self) -> int:
         """
-        Get array index of currently focused window.
+        Get stack index of currently focused window.
+
+        Unlike other operations, it takes linear time.
 
         :return: index.
         """
-        for index, window in enumerate(self.windows):
-            if window == self.focused_window:
-                return index
-        return 0
+        if self.focused_window is None or self.focused_window.id not in self.windows:
+            return 0
+        return list(self.windows).index(self.focused_window.id)
+
+    def set_order(self, windows: Iterable[S3window]) -> None:
+        """
+        Replace stack order of windows.
+
+        :param windows: all windows of the tab in the new order.
+        """
+        self.windows = {window.id: window for window in windows}
 
-    def focus_prev(self) -> None:
-        """Focus on a previous window in array."""
+    def focus_prev(self, steps: int = 1) -> None:
+        """
+        Focus on a previous window in array.
+
+        :param steps: number of windows to move focus by.
+        """
         if not self.windows:
             return
-        index = self.focused_index()
-        index += 1
-        if index == len(self.windows):
-            index = 0
-        self.focused_window = self.windows[index]
+        index = (self.focused_index() + steps) % len(self.windows)
+        self.focused_window = list(self.windows.values())[index]
         self.focused_window.focus()
 
-    def focus_next(self) -> None:
-        """Focus on a next window in windows stack."""
+    def focus_next(self, steps: int = 1) -> None:
+        """
+        Focus on a next window in windows stack.
+
+        :param steps: number of windows to move focus by.
+        """
         if not self.windows:
             return
-        index = self.focused_index()
-        self.focused_window = self.windows[index - 1]
+        index = (self.focused_index() - steps) % len(self.windows)
+        self.focused_window = list(self.windows.values())[index]
         self.focused_window.focus()
 
     def pop_focused_window(self) -> Optional[S3window]:
@@ -67,11 +101,14 @@ class Tab:
         """
         if not self.windows:
             return None
-        index = self.focused_index()
-        target_window = self.windows.pop(index)
+        focused = self.focused_window
+        if focused is None or focused.id not in self.windows:
+            focused = next(iter(self.windows.values()))
+        target_window = self.windows.pop(focused.id)
+        self.applied_geometry.pop(target_window.id, None)
         target_window.unmap()
         self.focused_window = None
-        self.update_layout()
+        self.schedule_layout()
         return target_window
 
     def add_window(self, window: S3window) -> None:
@@ -80,10 +117,24 @@ class Tab:
 
         :param window: new window.
         """
-        self.windows.append(window)
+        self.windows[window.id] = window
         self.focused_window = window
         window.focus()
-        self.update_layout()
+        self.schedule_layout()
+
+    def restore_window(self, window: S3window) -> None:
+        """
+        Add window from a session snapshot.
+
+        Unlike `add_window`, it doesn't move focus.
+        Windows of hidden tabs are not mapped by the WM,
+        so they are left as they are.
+
+        :param window: adopted window.
+        """
+        self.windows[window.id] = window
+        if self.visible:
+            self.schedule_layout()
 
     def change_focused_window(self, new_window: S3window) -> None:
         """
@@ -91,7 +142,7 @@ class Tab:
 
         :param new_window: window to focus.
         """
-        if new_window not in self.windows:
+        if new_window.id not in self.windows:
             self.add_window(new_window)
         else:
             self.focused_window = new_window
@@ -103,17 +154,16 @@ class Tab:
 
         :param window: removed window.
         """
-        # Trying to remove window from windows list.
-        for index, tab_window in enumerate(self.windows):
-            if tab_window == window:
-                # If we have such window we can unmap it.
-                self.windows.pop(index)
+        self.applied_geometry.pop(window.id, None)
+        self.windows.pop(window.id, None)
         self.focused_window = None
+        if not self.visible:
+            return
         # If we have other windows on our tab we focus on the last one.
-        if self.windows:
-            self.windows[-1].focus()
-            self.focused_window = self.windows[-1]
-        self.update_layout()
+        self.focused_window = self.last_window()
+        if self.focused_window is not None:
+            self.focused_window.focus()
+        self.schedule_layout()
 
     def change_main_window_size(self, diff: int) -> None:
         """
@@ -125,7 +175,7 @@ class Tab:
             return
         self.main_window_size = min(self.main_window_size + diff, 90)  # noqa: WPS432
         self.main_window_size = max(10, self.main_window_size)
-        self.update_layout()
+        self.schedule_layout()
 
     def move_window_forward(self) -> None:
         """Move focused window backward in stack."""
@@ -135,69 +185,67 @@ class Tab:
         second_index = index + 1
         if second_index >= len(self.windows):
             second_index = 0
-        tmp = self.windows[index]
-        self.windows[index] = self.windows[second_index]
-        self.windows[second_index] = tmp
-        self.update_layout()
+        self._swap(index, second_index)
 
     def move_window_backward(self) -> None:
         """Move focused window forward in stack."""
         if not self.windows:
             return
         index = self.focused_index()
-        tmp = self.windows[index]
-        self.windows[index] = self.windows[index - 1]
-        self.windows[index - 1] = tmp
-        self.update_layout()
+        self._swap(index, index - 1)
 
-    def update_layout(self) -> None:  # noqa: C901, WPS210, WPS231, WPS213
-        """Place all windows on layout nicely."""
-        logger.debug("Updating layout")
-        if not self.windows:
-            return
-
-        main_window_width = self.main_window_size
-        main_width_gaps = 1
+    def schedule_layout(self) -> None:
+        """
+        Mark layout as outdated.
 
-        if len(self.windows) == 1:
-            main_window_width = 100
-            main_width_gaps = 2
+        Layout is updated once by the layout manager
+        after the current batch of events is handled.
+        """
+        self.dirty = True
 
-        main_window = self.windows[-1]
-        main_window.resize(width=main_window_width, height=100, percents=True)
-        main_window.move(
-            x=self.gaps,
-            y=self.gaps,
-        )
-        main_geom = main_window.geom
-        if not main_geom:
+    def update_layout(self) -> None:
+        """Place all windows on layout nicely."""
+        hot_log.debug("Updating layout")
+        self.dirty = False
+        last_window = self.last_window()
+        if last_window is None:
             return
-        main_window.resize(
-            width=main_geom.width - (self.gaps * main_width_gaps),
-            height=main_geom.height - (self.gaps * 2),
+        self.retiles += 1
+        screen = last_window.screen
+        screen_geom = screen.geom
+        rects = compute_tiles(
+            screen_width=screen_geom.width,
+            screen_height=screen_geom.height,
+            windows_count=len(self.windows),
+            gaps=self.gaps,
+            main_window_size=self.main_window_size,
         )
-        if len(self.windows) == 1:
-            return
-        main_geom = main_window.geom
-        if not main_geom:
-            return
-        height_percent = 100 // (len(self.windows) - 1)
-        windows_x = main_geom.x + main_geom.width + self.gaps
-        windows_y = 0
-        for window in reversed(self.windows):
-            if window == main_window:
+        issued = 0
+        for window, rect in zip(self.windows.values(), rects):
+            if self.applied_geometry.get(window.id) == rect:
                 continue
-            window.resize(
-                width=100 - self.main_window_size,  # : WPS432
-                height=height_percent,
-                percents=True,
+            window.configure(
+                x=rect.x,
+                y=rect.y,
+                width=rect.width,
+                height=rect.height,
             )
-            win_geom = window.geom
-            if not win_geom:
-                continue
-            window.resize(
-                width=win_geom.width - (self.gaps * 2),
-                height=win_geom.height - (self.gaps * 2),
-            )
-            window.move(x=windows_x, y=windows_y + self.gaps)
-            windows_y += win_geom.height
+            self.applied_geometry[window.id] = rect
+            issued += 1
+        self.configures_issued += issued
+        self.configures_skipped += len(rects) - issued
+        hot_log.debug("Configured {} of {} windows", issued, len(rects))
+        if issued:
+            screen.flush()
+
+    def _swap(self, index: int, second_index: int) -> None:
+        """
+        Swap two windows in stack.
+
+        :param index: stack index of a window.
+        :param second_index: stack index of another window.
+        """
+        windows: List[S3window] = list(self.windows.values())
+        windows[index], windows[second_index] = windows[second_index], windows[index]
+        self.set_order(windows)
+        self.schedule_layout()
@@ -0,0 +1,71 @@
+from typing import List, NamedTuple
+
+
+class Rectangle(NamedTuple):
+    """Window placement on the screen."""
+
+    x: int  # noqa: WPS111
+    y: int  # noqa: WPS111
+    width: int
+    height: int
+
+
+def compute_tiles(  # noqa: WPS211
+    screen_width: int,
+    screen_height: int,
+    windows_count: int,
+    gaps: int,
+    main_window_size: int,
+) -> List[Rectangle]:
+    """
+    Calculate placement for all windows on a tab.
+
+    The last window is the main one and takes
+    `main_window_size` percents of the screen width.
+    Other windows are stacked on the right side from top to bottom
+    in reversed order.
+
+    :param screen_width: screen width in pixels.
+    :param screen_height: screen height in pixels.
+    :param windows_count: number of windows on a tab.
+    :param gaps: gaps between windows in pixels.
+    :param main_window_size: main window width in percents.
+    :return: rectangles in the same order as windows.
+    """
+    if windows_count <= 0:
+        return []
+    full_height = max(screen_height - gaps * 2, 1)
+    if windows_count == 1:
+        return [
+            Rectangle(
+                x=gaps,
+                y=gaps,
+                width=max(screen_width - gaps * 2, 1),
+                height=full_height,
+            ),
+        ]
+    main_width = (screen_width * main_window_size) // 100
+    stack_width = screen_width - main_width
+    stack_count = windows_count - 1
+    stack_height = screen_height // stack_count
+    rects = []
+    for index in range(stack_count):
+        # Windows are stacked from the end of the list.
+        row = stack_count - index - 1
+        rects.append(
+            Rectangle(
+                x=main_width + gaps,
+                y=row * stack_height + gaps,
+                width=max(stack_width - gaps * 2, 1),
+                height=max(stack_height - gaps * 2, 1),
+            ),
+        )
+    rects.append(
+        Rectangle(
+            x=gaps,
+            y=gaps,
+            width=max(main_width - gaps, 1),
+            height=full_height,
+        ),
+    )
+    return rects
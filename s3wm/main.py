@@ -2,11 +2,15 @@ import logging
 from argparse import ArgumentParser, Namespace
 from enum import Enum
 from importlib.metadata import version
+from os import getpid
 from sys import stdout
+from time import perf_counter
+from typing import TYPE_CHECKING, Optional
 
-from loguru import logger
+from s3wm_core.startup_profile import StartupProfile
 
-from s3wm.s3wm import S3WM
+if TYPE_CHECKING:
+    from s3wm_core.profiler import Profiler
 
 
 class Loglevel(Enum):
@@ -57,17 +61,131 @@ def parse_arguments() -> Namespace:
         choices=list(Loglevel),
         default=Loglevel.INFO,
     )
+    parser.add_argument(
+        "--loop",
+        dest="loop",
+        choices=["blocking", "asyncio"],
+        default="blocking",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        dest="startup_profile",
+        help="print time spent in every startup phase",
+    )
+    parser.add_argument(
+        "--watch-config",
+        action="store_true",
+        dest="watch_config",
+        help="reload key bindings when config file is saved",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        dest="metrics_file",
+        default=None,
+        help="write metrics to this file on SIGUSR1 and on exit instead of printing",
+    )
+    parser.add_argument(
+        "--ipc",
+        action="store_true",
+        dest="ipc",
+        help=(
+            "accept JSON commands on a unix socket, "
+            + "its path is exported as S3WM_SOCKET"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        choices=["cprofile", "sampling"],
+        default=None,
+        help=(
+            "profile event handlers, "
+            + "SIGUSR2 stops and writes the profile or resumes it"
+        ),
+    )
+    parser.add_argument(
+        "--profile-output",
+        dest="profile_output",
+        default=None,
+        help="profile path, defaults to s3wm-<pid>.prof or s3wm-<pid>.folded",
+    )
+    parser.add_argument(
+        "--profile-interval",
+        dest="profile_interval",
+        type=float,
+        default=5,
+        help="milliseconds between samples of the sampling profiler",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        dest="memory_interval",
+        nargs="?",
+        type=float,
+        const=300,
+        default=None,
+        metavar="SECONDS",
+        help="trace allocations and log their growth every SECONDS (300 by default)",
+    )
     return parser.parse_args()
 
 
+def create_profiler(args: Namespace) -> "Optional[Profiler]":
+    """
+    Create CPU profiler chosen in CLI.
+
+    :param args: parsed args.
+    :return: profiler or None if profiling is disabled.
+    """
+    if args.profile is None:
+        return None
+    # cProfile, pstats and threading are imported only for profiling.
+    from s3wm_core.profiler import (  # noqa: WPS433
+        CProfileProfiler,
+        SamplingProfiler,
+    )
+
+    if args.profile == "cprofile":
+        return CProfileProfiler(args.profile_output or f"s3wm-{getpid()}.prof")
+    return SamplingProfiler(
+        args.profile_output or f"s3wm-{getpid()}.folded",
+        interval=args.profile_interval / 1000,
+    )
+
+
 def main() -> None:
     """Function to run the thing."""
+    started_at = perf_counter()
     args = parse_arguments()
     if args.version:
         s3wm_version = version("s3wm")
         print(f"S3WM version: {s3wm_version}")  # noqa: WPS421
         return
+    # Logger, WM and its dependencies are imported only when they are needed.
+    from loguru import logger  # noqa: WPS433
+
+    from s3wm.s3wm import S3WM  # noqa: WPS433
+    from s3wm_core.log import hot_log  # noqa: WPS433
+
     logger.remove()
     logger.add(stdout, level=args.log_level.value)
-    wm = S3WM()
-    wm.run()
+    hot_log.configure(args.log_level.value)
+
+    profile = StartupProfile(started_at)
+    profile.mark("imports")
+    wm = S3WM(
+        profile if args.startup_profile else None,
+        watch_config=args.watch_config,
+        metrics_file=args.metrics_file,
+        ipc=args.ipc,
+        profiler=create_profiler(args),
+        memory_interval=args.memory_interval,
+    )
+    if args.loop == "asyncio":
+        wm.run_async()
+    else:
+        wm.run()
+
+
+if __name__ == "__main__":
+    main()
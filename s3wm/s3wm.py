@@ -1,24 +1,72 @@
-from subprocess import Popen
-from typing import List
+import asyncio
+import atexit
+import json
+import signal
+from inspect import isawaitable
+from select import select
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from frozendict import frozendict
 from loguru import logger
 from Xlib import X
 from Xlib.display import Display
+from Xlib.error import XError
 from Xlib.protocol.event import (
+    ConfigureNotify,
     DestroyNotify,
     EnterNotify,
     KeyPress,
     LeaveNotify,
+    MappingNotify,
     MapRequest,
     UnmapNotify,
 )
 from Xlib.Xcursorfont import left_ptr
 
-from s3wm_core.keymap import get_key_action, init_keymap
+from s3wm_core.autorepeat import (
+    KeyRepeatBuffer,
+    RepeatableAction,
+    enable_detectable_autorepeat,
+)
+from s3wm_core.config_reload import ConfigReloader
+from s3wm_core.event_batch import EventBatchStats, coalesce_events
+from s3wm_core.event_stream import WINDOW_MAPPED, WINDOW_UNMAPPED, EventStream
+from s3wm_core.executor import ActionExecutor, BackgroundAction
+from s3wm_core.ipc import IpcServer
+from s3wm_core.key_combination import KeyCombination
+from s3wm_core.keymap import (
+    get_key_combination,
+    handle_mapping_notify,
+    init_keymap,
+)
+from s3wm_core.launcher import launcher
+from s3wm_core.log import hot_log
+from s3wm_core.metrics import Metrics, format_snapshot, get_action_name
 from s3wm_core.s3screen import S3screen
 from s3wm_core.s3window import S3window
-from s3wm_core.x_models import XMapState, XWMState
+from s3wm_core.screen_geometry import screen_geometry_cache
+from s3wm_core.session import load_session, save_session
+from s3wm_core.signals import SignalQueue
+from s3wm_core.startup_profile import StartupProfile
+from s3wm_core.window_geometry import window_geometry_cache
+from s3wm_core.window_query import WindowInfo, query_windows
+from s3wm_core.window_registry import WindowRegistry
+from s3wm_core.x_models import XWMState
+
+if TYPE_CHECKING:
+    from s3wm_core.memory import MemoryTracker
+    from s3wm_core.profiler import Profiler
 
 EVENT_HANDLER_MAP = frozendict(
     {
@@ -33,6 +81,8 @@ EVENT_HANDLER_MAP = frozendict(
         X.LeaveNotify: "handle_focus_out",
         X.DestroyNotify: "handle_destroy",
         X.MapNotify: None,
+        X.ConfigureNotify: "handle_configure_notify",
+        X.MappingNotify: "handle_mapping_notify",
     },
 )
 
@@ -45,20 +95,68 @@ class S3WM:
     Main
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        startup_profile: Optional[StartupProfile] = None,
+        watch_config: bool = False,
+        metrics_file: Optional[str] = None,
+        ipc: bool = False,
+        profiler: Optional["Profiler"] = None,
+        memory_interval: Optional[float] = None,
+    ) -> None:
         """
         Initialize S3WM.
 
         Initialization process includes
         establishing connection to the display
         and initialization of a chosen layout.
+
+        :param startup_profile: if passed, startup timings
+            are printed when the WM is ready.
+        :param watch_config: reload config when it's changed.
+        :param metrics_file: file to write metrics to on SIGUSR1
+            and on exit, metrics are printed if it's not set.
+        :param ipc: accept commands on a control socket.
+        :param profiler: CPU profiler for event handlers.
+        :param memory_interval: if passed, allocations are traced
+            and compared every `memory_interval` seconds.
         """
+        self.watch_config = watch_config
+        self.enable_ipc = ipc
+        self.profiler = profiler
+        self.print_profile = startup_profile is not None
+        self.profile = startup_profile or StartupProfile()
         from s3wm_core import wm_config  # noqa: WPS433
 
+        wm_config.apply_user_config()
+        self.profile.mark("config")
         self.display = Display()
+        self.profile.mark("connect")
+        self.screen = S3screen(self.display.screen())
         self.config = wm_config
+        # made for dynamic layout switching.
+        self.windows = WindowRegistry()
+        self.event_stats = EventBatchStats()
+        self.metrics = Metrics()
+        self.metrics.install(self.display)
+        self.metrics_file = metrics_file
+        self.executor = ActionExecutor()
+        self.config_reloader = ConfigReloader(self)
+        self.events = EventStream()
+        self.ipc = IpcServer(self)
+        self.signals = SignalQueue()
+        self.memory: Optional["MemoryTracker"] = None
+        if memory_interval is not None:
+            # tracemalloc is imported only if memory is traced.
+            from s3wm_core import memory  # noqa: WPS433
+
+            self.memory = memory.MemoryTracker(self, memory_interval)
+        self.key_repeats = KeyRepeatBuffer()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+        # Event handlers for windows created by the WM itself.
+        self.internal_windows: Dict[int, Callable[[Any], None]] = {}
         self.layout = wm_config.layout(self)
-        self.windows: List[S3window] = []  # made for dynamic layout switching.
         font = self.display.open_font("cursor")
         cursor = font.create_glyph_cursor(  # noqa: WPS317
             font,
@@ -68,23 +166,154 @@ class S3WM:
             (65535, 65535, 65535),
         )
         self.display.screen().root.change_attributes(cursor=cursor)
+        self.profile.mark("init")
 
     def run(self) -> None:
         """Runs window manager."""
-        display = self.display
-        init_keymap(display)
-        startup = getattr(
-            self.config,
-            "startup",
-            lambda: logger.debug("No startup actions found"),
-        )
-        self._catch_events()
-        self._setup_root()
-        startup()
-        self._reload_windows()
+        self._start()
         while True:  # noqa: WPS457
             self._handle_next_event()
 
+    def run_async(self) -> None:
+        """
+        Runs window manager in asyncio event loop.
+
+        In this mode X11 connection is watched by the loop,
+        so coroutines from config can run alongside the WM.
+        """
+        asyncio.run(self._run_async())
+
+    def run_coroutine(self, coro: Awaitable[Any]) -> None:
+        """
+        Run coroutine from config or key action.
+
+        In asyncio mode the coroutine is scheduled as a task,
+        otherwise it's awaited in place.
+
+        :param coro: coroutine to run.
+        """
+        if self.loop is None:
+            asyncio.run(self._run_guarded(coro))
+            return
+        task = self.loop.create_task(self._run_guarded(coro))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def save_session(self) -> None:
+        """
+        Save managed windows and layout state.
+
+        Next S3WM instance in this X11 session
+        restores it, so restart keeps windows in their tabs.
+        """
+        save_session(
+            self.display,
+            {
+                "windows": [window.id for window in self.windows],
+                "layout": self.layout.dump_state(),
+            },
+        )
+        self.display.sync()
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """
+        Collect handler latencies, X11 requests and layout counters.
+
+        :return: JSON serializable metrics.
+        """
+        snapshot = self.metrics.snapshot()
+        event_stats = self.event_stats
+        snapshot["events"] = {
+            "batches": event_stats.batches,
+            "received": event_stats.received,
+            "coalesced": event_stats.coalesced,
+            "key_presses_coalesced": self.key_repeats.coalesced,
+        }
+        snapshot["layout"] = self.layout.get_stats()
+        if self.memory is not None:
+            snapshot["memory"] = self.memory.get_counts()
+        return snapshot
+
+    def report_metrics(self, *_: Any) -> None:
+        """Write metrics to the metrics file or print them."""
+        snapshot = self.metrics_snapshot()
+        if self.metrics_file is None:
+            print(format_snapshot(snapshot), flush=True)  # noqa: WPS421
+            return
+        try:
+            with open(self.metrics_file, "w") as metrics_file:
+                json.dump(snapshot, metrics_file, indent=2)
+        except OSError as err:
+            logger.error(f"Can't write metrics. Cause: {err}")
+
+    def get_existing_windows(self) -> Set[int]:
+        """
+        Ask X server for top level windows.
+
+        Used by memory diagnostics to find leaked windows.
+
+        :return: ids of existing windows.
+        """
+        try:
+            children = self.display.screen().root.query_tree().children
+        except XError as err:
+            logger.debug(f"Can't query windows. Cause: {err}")
+            return set()
+        return {child.id for child in children}
+
+    def get_stale_windows(self, existing: Set[int]) -> Set[int]:
+        """
+        Find managed windows that don't exist anymore.
+
+        Such windows mean that DestroyNotify was missed.
+
+        :param existing: ids of existing windows.
+        :return: ids of stale windows.
+        """
+        managed = {window.id for window in self.windows}
+        return (managed | self.layout.get_window_ids()) - existing
+
+    def memory_report(self) -> Dict[str, Any]:
+        """
+        Report top allocators and sizes of WM registries.
+
+        :raises RuntimeError: if memory diagnostics are disabled.
+        :return: JSON serializable report.
+        """
+        if self.memory is None:
+            raise RuntimeError("Memory diagnostics are disabled, use --trace-memory")
+        return self.memory.report()
+
+    def toggle_profiler(self, *_: Any) -> bool:
+        """
+        Start or stop CPU profiler.
+
+        Profile is written every time the profiler is stopped.
+
+        :return: True if profiler is running now.
+        """
+        profiler = self.profiler
+        if profiler is None:
+            logger.warning("Profiler is not enabled, use --profile option")
+            return False
+        if profiler.is_running:
+            profiler.stop()
+            profiler.dump()
+        else:
+            profiler.start()
+        return profiler.is_running
+
+    def sync_x(self) -> None:
+        """
+        Apply pending layout changes and send all requests to X11.
+
+        Coroutines should call it after changing windows
+        if they are going to wait for something afterwards.
+        """
+        self.layout.flush_layout()
+        self.display.flush()
+        self.ipc.send_events()
+
     def handle_map(self, map_event: MapRequest) -> None:
         """
         Map window to layout.
@@ -95,8 +324,8 @@ class S3WM:
 
         :param map_event: X11 event for mapping
         """
-        logger.debug("Map request")
-        window = S3window(map_event.window, S3screen(self.display.screen()))
+        hot_log.debug("Map request")
+        window = S3window(map_event.window, self.screen)
         attrs = window.attributes
         if not attrs:
             return
@@ -113,15 +342,64 @@ class S3WM:
 
         :param key_event: Key combination.
         """
-        action = get_key_action(key_event)
-        if not action:
+        started_at = perf_counter()
+        combination = get_key_combination(key_event)
+        if combination is None or not combination.action:
             return
-        if callable(action):
-            logger.debug("Found python function")
-            action(self)
-        else:
-            logger.debug(f"Running os command: '{action}'")
-            Popen(action, shell=True)
+        action = combination.action
+        if isinstance(action, RepeatableAction):
+            # Presses of a held key are applied at once after the batch.
+            self._run_repeated_action(self.key_repeats.add(combination))
+            return
+        self._run_repeated_action(self.key_repeats.take())
+        scope = self.metrics.start()
+        try:
+            self._run_key_action(combination, started_at)
+        finally:
+            self.metrics.finish(get_action_name(action), scope)
+
+    def _run_key_action(self, combination: KeyCombination, started_at: float) -> None:
+        """
+        Run action of a pressed key combination.
+
+        :param combination: pressed combination.
+        :param started_at: perf_counter value when key press was received.
+        """
+        action = combination.action
+        if isinstance(action, BackgroundAction):
+            hot_log.debug("Running python function in background")
+            self.executor.submit(action, self)
+            if self.loop is not None and action.timeout is not None:
+                self.loop.call_later(action.timeout, self._run_commands)
+        elif callable(action):
+            hot_log.debug("Found python function")
+            result = action(self)
+            if isawaitable(result):
+                self.run_coroutine(result)
+        elif combination.command is not None:
+            hot_log.debug("Running os command: '{}'", action)
+            launcher.spawn(combination.command, started_at)
+
+    def _run_repeated_action(
+        self,
+        pending: Optional[Tuple[KeyCombination, int]],
+    ) -> None:
+        """
+        Run repeatable action once for all presses of its key.
+
+        :param pending: combination and number of presses.
+        """
+        if pending is None:
+            return
+        combination, count = pending
+        if count > 1:
+            hot_log.debug("Coalesced {} presses of {}", count, combination)
+        scope = self.metrics.start()
+        try:
+            combination.action(self, count)  # type: ignore
+        except Exception as exc:
+            logger.exception(exc)
+        self.metrics.finish(get_action_name(combination.action), scope)
 
     def handle_destroy(self, destroy_event: DestroyNotify) -> None:
         """
@@ -130,25 +408,52 @@ class S3WM:
         This function will be triggered when window is destroyed.
         :param destroy_event: X11 event.
         """
-        window = S3window(destroy_event.window, S3screen(self.display.screen()))
-        if window in self.windows:
-            self.windows.remove(window)
-        window.wm_state = XWMState.WithdrawnState
+        window = self.windows.get(destroy_event.window.id)
+        window_geometry_cache.forget(destroy_event.window.id)
+        if window is None:
+            return
         self.layout.remove_window(window)
+        self.windows.remove(window.id)
+        self.events.emit(WINDOW_UNMAPPED, window=window.id, destroyed=True)
 
     def handle_unmap(self, unmap_event: UnmapNotify) -> None:
         """
         Called to unmap window and remove it from the screen.
 
         This function will be triggered when window is unmapped.
+        Unmaps made by the WM itself, e.g. when a tab is hidden,
+        are skipped. Synthetic events are sent by clients
+        to withdraw windows that are not mapped (ICCCM 4.1.4).
         :param unmap_event: X11 event.
         """
-        window = S3window(unmap_event.window, S3screen(self.display.screen()))
-        if window in self.windows:
-            self.windows.remove(window)
-        window.wm_state = XWMState.WithdrawnState
+        window = self.windows.get(unmap_event.window.id)
+        if window is None:
+            return
+        if not unmap_event.send_event and window.consume_unmap():
+            return
         self.layout.remove_window(window)
-        window.unmap()
+        self.windows.remove(window.id)
+        window.wm_state = XWMState.WithdrawnState
+        if unmap_event.send_event:
+            window.window.unmap()
+        window.mark_withdrawn()
+        self.events.emit(WINDOW_UNMAPPED, window=window.id, destroyed=False)
+
+    def handle_mapping_notify(self, mapping_event: MappingNotify) -> None:
+        """
+        Called when keyboard mapping was changed.
+
+        :param mapping_event: X11 event.
+        """
+        handle_mapping_notify(self.display, mapping_event)
+
+    def handle_configure_notify(self, configure_event: ConfigureNotify) -> None:
+        """
+        Called when window geometry was changed.
+
+        :param configure_event: X11 event.
+        """
+        window_geometry_cache.handle_configure(configure_event)
 
     def handle_focus_in(self, enter_event: EnterNotify) -> None:
         """
@@ -156,8 +461,8 @@ class S3WM:
 
         :param enter_event: X11 event.
         """
-        window = S3window(enter_event.window, S3screen(self.display.screen()))
-        if window.is_root:
+        window = self.windows.get(enter_event.window.id)
+        if window is None:
             return
         self.layout.focus_in(window)
 
@@ -167,34 +472,263 @@ class S3WM:
 
         :param leave_event: X11 event.
         """
-        window = S3window(leave_event.window, S3screen(self.display.screen()))
-        if window.is_root:
+        window = self.windows.get(leave_event.window.id)
+        if window is None:
             return
         self.layout.focus_out(window)
 
-    def _handle_next_event(self) -> None:  # noqa: C901, WPS231
+    def _handle_next_event(self) -> None:
+        """
+        Request next batch of events from X11 and handle it.
+
+        Waits for the next event and then reads everything
+        already queued, so events superseded by later ones
+        in the same batch are not handled.
+        """
+        self._wait_for_events()
+        events = [self.display.next_event()]
+        while self.display.pending_events():
+            events.append(self.display.next_event())
+        self._handle_batch(events)
+
+    def _handle_pending_events(self) -> None:
+        """Handle all events that can be read without blocking."""
+        while self.display.pending_events():
+            events = []
+            while self.display.pending_events():
+                events.append(self.display.next_event())
+            self._handle_batch(events)
+        self.display.flush()
+
+    def _handle_batch(self, events: List[Any]) -> None:
+        """
+        Handle batch of events.
+
+        :param events: events in order they were received.
         """
-        Request next event from X11 and handle it.
+        batch = coalesce_events(events)
+        self.event_stats.record(received=len(events), dispatched=len(batch))
+        hot_log.debug("Received {} events, handling {}", len(events), len(batch))
+        profiler = self.profiler
+        if profiler is None:
+            for event in batch:
+                self._dispatch_event(event)
+            self._finish_batch()
+            return
+        for event in batch:
+            profiler.enter(event.__class__.__name__)
+            self._dispatch_event(event)
+            profiler.leave()
+        profiler.enter("end of batch")
+        self._finish_batch()
+        profiler.leave()
+
+    def _finish_batch(self) -> None:
+        """Run held key actions and commands, then update layout."""
+        self._run_repeated_action(self.key_repeats.take())
+        self.executor.run_pending()
+        if self.memory is not None:
+            self.memory.maybe_check()
+        scope = self.metrics.start()
+        self.layout.flush_layout()
+        self.metrics.finish("layout flush", scope)
+        self.ipc.send_events()
+
+    def _run_commands(self) -> None:
+        """Run commands sent by background actions."""
+        self.executor.run_pending()
+        self.sync_x()
+        self._handle_pending_events()
+
+    def _wait_for_events(self) -> None:
+        """
+        Wait for X11 events.
+
+        While waiting, commands sent by background actions
+        are executed as soon as they arrive.
+        """
+        while not self.display.pending_events():
+            watched: List[Any] = [self.display, self.executor]
+            if self.config_reloader.is_watching:
+                watched.append(self.config_reloader)
+            if self.ipc.is_listening:
+                watched.append(self.ipc)
+            if self.signals.is_listening:
+                watched.append(self.signals)
+            readable, _, _ = select(  # noqa: WPS414
+                watched,
+                [],
+                [],
+                self.executor.next_timeout(),
+            )
+            self._handle_readable(readable)
+
+    def _handle_readable(self, readable: List[Any]) -> None:
+        """
+        Handle sources that became readable while waiting for X11 events.
+
+        Commands of background actions are executed only
+        if there are no X11 events to handle first.
+
+        :param readable: sources returned by select.
+        """
+        if self.config_reloader in readable:
+            self.config_reloader.handle_events()
+        if self.ipc in readable:
+            self.ipc.handle_events()
+        if self.signals in readable:
+            self.signals.handle_signals()
+        if self.display not in readable:
+            self.executor.run_pending()
+            self.sync_x()
+
+    def _dispatch_event(self, event: Any) -> None:  # noqa: C901, WPS231
+        """
+        Handle single event.
 
+        :param event: X11 event.
         :raises KeyboardInterrupt: if something has interrupted the main process.
         """
-        event = self.display.next_event()
-        logger.debug(f"Received event: {event.__class__}")
+        hot_log.debug("Received event: {}", event.__class__)
+        if self.internal_windows and self._dispatch_internal(event):
+            return
+        if screen_geometry_cache.handle_event(event):
+            hot_log.debug("Screen configuration changed")
+            return
         if event.type in EVENT_HANDLER_MAP:
             handler_name = EVENT_HANDLER_MAP.get(event.type)
             if not handler_name:
                 return
             event_handler = getattr(self, handler_name)
             if event_handler:
-                logger.debug(f"Found event_handler: {handler_name}")
-                logger.debug(f"Event info: {event}")
+                hot_log.debug("Found event_handler: {}", handler_name)
+                hot_log.debug("Event info: {}", event)
+                scope = self.metrics.start()
                 try:
                     event_handler(event)
                 except KeyboardInterrupt:  # noqa: WPS329
                     raise
                 except Exception as exc:
                     logger.exception(exc)
-                logger.debug("event handled")
+                self.metrics.finish(event.__class__.__name__, scope)
+                hot_log.debug("event handled")
+
+    def _start(self) -> None:
+        """
+        Adopt existing windows, grab keys and setup root window.
+
+        Existing windows are adopted first,
+        so the screen is managed again as soon as possible
+        after a restart.
+        """
+        display = self.display
+        profile = self.profile
+        self._catch_events()
+        screen_geometry_cache.setup(display)
+        profile.mark("screen geometry")
+        restored = self._load_session()
+        profile.mark("load session")
+        self._reload_windows(restored)
+        profile.mark("adopt windows")
+        init_keymap(display)
+        enable_detectable_autorepeat(display)
+        profile.mark("keymap")
+        self._setup_root()
+        self._install_signals()
+        launcher.install(self.signals, self.loop)
+        if self.watch_config:
+            self.config_reloader.watch()
+        if self.enable_ipc:
+            self.ipc.listen()
+        profile.mark("root window")
+        startup = getattr(
+            self.config,
+            "startup",
+            lambda: logger.debug("No startup actions found"),
+        )
+        startup_result = startup()
+        if isawaitable(startup_result):
+            self.run_coroutine(startup_result)
+        profile.mark("startup actions")
+        logger.debug(f"Started in {profile.total * 1000:.2f} ms")
+        if self.print_profile:
+            print(profile.report())  # noqa: WPS421
+
+    def _install_signals(self) -> None:
+        """
+        Report metrics on SIGUSR1 and toggle profiler on SIGUSR2.
+
+        Profile and metrics file are also written on any exit.
+
+        Handlers are called from the event loop, not in the signal context.
+        """
+        if self.loop is not None:
+            self.loop.add_signal_handler(signal.SIGUSR1, self.report_metrics)
+            self.loop.add_signal_handler(signal.SIGUSR2, self.toggle_profiler)
+        else:
+            self.signals.add_handler(signal.SIGUSR1, self.report_metrics)
+            self.signals.add_handler(signal.SIGUSR2, self.toggle_profiler)
+            self.signals.start()
+        if self.profiler is not None:
+            self.profiler.start()
+            atexit.register(self.profiler.dump)
+        if self.metrics_file is not None:
+            atexit.register(self.report_metrics)
+        if self.memory is not None:
+            self.memory.start()
+
+    async def _run_async(self) -> None:
+        """Watch X11 connection and background actions in asyncio loop."""
+        self.loop = asyncio.get_running_loop()
+        self._start()
+        self.loop.add_reader(self.display.fileno(), self._handle_pending_events)
+        self.loop.add_reader(self.executor.fileno(), self._run_commands)
+        if self.config_reloader.is_watching:
+            self.loop.add_reader(
+                self.config_reloader.fileno(),
+                self.config_reloader.handle_events,
+            )
+        if self.ipc.is_listening:
+            self.loop.add_reader(self.ipc.fileno(), self.ipc.handle_events)
+        # Handle events that were read while starting up.
+        self._handle_pending_events()
+        await self.loop.create_future()
+
+    async def _run_guarded(self, coro: Awaitable[Any]) -> None:
+        """
+        Await coroutine, log its errors and sync X11 afterwards.
+
+        :param coro: coroutine to run.
+        """
+        try:
+            await coro
+        except Exception as exc:
+            logger.exception(exc)
+        finally:
+            self.sync_x()
+            # Replies to coroutine's requests may have queued some events.
+            if self.loop is not None:
+                self.loop.call_soon(self._handle_pending_events)
+
+    def _dispatch_internal(self, event: Any) -> bool:
+        """
+        Pass event to a window created by the WM.
+
+        :param event: X11 event.
+        :return: True if event was handled.
+        """
+        event_window = getattr(event, "window", None)
+        window_id = getattr(event_window, "id", None)
+        if window_id is None:
+            return False
+        handler = self.internal_windows.get(window_id)
+        if handler is None:
+            return False
+        try:
+            handler(event)
+        except Exception as exc:
+            logger.exception(exc)
+        return True
 
     def _catch_events(self) -> None:
         """
@@ -206,7 +740,6 @@ class S3WM:
         mask = (
             X.SubstructureRedirectMask
             | X.StructureNotifyMask
-            | X.UnmapNotify
             | X.EnterWindowMask
             | X.LeaveWindowMask
             | X.FocusChangeMask
@@ -235,61 +768,86 @@ class S3WM:
 
         :param window: new window.
         """
-        self.windows.append(window)
+        window = self.windows.add(window)
+        # StructureNotify is selected before mapping,
+        # so the WM is told when the client unmaps or destroys the window.
+        mask = X.EnterWindowMask | X.LeaveWindowMask | X.StructureNotifyMask
+        window.window.change_attributes(event_mask=mask)
         window.wm_state = XWMState.NormalState
-        window.map()
+        # Windows restored to hidden tabs stay unmapped.
+        if self.layout.will_show_window(window):
+            window.map()
         self.layout.add_window(window)
-        mask = X.EnterWindowMask | X.LeaveWindowMask
-        window.window.change_attributes(event_mask=mask)
+        self.events.emit(WINDOW_MAPPED, window=window.id)
 
-    def _reload_main_windows(self, children: List[S3window]) -> None:
+    def _load_session(self) -> Set[int]:
         """
-        Try to reload normal windows.
+        Restore layout state saved before restart.
 
-        :param children: windows in memory.
+        :return: ids of windows managed before restart.
         """
-        logger.debug("Reloading ordinary windows")
-        for window in children:
-            attrs = window.attributes
-            if not attrs:
-                continue
-            wm_state = window.wm_state
-            if wm_state is None:
-                continue
-            transient = window.get_transient()
-            if transient:
-                continue
-            if (  # noqa: WPS337
-                attrs.map_state == XMapState.IsViewable
-                or wm_state == XWMState.IconicState
-            ):
-                self._manage_window(window)
+        session = load_session(self.display)
+        if session is None:
+            return set()
+        self.layout.load_state(session.get("layout"))
+        return set(session.get("windows", []))
 
-    def _reload_transient(self, children: List[S3window]) -> None:
+    def _reload_windows(self, restored: Set[int]) -> int:
         """
-        Try to redraw transient windows.
+        Query root window for children and render them if we can.
 
-        :param children: windows in memory.
+        Children are classified in a single pass,
+        transient windows are managed after ordinary ones.
+        Windows from a session snapshot are adopted
+        even if they are hidden on another tab.
+
+        :param restored: ids of windows managed before restart.
+        :return: number of adopted windows.
         """
-        logger.debug("Reloading transient windows")
-        for window in children:
-            attrs = window.attributes
-            if not attrs:
+        logger.debug("Reloading windows")
+        response = self.display.screen().root.query_tree()
+        # All children are queried with a single batch of requests.
+        transient: List[WindowInfo] = []
+        adopted = 0
+        for info in query_windows(response.children):
+            if not self._should_adopt(info, restored):
                 continue
-            wm_state = window.wm_state
-            if not wm_state:
+            if info.transient_for is not None:
+                transient.append(info)
                 continue
-            transient = window.get_transient()
-            if transient and (  # noqa: WPS337
-                attrs.map_state == XMapState.IsViewable
-                or wm_state == XWMState.IconicState
-            ):
-                self._manage_window(window)
-
-    def _reload_windows(self) -> None:
-        """Query root window for children and render them if we can."""
-        response = self.display.screen().root.query_tree()
-        screen = S3screen(self.display.screen())
-        children = list(map(lambda win: S3window(win, screen), response.children))
-        self._reload_main_windows(children)
-        self._reload_transient(children)
+            self._adopt_window(info, is_first=not adopted)
+            adopted += 1
+        for transient_info in transient:
+            self._adopt_window(transient_info, is_first=not adopted)
+            adopted += 1
+        self.layout.flush_layout()
+        self.display.flush()
+        return adopted
+
+    def _should_adopt(self, info: WindowInfo, restored: Set[int]) -> bool:
+        """
+        Check whether existing window must be managed.
+
+        :param info: queried window info.
+        :param restored: ids of windows managed before restart.
+        :return: True for viewable windows and for hidden
+            windows from the session snapshot.
+        """
+        restorable = info.window.id in restored and info.wm_state is not None
+        return info.is_viewable or restorable
+
+    def _adopt_window(self, info: WindowInfo, is_first: bool) -> None:
+        """
+        Manage existing window.
+
+        :param info: queried window info.
+        :param is_first: whether it's the first adopted window.
+        """
+        self._manage_window(S3window(info.window, self.screen))
+        if is_first:
+            self._show_first_window()
+
+    def _show_first_window(self) -> None:
+        """Send the first adopted window to X11 without waiting for others."""
+        self.display.flush()
+        self.profile.mark_first_window()
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+from typing import Any, Callable, List
+
+import pytest
+
+from s3wm.layouts.default_tile.layout import DefaultTile
+from s3wm.layouts.default_tile.tab import Tab
+from s3wm_core.event_stream import EventStream
+from s3wm_core.s3window import S3window
+from s3wm_core.window_registry import WindowRegistry
+
+screen: Any = SimpleNamespace(
+    geom=SimpleNamespace(width=1000, height=800),
+    flush=lambda: None,
+)
+
+
+class FakeXWindow:
+    def __init__(self, window_id: int) -> None:
+        self.id = window_id
+        self.mapped = True
+
+    def map(self) -> None:
+        self.mapped = True
+
+    def unmap(self) -> None:
+        self.mapped = False
+
+    def set_input_focus(self, *_: Any) -> None:
+        """Focus is not tracked."""
+
+    def configure(self, **_: Any) -> None:
+        """Geometry is not tracked."""
+
+
+@pytest.fixture
+def make_layout(monkeypatch: pytest.MonkeyPatch) -> Callable[[], DefaultTile]:
+    """
+    Factory of layouts that don't need X11 connection.
+
+    Layouts change gaps of all tabs, they are restored after the test.
+
+    :param monkeypatch: pytest monkeypatch.
+    :return: function that creates a layout.
+    """
+    monkeypatch.setattr(Tab, "gaps", Tab.gaps)
+
+    def factory() -> DefaultTile:
+        wm: Any = SimpleNamespace(windows=WindowRegistry(), events=EventStream())
+        return DefaultTile(wm)
+
+    return factory
+
+
+@pytest.fixture
+def make_windows() -> Callable[[DefaultTile, List[int]], List[S3window]]:
+    """
+    Factory of fake windows registered in a layout.
+
+    :return: function that creates windows with given ids.
+    """
+
+    def factory(layout: DefaultTile, ids: List[int]) -> List[S3window]:
+        windows = []
+        for window_id in ids:
+            window = layout.registry.add(S3window(FakeXWindow(window_id), screen))
+            windows.append(window)
+        return windows
+
+    return factory
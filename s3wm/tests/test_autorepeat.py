@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+from typing import Any, List
+
+from s3wm.layouts.default_tile.key_bindings import change_window_size
+from s3wm_core.autorepeat import (
+    XKB_PCF_DETECTABLE_AUTOREPEAT,
+    KeyRepeatBuffer,
+    XkbPerClientFlags,
+)
+from s3wm_core.key_combination import KeyCombination
+
+
+def test_held_key_is_counted() -> None:
+    buffer = KeyRepeatBuffer()
+    grow = KeyCombination(key="l", action="grow")
+    shrink = KeyCombination(key="h", action="shrink")
+    assert buffer.add(grow) is None
+    assert buffer.add(grow) is None
+    assert buffer.add(grow) is None
+    assert buffer.add(shrink) == (grow, 3)
+    assert buffer.take() == (shrink, 1)
+    assert buffer.take() is None
+    assert buffer.coalesced == 2
+
+
+def test_size_change_is_accumulated() -> None:
+    deltas: List[int] = []
+    layout = SimpleNamespace(change_main_window_size=deltas.append)
+    wm: Any = SimpleNamespace(layout=layout)
+    change_window_size(5)(wm, 4)
+    assert deltas == [20]
+
+
+def test_per_client_flags_request_size() -> None:
+    request = XkbPerClientFlags._request.to_binary(
+        opcode=135,
+        device_spec=0x100,
+        change=XKB_PCF_DETECTABLE_AUTOREPEAT,
+        value=XKB_PCF_DETECTABLE_AUTOREPEAT,
+        ctrls_to_change=0,
+        auto_ctrls=0,
+        auto_ctrls_values=0,
+    )
+    assert len(request) == 28
+    assert request[1] == 21
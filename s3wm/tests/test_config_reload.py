@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from s3wm_core import wm_config
+from s3wm_core.config_reload import ConfigReloader
+from s3wm_core.inotify import Inotify
+
+
+def test_exit_in_config_is_not_fatal(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    conf_path = tmp_path / "s3wm_conf.py"
+    monkeypatch.setattr(wm_config, "conf_path", conf_path)
+    monkeypatch.delitem(sys.modules, wm_config.module_name, raising=False)
+    wm: Any = SimpleNamespace(display=None)
+    conf_path.write_text("exit(1)\n")
+    assert not ConfigReloader(wm).reload()
+    assert wm_config.module_name not in sys.modules
+
+
+@pytest.mark.skipif(not Inotify.is_available(), reason="inotify is not available")
+def test_other_files_dont_reload_config(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(wm_config, "conf_path", tmp_path / "s3wm_conf.py")
+    reloader = ConfigReloader(SimpleNamespace(display=None))
+    reloads: List[bool] = []
+    monkeypatch.setattr(reloader, "reload", lambda: reloads.append(True))
+    assert reloader.watch()
+    (tmp_path / "notes.txt").write_text("text\n")
+    reloader.handle_events()
+    assert not reloads
+    (tmp_path / "s3wm_conf.py.tmp").write_text("combinations = []\n")
+    (tmp_path / "s3wm_conf.py.tmp").rename(tmp_path / "s3wm_conf.py")
+    reloader.handle_events()
+    assert reloads == [True]
+    reloader.close()
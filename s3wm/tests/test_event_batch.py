@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+from typing import Any
+
+from Xlib import X
+
+from s3wm_core.event_batch import EventBatchStats, coalesce_events
+
+
+def make_event(event_type: int, window_id: int = 1) -> Any:
+    return SimpleNamespace(type=event_type, window=SimpleNamespace(id=window_id))
+
+
+def test_only_last_crossing_event_is_kept() -> None:
+    enter = make_event(X.EnterNotify, 1)
+    leave = make_event(X.LeaveNotify, 1)
+    last_enter = make_event(X.EnterNotify, 2)
+    key = make_event(X.KeyPress)
+    assert coalesce_events([enter, leave, key, last_enter]) == [key, last_enter]
+
+
+def test_last_configure_per_window_is_kept() -> None:
+    first = make_event(X.ConfigureNotify, 1)
+    other = make_event(X.ConfigureNotify, 2)
+    last = make_event(X.ConfigureNotify, 1)
+    assert coalesce_events([first, other, last]) == [other, last]
+
+
+def test_stats() -> None:
+    stats = EventBatchStats()
+    stats.record(received=5, dispatched=2)
+    stats.record(received=1, dispatched=1)
+    assert (stats.batches, stats.received, stats.coalesced) == (2, 6, 3)
@@ -0,0 +1,36 @@
+import pytest
+
+from s3wm_core.event_stream import FOCUS_CHANGED, TAB_CHANGED, EventStream
+
+
+def test_events_are_filtered_by_type() -> None:
+    events = EventStream()
+    tabs = events.subscribe([TAB_CHANGED])
+    everything = events.subscribe()
+    events.emit(TAB_CHANGED, tab=1)
+    events.emit(FOCUS_CHANGED, window=5)
+    assert tabs.take() == [{"event": TAB_CHANGED, "tab": 1}]
+    assert len(everything.take()) == 2
+    events.unsubscribe(tabs)
+    assert events.wants(TAB_CHANGED)
+    events.unsubscribe(everything)
+    assert not events.wants(TAB_CHANGED)
+
+
+def test_slow_subscriber_loses_oldest_events() -> None:
+    events = EventStream(queue_size=3)
+    subscriber = events.subscribe([TAB_CHANGED])
+    for tab in range(5):
+        events.emit(TAB_CHANGED, tab=tab)
+    assert subscriber.take() == [
+        {"event": "dropped", "count": 2},
+        {"event": TAB_CHANGED, "tab": 2},
+        {"event": TAB_CHANGED, "tab": 3},
+        {"event": TAB_CHANGED, "tab": 4},
+    ]
+    assert subscriber.take() == []
+
+
+def test_unknown_event_type() -> None:
+    with pytest.raises(ValueError):
+        EventStream().subscribe(["window_resized"])
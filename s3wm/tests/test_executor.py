@@ -0,0 +1,46 @@
+import time
+from typing import Any, List
+
+from s3wm_core.executor import ActionExecutor, background, is_cancelled
+
+
+def wait_for(executor: ActionExecutor, commands: int) -> int:
+    executed = 0
+    deadline = time.monotonic() + 5
+    while executed < commands and time.monotonic() < deadline:
+        executed += executor.run_pending()
+        time.sleep(0.01)
+    return executed
+
+
+def test_commands_run_in_loop() -> None:
+    executor = ActionExecutor()
+    results: List[int] = []
+
+    def action(wm: Any) -> None:
+        executor.call_in_loop(results.append, wm)
+
+    executor.submit(background(action), 42).result(timeout=5)
+    assert results == []
+    assert wait_for(executor, 1) == 1
+    assert results == [42]
+    executor.shutdown()
+
+
+def test_timed_out_action_is_cancelled() -> None:
+    executor = ActionExecutor()
+    results: List[bool] = []
+
+    def action(_: Any) -> None:
+        while not is_cancelled():
+            time.sleep(0.01)
+        results.append(True)
+        executor.call_in_loop(results.append, False)
+
+    future = executor.submit(background(action, timeout=0.05), None)
+    time.sleep(0.1)
+    executor.run_pending()
+    future.result(timeout=5)
+    assert executor.run_pending() == 0
+    assert results == [True]
+    executor.shutdown()
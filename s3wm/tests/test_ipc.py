@@ -0,0 +1,166 @@
+import json
+import socket
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, List
+
+import pytest
+
+from s3wm.layouts.default_tile.layout import DefaultTile
+from s3wm_core.ipc import MAX_LINE_SIZE, SOCKET_ENV, IpcServer
+from s3wm_core.s3window import S3window
+
+ServerFactory = Callable[[], IpcServer]
+
+
+@pytest.fixture
+def make_server(
+    make_layout: Callable[[], DefaultTile],
+    make_windows: Callable[[DefaultTile, List[int]], List[S3window]],
+) -> ServerFactory:
+    def factory() -> IpcServer:
+        layout = make_layout()
+        first, second = make_windows(layout, [201, 202])
+        layout.add_window(first)
+        layout.add_window(second)
+        wm: Any = SimpleNamespace(
+            layout=layout,
+            windows=layout.registry,
+            events=layout.events,
+            synced=0,
+            metrics_snapshot=dict,
+            config_reloader=None,
+        )
+        wm.sync_x = lambda: setattr(wm, "synced", wm.synced + 1)
+        return IpcServer(wm)
+
+    return factory
+
+
+def test_batch_is_applied_to_layout(make_server: ServerFactory) -> None:
+    server = make_server()
+    responses = server.run_request(
+        [
+            {"command": "move_focused_window", "args": [3]},
+            {"command": "change_tab", "args": ["3"]},
+            {"command": "get_focused_window", "id": 7},
+            {"command": "change_tab", "args": 1},
+            {"command": "unknown"},
+        ],
+    )
+    assert [response["ok"] for response in responses] == [
+        True,
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert responses[2] == {"id": 7, "ok": True, "result": 202}
+    assert server.wm.layout.current_tab == 3
+    tabs = server.run_command({"command": "get_tabs"})["result"]
+    assert [(tab["index"], tab["windows"]) for tab in tabs] == [
+        (0, [201]),
+        (3, [202]),
+    ]
+
+
+def test_socket_roundtrip(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    make_server: ServerFactory,
+) -> None:
+    monkeypatch.setenv(SOCKET_ENV, str(tmp_path / "ipc.sock"))
+    server = make_server()
+    assert server.listen()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(server.path))
+        client.sendall(b'{"command": "get_windows"}\nnot json\n')
+        server.handle_events()
+        server.handle_events()
+        with client.makefile("rb") as responses:
+            assert json.loads(responses.readline()) == {
+                "ok": True,
+                "result": [201, 202],
+            }
+            assert not json.loads(responses.readline())["ok"]
+    assert server.wm.synced == 1
+    # Second WM on the same display doesn't steal the socket.
+    assert not make_server().listen(server.path)
+    server.close()
+    assert not (tmp_path / "ipc.sock").exists()
+
+
+def test_too_long_request_disconnects_client(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    make_server: ServerFactory,
+) -> None:
+    monkeypatch.setenv(SOCKET_ENV, str(tmp_path / "ipc.sock"))
+    server = make_server()
+    assert server.listen()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(server.path))
+        server.handle_events()
+        (ipc_client,) = server.clients.values()
+        assert server._take_lines(ipc_client, b'{"command": "get_tabs"}\n{') == [
+            b'{"command": "get_tabs"}',
+        ]
+        assert ipc_client.input == b"{"
+        assert server._take_lines(ipc_client, b"x" * MAX_LINE_SIZE) is None
+    server.close()
+
+
+def test_subscriber_receives_events(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    make_server: ServerFactory,
+) -> None:
+    monkeypatch.setenv(SOCKET_ENV, str(tmp_path / "ipc.sock"))
+    server = make_server()
+    server.wm.sync_x = server.send_events
+    assert server.listen()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(server.path))
+        client.sendall(
+            b'[{"command": "subscribe", "args": ["tab_changed"]},'
+            + b' {"command": "change_tab", "args": [2]}]\n',
+        )
+        server.handle_events()
+        server.handle_events()
+        with client.makefile("rb") as lines:
+            assert json.loads(lines.readline())[0]["result"] == ["tab_changed"]
+            assert json.loads(lines.readline()) == {
+                "event": "tab_changed",
+                "tab": 2,
+                "previous": 0,
+            }
+    server.handle_events()
+    assert not server.clients
+    assert not server.wm.events.wants("tab_changed")
+    server.close()
+
+
+def test_socket_is_private(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    make_server: ServerFactory,
+) -> None:
+    monkeypatch.setenv(SOCKET_ENV, str(tmp_path / "ipc.sock"))
+    server = make_server()
+    assert server.listen()
+    assert not (tmp_path / "ipc.sock").stat().st_mode & 0o077
+    server.close()
+
+
+def test_stale_socket_that_cant_be_removed(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    make_server: ServerFactory,
+) -> None:
+    def unlink(*_: Any, **__: Any) -> None:
+        raise PermissionError("Read-only directory")
+
+    stale = tmp_path / "ipc.sock"
+    stale.touch()
+    monkeypatch.setattr(Path, "unlink", unlink)
+    assert not make_server().listen(stale)
@@ -0,0 +1,142 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Iterator, List, Tuple
+
+import pytest
+from Xlib import XK, X
+
+from s3wm_core import keymap
+from s3wm_core.config_reload import ConfigReloader
+from s3wm_core.key_combination import KeyCombination
+
+
+class FakeRoot:
+    def __init__(self) -> None:
+        self.grabbed: List[Tuple[int, int]] = []
+        self.released: List[Tuple[int, int]] = []
+
+    def grab_key(self, code: int, modifiers: int, *_: Any) -> None:
+        self.grabbed.append((code, modifiers))
+
+    def ungrab_key(self, code: int, modifiers: int) -> None:
+        self.released.append((code, modifiers))
+
+
+class FakeDisplay:
+    def __init__(self) -> None:
+        self.root = FakeRoot()
+        self.num_lock_modifier = 4  # Mod2
+        self.keysym_offset = 0
+
+    def screen(self) -> Any:
+        return SimpleNamespace(root=self.root)
+
+    def keysym_to_keycodes(self, keysym: int) -> Iterator[Tuple[int, int]]:
+        # Keycodes don't matter here, keysyms are unique enough.
+        yield (keysym + self.keysym_offset) % 256, 0
+
+    def get_modifier_mapping(self) -> List[List[int]]:
+        modifiers: List[List[int]] = [[] for _ in range(8)]
+        modifiers[self.num_lock_modifier].append(XK.XK_Num_Lock % 256)
+        return modifiers
+
+    def refresh_keyboard_mapping(self, event: Any) -> None:
+        """Keysyms are computed on the fly."""
+
+    def flush(self) -> None:
+        """Nothing to send."""
+
+
+@pytest.fixture(autouse=True)
+def clean_keymap() -> Iterator[None]:
+    yield
+    keymap.keycode_mapping.clear()
+    keymap.grabbed_keys.clear()
+    keymap.bound_combinations.clear()
+    keymap.set_lock_mask(X.LockMask)
+
+
+def press(keysym: int, state: int) -> Any:
+    return SimpleNamespace(detail=keysym % 256, state=state)
+
+
+def test_only_changed_keys_are_grabbed() -> None:
+    display: Any = FakeDisplay()
+    keymap.update_keymap(display, [KeyCombination(X.Mod4Mask, "a", "a")])
+    keymap.update_keymap(display, [KeyCombination(X.Mod4Mask, "b", "b")])
+    display.root.grabbed.clear()
+    display.root.released.clear()
+
+    new_b = KeyCombination(X.Mod4Mask, "b", "new b")
+    grabbed, released = keymap.update_keymap(
+        display,
+        [new_b, KeyCombination(X.Mod4Mask, "c", "c")],
+    )
+
+    # Second grab is for CapsLock.
+    assert (grabbed, released) == (2, 0)
+    assert set(display.root.grabbed) == {
+        (ord("c"), X.Mod4Mask),
+        (ord("c"), X.Mod4Mask | X.LockMask),
+    }
+    assert keymap.keycode_mapping[(ord("b"), X.Mod4Mask)] is new_b
+
+
+def test_broken_config_keeps_bindings(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from s3wm_core import wm_config
+
+    conf_path = tmp_path / "s3wm_conf.py"
+    monkeypatch.setattr(wm_config, "conf_path", conf_path)
+    monkeypatch.setattr(wm_config, "combinations", wm_config.combinations)
+    monkeypatch.delitem(sys.modules, wm_config.module_name, raising=False)
+    wm: Any = SimpleNamespace(display=FakeDisplay())
+    reloader = ConfigReloader(wm)
+
+    conf_path.write_text(
+        "from s3wm_core import KeyCombination\n"
+        + "combinations = [KeyCombination(0, 'x', 'xterm')]\n",
+    )
+    assert reloader.reload()
+    assert list(keymap.keycode_mapping) == [(ord("x"), 0)]
+
+    conf_path.write_text("raise ValueError('typo')\n")
+    assert not reloader.reload()
+    assert list(keymap.keycode_mapping) == [(ord("x"), 0)]
+
+
+def test_lock_modifiers_are_ignored() -> None:
+    display: Any = FakeDisplay()
+    keymap.set_lock_mask(keymap.get_lock_mask(display))
+    assert keymap.lock_mask == X.LockMask | X.Mod2Mask
+    combination = KeyCombination(X.Mod4Mask, "a", "a")
+    grabbed, _ = keymap.update_keymap(display, [combination])
+    assert grabbed == 4
+    keysym = XK.string_to_keysym("a")
+    for state in (0, X.LockMask, X.Mod2Mask, X.LockMask | X.Mod2Mask):
+        assert keymap.get_key_combination(press(keysym, X.Mod4Mask | state))
+    assert keymap.get_key_combination(press(keysym, X.Mod4Mask | X.ShiftMask)) is None
+
+
+def test_mapping_change_rebinds_only_moved_keys() -> None:
+    display: Any = FakeDisplay()
+    keymap.set_lock_mask(keymap.get_lock_mask(display))
+    keymap.update_keymap(display, [KeyCombination(X.Mod4Mask, "a", "a")])
+    display.root.grabbed.clear()
+
+    # NumLock moved from Mod2 to Mod3.
+    display.num_lock_modifier = 5
+    event = SimpleNamespace(request=X.MappingModifier)
+    keymap.handle_mapping_notify(display, event)
+    assert keymap.lock_mask == X.LockMask | X.Mod3Mask
+    assert len(display.root.grabbed) == 2
+    assert len(display.root.released) == 2
+
+    display.keysym_offset = 1
+    event = SimpleNamespace(request=X.MappingKeyboard)
+    keymap.handle_mapping_notify(display, event)
+    keysym = XK.string_to_keysym("a")
+    assert keymap.get_key_combination(press(keysym + 1, X.Mod4Mask | X.Mod3Mask))
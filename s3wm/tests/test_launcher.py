@@ -0,0 +1,43 @@
+import os
+import signal
+
+from s3wm_core.launcher import Command, Launcher, parse_command
+from s3wm_core.signals import SignalQueue
+
+
+def test_simple_command_is_split() -> None:
+    assert parse_command("notify-send 'Hello world'") == ["notify-send", "Hello world"]
+
+
+def test_shell_syntax_needs_shell() -> None:
+    assert parse_command("ls | grep py") is None
+    assert parse_command("echo $HOME") is None
+    assert parse_command("FOO=bar xterm") is None
+    assert Command("xterm &").uses_shell
+
+
+def test_spawned_process_is_reaped() -> None:
+    launcher = Launcher()
+    pid = launcher.spawn(Command("true"))
+    assert pid is not None
+    os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+    assert launcher.reap() == 1
+    assert not launcher.children
+
+
+def test_children_are_reaped_from_the_loop() -> None:
+    previous = signal.getsignal(signal.SIGCHLD)
+    signals = SignalQueue()
+    launcher = Launcher()
+    try:
+        signals.start()
+        launcher.install(signals)
+        pid = launcher.spawn(Command("true"))
+        assert pid is not None
+        os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+        assert pid in launcher.children
+        assert signals.handle_signals() == 1
+        assert not launcher.children
+    finally:
+        signals.stop()
+        signal.signal(signal.SIGCHLD, previous)
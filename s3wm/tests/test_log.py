@@ -0,0 +1,27 @@
+import logging
+from typing import Any, List
+
+from loguru import logger
+
+from s3wm_core.log import HotLog
+
+
+class Unprintable:
+    def __str__(self) -> str:
+        raise AssertionError("Disabled message must not be formatted")
+
+
+def test_disabled_messages_are_not_formatted() -> None:
+    messages: List[Any] = []
+    sink = logger.add(messages.append, level=logging.DEBUG, format="{message}")
+    hot_log = HotLog()
+    try:
+        hot_log.configure(logging.INFO)
+        hot_log.debug("Event info: {}", Unprintable())
+        hot_log.configure(logging.DEBUG)
+        hot_log.debug("Configured {} of {} windows", 2, 3)
+    finally:
+        logger.remove(sink)
+    assert [str(message).strip() for message in messages] == [
+        "Configured 2 of 3 windows",
+    ]
@@ -0,0 +1,42 @@
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from s3wm.layouts.default_tile.layout import DefaultTile
+from s3wm_core.memory import MemoryTracker
+
+
+def test_allocation_growth_is_reported(
+    make_layout: Callable[[], DefaultTile],
+) -> None:
+    layout = make_layout()
+    wm: Any = SimpleNamespace(
+        windows=layout.registry,
+        layout=layout,
+        internal_windows={},
+        get_existing_windows=lambda: {501},
+        get_stale_windows=lambda existing: {502},
+    )
+    tracker = MemoryTracker(wm, interval=3600)
+    tracker.start()
+    try:
+        leaked = [bytes(1024) for _ in range(256)]  # noqa: F841
+        growth = tracker.check()
+        report = tracker.report()
+    finally:
+        tracker.stop()
+    assert any("test_memory.py" in stat["location"] for stat in growth)
+    assert report["stale_windows"] == [502]
+    assert report["counts"]["registry_windows"] == 0
+    assert report["top_allocators"]
+
+
+def test_foreign_tracing_is_not_stopped() -> None:
+    tracemalloc.start()
+    try:
+        tracker = MemoryTracker(SimpleNamespace(), interval=3600)
+        tracker.start()
+        tracker.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+from typing import Any, List
+
+from Xlib.protocol import request
+
+from s3wm_core.autorepeat import repeatable
+from s3wm_core.metrics import (
+    LatencyHistogram,
+    Metrics,
+    format_snapshot,
+    get_action_name,
+    get_bucket,
+    get_bucket_limit,
+)
+
+
+def test_buckets_are_ordered() -> None:
+    previous = 0
+    for micros in range(100_000):
+        bucket = get_bucket(micros)
+        assert bucket >= previous
+        assert micros < get_bucket_limit(bucket)
+        previous = bucket
+
+
+def test_percentiles() -> None:
+    histogram = LatencyHistogram()
+    for _ in range(99):
+        histogram.record(0.001)
+    histogram.record(0.1)
+    assert 0.001 <= histogram.percentile(0.5) < 0.00125
+    assert histogram.percentile(1) == 0.1
+    assert histogram.max == 0.1
+
+
+def test_requests_are_counted() -> None:
+    sent: List[Any] = []
+    connection = SimpleNamespace(
+        send_request=lambda req, wait: sent.append(req),
+    )
+    display: Any = SimpleNamespace(display=connection)
+    metrics = Metrics()
+    metrics.install(display)
+    scope = metrics.start()
+    connection.send_request(object.__new__(request.GetGeometry), False)
+    connection.send_request(object.__new__(request.ConfigureWindow), False)
+    metrics.finish("ConfigureRequest", scope)
+    metrics.finish("ConfigureRequest", metrics.start())
+    stats = metrics.snapshot()["handlers"]["ConfigureRequest"]
+    assert len(sent) == 2
+    assert stats["calls"] == 2
+    assert stats["requests"] == 2
+    assert stats["round_trips"] == 1
+    assert "ConfigureRequest" in format_snapshot(metrics.snapshot())
+
+
+def test_action_name() -> None:
+    @repeatable
+    def grow(wm: Any, count: int) -> None:
+        """Grow."""
+
+    assert get_action_name(grow) == "key:grow"
+    assert get_action_name("xterm") == "key:xterm"
@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+from s3wm_core.path_index import ExecutableIndex, fuzzy_match
+
+
+def make_file(directory: Path, name: str, executable: bool = True) -> None:
+    path = directory / name
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755 if executable else 0o644)
+
+
+def test_only_executables_are_indexed(tmp_path: Path) -> None:
+    make_file(tmp_path, "firefox")
+    make_file(tmp_path, "notes.txt", executable=False)
+    index = ExecutableIndex(str(tmp_path))
+    index.refresh()
+    assert index.names == ["firefox"]
+    index.close()
+
+
+def test_index_is_updated_on_refresh(tmp_path: Path) -> None:
+    make_file(tmp_path, "firefox")
+    index = ExecutableIndex(str(tmp_path))
+    index.refresh()
+    make_file(tmp_path, "alacritty")
+    os.remove(tmp_path / "firefox")
+    # Force mtime change for the rescan fallback.
+    os.utime(tmp_path, (0, 0))
+    index.refresh()
+    assert index.names == ["alacritty"]
+    index.close()
+
+
+def test_prefix_matches_go_first(tmp_path: Path) -> None:
+    for name in ("xterm", "term", "terminator", "pavucontrol"):
+        make_file(tmp_path, name)
+    index = ExecutableIndex(str(tmp_path))
+    index.refresh()
+    assert index.search("term") == ["term", "terminator", "xterm"]
+    assert index.search("term", limit=1) == ["term"]
+    index.close()
+
+
+def test_fuzzy_match() -> None:
+    assert fuzzy_match("pvc", "pavucontrol")
+    assert not fuzzy_match("cvp", "pavucontrol")
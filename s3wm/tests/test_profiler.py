@@ -0,0 +1,75 @@
+import pstats
+from argparse import Namespace
+from pathlib import Path
+
+from s3wm_core.profiler import (
+    CProfileProfiler,
+    SamplingProfiler,
+    format_samples,
+)
+
+
+def update_layout() -> int:
+    return sum(range(1000))
+
+
+def test_cprofile_stats_by_event(tmp_path: Path) -> None:
+    output = tmp_path / "s3wm.prof"
+    profiler = CProfileProfiler(str(output))
+    profiler.enter("MapRequest")
+    update_layout()
+    profiler.leave()
+    profiler.start()
+    for _ in range(2):
+        profiler.enter("MapRequest")
+        # Nested handlers are attributed to the outer one.
+        profiler.enter("KeyPress")
+        update_layout()
+        profiler.leave()
+        profiler.leave()
+    profiler.stop()
+    profiler.dump()
+    assert profiler.calls == {"MapRequest": 2}
+    stats = pstats.Stats(str(output)).stats  # type: ignore
+    functions = {func[2] for func in stats}
+    assert "update_layout" in functions
+    assert "=== MapRequest: 2 calls ===" in Path(f"{output}.txt").read_text()
+
+
+def test_samples_are_collapsed(tmp_path: Path) -> None:
+    output = tmp_path / "s3wm.folded"
+    profiler = SamplingProfiler(str(output))
+    profiler.sample()
+    profiler.enter("KeyPress")
+    profiler.sample()
+    profiler.leave()
+    profiler.dump()
+    assert profiler.idle_samples == 1
+    (line,) = output.read_text().splitlines()
+    assert line.startswith("KeyPress;")
+    assert "test_samples_are_collapsed (test_profiler.py:" in line
+    assert line.endswith(" 1")
+
+
+def test_samples_report() -> None:
+    report = format_samples(
+        {"KeyPress;run;update_layout": 3, "MapRequest;run;add_window": 1},
+        idle=10,
+    )
+    assert "Samples: 4 busy, 10 idle" in report
+    assert "       3 KeyPress" in report
+    assert "       4 run" in report
+
+
+def test_sampling_thread_is_stopped(tmp_path: Path) -> None:
+    profiler = SamplingProfiler(str(tmp_path / "s3wm.folded"), interval=0.001)
+    profiler.start()
+    assert profiler.is_running
+    profiler.stop()
+    assert not profiler.is_running
+
+
+def test_profiler_is_not_created_without_option() -> None:
+    from s3wm.main import create_profiler
+
+    assert create_profiler(Namespace(profile=None)) is None
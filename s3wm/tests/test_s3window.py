@@ -0,0 +1,31 @@
+import gc
+from types import SimpleNamespace
+from typing import Any
+
+from s3wm_core.s3window import S3window
+
+screen: Any = None
+
+
+def test_window_is_interned() -> None:
+    window = S3window(SimpleNamespace(id=10), screen)
+    assert S3window(SimpleNamespace(id=10), screen) is window
+    assert S3window(SimpleNamespace(id=11), screen) is not window
+
+
+def test_unreferenced_window_is_dropped() -> None:
+    S3window(SimpleNamespace(id=12), screen)
+    gc.collect()
+    assert 12 not in S3window._instances
+
+
+def test_unmaps_made_by_wm_are_expected() -> None:
+    x_window = SimpleNamespace(id=13, map=lambda: None, unmap=lambda: None)
+    window = S3window(x_window, screen)
+    window.unmap()
+    assert not window.consume_unmap()
+    window.map()
+    window.unmap()
+    window.unmap()
+    assert window.consume_unmap()
+    assert not window.consume_unmap()
@@ -0,0 +1,62 @@
+import sys
+from typing import Callable, List
+
+import pytest
+
+from s3wm.layouts.default_tile.layout import DefaultTile
+from s3wm_core.keymap import get_restart_args
+from s3wm_core.s3window import S3window
+
+LayoutFactory = Callable[[], DefaultTile]
+WindowsFactory = Callable[[DefaultTile, List[int]], List[S3window]]
+
+
+def test_windows_return_to_their_tabs(
+    make_layout: LayoutFactory,
+    make_windows: WindowsFactory,
+) -> None:
+    old_layout = make_layout()
+    first, second, third, closed = make_windows(old_layout, [101, 102, 103, 104])
+    old_layout.add_window(first)
+    old_layout.add_window(closed)
+    old_layout.add_window(second)
+    old_layout.change_tab(2)
+    old_layout.add_window(third)
+    old_layout.change_tab(0)
+    old_layout.tabs[0].change_main_window_size(10)
+    state = old_layout.dump_state()
+
+    layout = make_layout()
+    layout.load_state(state)
+    # Windows are adopted in stacking order, 104 was closed meanwhile.
+    adopted = make_windows(layout, [103, 102, 101])
+    # Only windows of the current tab are mapped.
+    assert [layout.will_show_window(window) for window in adopted] == [
+        False,
+        True,
+        True,
+    ]
+    for window in adopted:
+        layout.add_window(window)
+    layout.flush_layout()
+
+    assert list(layout.tabs[0].windows) == [101, 102]
+    assert list(layout.tabs[2].windows) == [103]
+    assert layout.tabs[0].main_window_size == 60
+    assert not layout.tabs[2].windows[103].window.mapped
+    assert not layout._placement
+
+
+def test_broken_state_is_ignored(make_layout: LayoutFactory) -> None:
+    layout = make_layout()
+    layout.load_state({"tabs": None})
+    assert layout.current_tab == 0
+    assert not layout._placement
+
+
+def test_restart_keeps_command_line(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "argv", ["/src/s3wm/main.py", "--ipc"])
+    monkeypatch.setattr(sys, "orig_argv", ["python3", "-m", "s3wm.main", "--ipc"])
+    assert get_restart_args() == [sys.executable, "-m", "s3wm.main", "--ipc"]
+    monkeypatch.delattr(sys, "orig_argv")
+    assert get_restart_args() == [sys.executable, "-m", "s3wm.main", "--ipc"]
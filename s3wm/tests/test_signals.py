@@ -0,0 +1,23 @@
+import os
+import signal
+from typing import List
+
+from s3wm_core.signals import SignalQueue
+
+
+def test_handlers_run_from_the_loop() -> None:
+    calls: List[int] = []
+    previous = signal.getsignal(signal.SIGUSR1)
+    queue = SignalQueue()
+    try:
+        queue.add_handler(signal.SIGUSR1, lambda: calls.append(1))
+        queue.start()
+        os.kill(os.getpid(), signal.SIGUSR1)
+        os.kill(os.getpid(), signal.SIGUSR1)
+        assert not calls
+        assert queue.handle_signals() == 1
+        assert calls == [1]
+        assert queue.handle_signals() == 0
+    finally:
+        queue.stop()
+        signal.signal(signal.SIGUSR1, previous)
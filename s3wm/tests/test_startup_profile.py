@@ -0,0 +1,23 @@
+import s3wm_core
+from s3wm_core.startup_profile import StartupProfile
+
+
+def test_phases_are_reported_in_order() -> None:
+    profile = StartupProfile()
+    profile.mark("connect")
+    profile.mark_first_window()
+    profile.mark("adopt windows")
+    assert [phase for phase, _ in profile.phases] == ["connect", "adopt windows"]
+    assert profile.total >= sum(duration for _, duration in profile.phases) * 0.99
+    report = profile.report().splitlines()
+    assert report[1].split()[0] == "connect"
+    assert report[-2].startswith("  first window")
+    assert report[-1].startswith("  total")
+
+
+def test_exports_are_imported_lazily() -> None:
+    from s3wm_core.key_combination import KeyCombination
+
+    assert s3wm_core.KeyCombination is KeyCombination
+    for name in s3wm_core.__all__:
+        assert getattr(s3wm_core, name) is not None
@@ -0,0 +1,26 @@
+from typing import Callable, List
+
+from s3wm.layouts.default_tile.layout import DefaultTile
+from s3wm.layouts.default_tile.tab import Tab
+from s3wm_core.s3window import S3window
+
+
+def test_windows_keep_stack_order(
+    make_layout: Callable[[], DefaultTile],
+    make_windows: Callable[[DefaultTile, List[int]], List[S3window]],
+) -> None:
+    tab = Tab()
+    tab.visible = True
+    first, second, third = make_windows(make_layout(), [201, 202, 203])
+    for window in (first, second, third):
+        tab.add_window(window)
+    assert tab.focused_index() == 2
+    tab.move_window_backward()
+    assert list(tab.windows) == [201, 203, 202]
+    tab.focus_next()
+    assert tab.focused_window is first
+    tab.remove_window(second)
+    assert list(tab.windows) == [201, 203]
+    assert tab.focused_window is third
+    assert tab.pop_focused_window() is third
+    assert tab.last_window() is first
@@ -0,0 +1,24 @@
+from s3wm.layouts.default_tile.tiling import Rectangle, compute_tiles
+
+
+def test_no_windows() -> None:
+    assert compute_tiles(1920, 1080, 0, 10, 50) == []
+
+
+def test_single_window() -> None:
+    assert compute_tiles(1920, 1080, 1, 10, 50) == [Rectangle(10, 10, 1900, 1060)]
+
+
+def test_main_and_stack() -> None:
+    rects = compute_tiles(1000, 600, 3, 10, 60)
+    assert rects[-1] == Rectangle(10, 10, 590, 580)
+    # Windows are stacked in reversed order.
+    assert rects[1] == Rectangle(610, 10, 380, 280)
+    assert rects[0] == Rectangle(610, 310, 380, 280)
+
+
+def test_no_overlap() -> None:
+    rects = compute_tiles(1920, 1080, 7, 4, 50)
+    stack = sorted(rects[:-1], key=lambda rect: rect.y)
+    for upper, lower in zip(stack, stack[1:]):
+        assert upper.y + upper.height <= lower.y
@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+from typing import Any
+
+from s3wm_core.window_geometry import WindowGeometryCache
+
+
+def not_requested() -> None:
+    raise AssertionError("Geometry must be taken from the cache")
+
+
+def test_configured_window_is_cached() -> None:
+    cache = WindowGeometryCache()
+    window: Any = SimpleNamespace(id=1, get_geometry=not_requested)
+    cache.store(1, x=10, y=20, width=300, height=400)
+    geom = cache.get(window)
+    assert geom is not None
+    assert (geom.x, geom.y, geom.width, geom.height) == (10, 20, 300, 400)
+
+
+def test_configure_notify_keeps_border() -> None:
+    cache = WindowGeometryCache()
+    window: Any = SimpleNamespace(id=2, get_geometry=not_requested)
+    event = SimpleNamespace(window=window, x=0, y=0, width=5, height=6, border_width=2)
+    cache.handle_configure(event)
+    cache.store(2, x=1, y=1, width=7, height=8)
+    geom = cache.get(window)
+    assert geom is not None
+    assert (geom.width, geom.border_width) == (7, 2)
+    cache.forget(2)
+    assert not cache
@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+from typing import Any, List
+
+from s3wm_core.window_query import WindowInfo, parse_window_id, parse_wm_state
+from s3wm_core.x_models import XMapState, XWMState
+
+
+def property_reply(value_format: int, value: List[int]) -> Any:
+    return SimpleNamespace(property_type=1, value=(value_format, value))
+
+
+def test_wm_state_is_parsed() -> None:
+    assert parse_wm_state(property_reply(32, [3, 0])) == XWMState.IconicState
+    assert parse_wm_state(property_reply(32, [2, 0])) is None
+    assert parse_wm_state(property_reply(32, [1])) is None
+    assert parse_wm_state(SimpleNamespace(property_type=0)) is None
+
+
+def test_transient_window_id_is_parsed() -> None:
+    assert parse_window_id(property_reply(32, [42])) == 42
+    assert parse_window_id(property_reply(32, [0])) is None
+    assert parse_window_id(property_reply(8, [42])) is None
+
+
+def test_failed_window_is_not_viewable() -> None:
+    attrs: Any = SimpleNamespace(map_state=XMapState.IsViewable)
+    assert WindowInfo(None, attrs, XWMState.NormalState, None, None).is_viewable
+    assert not WindowInfo(None, attrs, None, None, None).is_viewable
+    assert not WindowInfo(None, None, None, None, Exception()).is_viewable
@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+from typing import Any
+
+from s3wm_core.s3window import S3window
+from s3wm_core.window_registry import WindowRegistry
+
+
+def make_window(window_id: int) -> S3window:
+    screen: Any = None
+    return S3window(SimpleNamespace(id=window_id), screen)
+
+
+def test_add_returns_canonical_window() -> None:
+    registry = WindowRegistry()
+    window = make_window(1)
+    assert registry.add(window) is window
+    assert registry.add(make_window(1)) is window
+    assert registry.get(1) is window
+    assert len(registry) == 1
+
+
+def test_remove_drops_owner() -> None:
+    registry = WindowRegistry()
+    registry.add(make_window(1))
+    registry.set_owner(1, "tab")
+    assert registry.get_owner(1) == "tab"
+    registry.remove(1)
+    assert 1 not in registry
+    assert registry.get_owner(1) is None
+
+
+def test_unknown_window_has_no_owner() -> None:
+    registry = WindowRegistry()
+    registry.set_owner(1, "tab")
+    assert registry.get_owner(1) is None
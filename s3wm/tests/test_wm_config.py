@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from s3wm_core import wm_config
+
+
+def test_user_config_is_applied_on_demand(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    conf_path = tmp_path / "s3wm_conf.py"
+    conf_path.write_text("combinations = []\n")
+    monkeypatch.setattr(wm_config, "conf_path", conf_path)
+    monkeypatch.setattr(wm_config, "combinations", wm_config.combinations)
+    monkeypatch.delitem(sys.modules, wm_config.module_name, raising=False)
+    assert wm_config.combinations
+    assert wm_config.apply_user_config()
+    assert wm_config.combinations == []
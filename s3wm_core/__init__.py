@@ -2,20 +2,87 @@
 Core functions and modules for S3WM.
 
 It's usable for creating new layout managers and stuff.
+
+Names are imported on first access,
+so importing a single submodule doesn't load the whole package.
 """
-from s3wm_core.key_combination import KeyCombination
-from s3wm_core.keymap import kill_wm
-from s3wm_core.layout_base import AbstractLayoutManager
-from s3wm_core.s3screen import S3screen
-from s3wm_core.s3window import S3window
-from s3wm_core.x_models import ScreenGeometry, WindowGeometry
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from s3wm_core.autorepeat import repeatable
+    from s3wm_core.config_reload import reload_config
+    from s3wm_core.executor import background, is_cancelled
+    from s3wm_core.ipc import send_commands
+    from s3wm_core.key_combination import KeyCombination
+    from s3wm_core.keymap import kill_wm, restart_wm
+    from s3wm_core.launcher import spawn
+    from s3wm_core.layout_base import AbstractLayoutManager
+    from s3wm_core.log import hot_log
+    from s3wm_core.run_prompt import run_prompt
+    from s3wm_core.s3screen import S3screen
+    from s3wm_core.s3window import S3window
+    from s3wm_core.window_query import WindowInfo, query_windows
+    from s3wm_core.window_registry import WindowRegistry
+    from s3wm_core.x_models import ScreenGeometry, WindowGeometry
+
+_EXPORTS = {  # noqa: WPS407
+    "kill_wm": "s3wm_core.keymap",
+    "restart_wm": "s3wm_core.keymap",
+    "reload_config": "s3wm_core.config_reload",
+    "repeatable": "s3wm_core.autorepeat",
+    "S3window": "s3wm_core.s3window",
+    "S3screen": "s3wm_core.s3screen",
+    "KeyCombination": "s3wm_core.key_combination",
+    "WindowGeometry": "s3wm_core.x_models",
+    "ScreenGeometry": "s3wm_core.x_models",
+    "AbstractLayoutManager": "s3wm_core.layout_base",
+    "WindowRegistry": "s3wm_core.window_registry",
+    "background": "s3wm_core.executor",
+    "is_cancelled": "s3wm_core.executor",
+    "spawn": "s3wm_core.launcher",
+    "run_prompt": "s3wm_core.run_prompt",
+    "WindowInfo": "s3wm_core.window_query",
+    "query_windows": "s3wm_core.window_query",
+    "send_commands": "s3wm_core.ipc",
+    "hot_log": "s3wm_core.log",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import exported name on first access.
+
+    :param name: attribute name.
+    :raises AttributeError: if name is not exported.
+    :return: exported object.
+    """
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 's3wm_core' has no attribute '{name}'")
+    exported = getattr(import_module(module_name), name)
+    globals()[name] = exported
+    return exported
+
 
 __all__ = [
     "kill_wm",
+    "restart_wm",
+    "reload_config",
+    "repeatable",
     "S3window",
     "S3screen",
     "KeyCombination",
     "WindowGeometry",
     "ScreenGeometry",
     "AbstractLayoutManager",
+    "WindowRegistry",
+    "background",
+    "is_cancelled",
+    "spawn",
+    "run_prompt",
+    "WindowInfo",
+    "query_windows",
+    "send_commands",
+    "hot_log",
 ]
@@ -0,0 +1,201 @@
+"""
+Handling of held keys.
+
+python-xlib doesn't implement XKB, so the two requests
+needed to enable detectable autorepeat are defined here.
+"""
+from typing import Any, Callable, Optional, Tuple
+
+from loguru import logger
+from Xlib.display import Display
+from Xlib.error import XError
+from Xlib.protocol import rq
+
+from s3wm_core.key_combination import KeyCombination
+
+XKB_EXTENSION = "XKEYBOARD"
+XKB_MAJOR_VERSION = 1
+XKB_MINOR_VERSION = 0
+XKB_USE_CORE_KEYBOARD = 0x100
+XKB_PCF_DETECTABLE_AUTOREPEAT = 1
+
+
+class XkbUseExtension(rq.ReplyRequest):
+    """XkbUseExtension request, must be sent before other XKB requests."""
+
+    _request = rq.Struct(
+        rq.Card8("opcode"),
+        rq.Opcode(0),
+        rq.RequestLength(),
+        rq.Card16("wanted_major"),
+        rq.Card16("wanted_minor"),
+    )
+
+    _reply = rq.Struct(
+        rq.ReplyCode(),
+        rq.Bool("supported"),
+        rq.Card16("sequence_number"),
+        rq.ReplyLength(),
+        rq.Card16("server_major"),
+        rq.Card16("server_minor"),
+        rq.Pad(20),  # noqa: WPS432
+    )
+
+
+class XkbPerClientFlags(rq.ReplyRequest):
+    """XkbPerClientFlags request."""
+
+    _request = rq.Struct(
+        rq.Card8("opcode"),
+        rq.Opcode(21),  # noqa: WPS432
+        rq.RequestLength(),
+        rq.Card16("device_spec"),
+        rq.Pad(2),
+        rq.Card32("change"),
+        rq.Card32("value"),
+        rq.Card32("ctrls_to_change"),
+        rq.Card32("auto_ctrls"),
+        rq.Card32("auto_ctrls_values"),
+    )
+
+    _reply = rq.Struct(
+        rq.ReplyCode(),
+        rq.Card8("device_id"),
+        rq.Card16("sequence_number"),
+        rq.ReplyLength(),
+        rq.Card32("supported"),
+        rq.Card32("value"),
+        rq.Card32("auto_ctrls"),
+        rq.Card32("auto_ctrls_values"),
+        rq.Pad(8),
+    )
+
+
+def enable_detectable_autorepeat(display: Display) -> bool:
+    """
+    Ask X server not to send KeyRelease events for autorepeated keys.
+
+    Held key then produces a series of KeyPress events
+    followed by a single KeyRelease, instead of a release
+    and a new press for every repeat.
+
+    :param display: current display.
+    :return: True if detectable autorepeat is enabled.
+    """
+    extension = display.query_extension(XKB_EXTENSION)
+    if extension is None:
+        logger.debug("XKB is not available")
+        return False
+    try:
+        use_reply = XkbUseExtension(
+            display=display.display,
+            opcode=extension.major_opcode,
+            wanted_major=XKB_MAJOR_VERSION,
+            wanted_minor=XKB_MINOR_VERSION,
+        )
+        if not use_reply.supported:
+            logger.debug("XKB version is not supported")
+            return False
+        flags_reply = XkbPerClientFlags(
+            display=display.display,
+            opcode=extension.major_opcode,
+            device_spec=XKB_USE_CORE_KEYBOARD,
+            change=XKB_PCF_DETECTABLE_AUTOREPEAT,
+            value=XKB_PCF_DETECTABLE_AUTOREPEAT,
+            ctrls_to_change=0,
+            auto_ctrls=0,
+            auto_ctrls_values=0,
+        )
+    except XError as err:
+        logger.debug(f"Can't enable detectable autorepeat. Cause: {err}")
+        return False
+    return bool(flags_reply.value & XKB_PCF_DETECTABLE_AUTOREPEAT)
+
+
+class RepeatableAction:
+    """
+    Key action that can be applied many times at once.
+
+    When a key with this action is held, all presses
+    from one batch of events are passed to the action as a count,
+    so the layout is updated once instead of after every press.
+    """
+
+    def __init__(self, action: Callable[[Any, int], Any]) -> None:
+        """
+        Wrap action.
+
+        :param action: function that accepts S3WM and number of presses.
+        """
+        self.action = action
+
+    def __call__(self, wm: Any, count: int = 1) -> Any:
+        """
+        Run action.
+
+        :param wm: an S3WM instance. (Used Any to avoid circular deps)
+        :param count: number of key presses.
+        :return: result of the action.
+        """
+        return self.action(wm, count)
+
+
+def repeatable(action: Callable[[Any, int], Any]) -> RepeatableAction:
+    """
+    Mark key action as repeatable.
+
+    Example:
+
+        @repeatable
+        def grow_main_window(wm: S3WM, count: int) -> None:
+            wm.layout.change_main_window_size(5 * count)
+
+    :param action: function that accepts S3WM and number of presses.
+    :return: repeatable action.
+    """
+    return RepeatableAction(action)
+
+
+class KeyRepeatBuffer:
+    """
+    Presses of a repeatable key waiting for the end of the event batch.
+
+    Consecutive presses of the same key are counted.
+    Press of another key flushes the buffer,
+    so actions still run in the order keys were pressed.
+    """
+
+    def __init__(self) -> None:
+        self.combination: Optional[KeyCombination] = None
+        self.count = 0
+        # Number of presses that didn't cause a separate action call.
+        self.coalesced = 0
+
+    def add(self, combination: KeyCombination) -> Optional[Tuple[KeyCombination, int]]:
+        """
+        Count key press.
+
+        :param combination: pressed combination with repeatable action.
+        :return: previously buffered combination and its count
+            if it must be run before this one.
+        """
+        flushed = None
+        if combination is not self.combination:
+            flushed = self.take()
+        self.combination = combination
+        self.count += 1
+        return flushed
+
+    def take(self) -> Optional[Tuple[KeyCombination, int]]:
+        """
+        Empty the buffer.
+
+        :return: buffered combination and number of presses.
+        """
+        if self.combination is None:
+            return None
+        pending = (self.combination, self.count)
+        self.coalesced += self.count - 1
+        self.combination = None
+        self.count = 0
+        return pending
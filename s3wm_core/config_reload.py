@@ -0,0 +1,135 @@
+from time import perf_counter
+from typing import Any, Optional
+
+from loguru import logger
+
+from s3wm_core.inotify import IN_CLOSE_WRITE, IN_MOVED_TO, Inotify
+from s3wm_core.keymap import update_keymap
+
+
+class ConfigReloader:
+    """
+    Applies changes of user config without restarting the WM.
+
+    Config is executed in a fresh module and only key bindings
+    are updated. Layout and windows stay untouched,
+    startup actions are not called again.
+    """
+
+    def __init__(self, wm: Any) -> None:
+        """
+        Create reloader.
+
+        :param wm: an S3WM instance. (Used Any to avoid circular deps)
+        """
+        self.wm = wm
+        self.reloads = 0
+        self._inotify: Optional[Inotify] = None
+        self._conf_name = ""
+
+    @property
+    def is_watching(self) -> bool:
+        """
+        Whether config file is watched.
+
+        :return: True if changes are detected automatically.
+        """
+        return self._inotify is not None
+
+    def watch(self) -> bool:
+        """
+        Reload config every time the file is saved.
+
+        Directory is watched instead of the file,
+        because editors often save to a new file and rename it
+        over the old one, so a watch on the replaced file is lost.
+
+        :return: True if config is watched.
+        """
+        from s3wm_core.wm_config import conf_path  # noqa: WPS433
+
+        if not Inotify.is_available():
+            logger.warning("Can't watch config, inotify is not available.")
+            return False
+        inotify = Inotify()
+        try:
+            inotify.add_watch(str(conf_path.parent), IN_CLOSE_WRITE | IN_MOVED_TO)
+        except OSError as err:
+            logger.warning(f"Can't watch config. Cause: {err}")
+            inotify.close()
+            return False
+        self._inotify = inotify
+        self._conf_name = conf_path.name
+        return True
+
+    def fileno(self) -> int:
+        """
+        File descriptor that becomes readable when config changes.
+
+        :return: file descriptor.
+        """
+        inotify: Inotify = self._inotify  # type: ignore
+        return inotify.fileno()
+
+    def handle_events(self) -> None:
+        """
+        Reload config if it was changed.
+
+        Events of other files saved in the config directory
+        are dropped by name.
+        """
+        if self._inotify is None:
+            return
+        events = self._inotify.read_events()
+        if any(event.name == self._conf_name for event in events):
+            self.reload()
+
+    def reload(self) -> bool:
+        """
+        Execute config again and update key grabs.
+
+        If new config is broken, current one is kept.
+
+        :return: True if config was reloaded.
+        """
+        from s3wm_core import wm_config  # noqa: WPS433
+
+        started_at = perf_counter()
+        try:
+            module = wm_config.load_user_config()
+        except KeyboardInterrupt:
+            raise
+        # Calling exit() in config must not stop the WM.
+        except BaseException as exc:  # noqa: WPS424
+            logger.exception(exc)
+            logger.error("Can't reload config. Keeping current one.")
+            return False
+        if module is None:
+            logger.error("Can't find user config.")
+            return False
+        combinations = getattr(module, "combinations", wm_config.default_combinations)
+        grabbed, released = update_keymap(self.wm.display, combinations)
+        wm_config.combinations = combinations
+        self.wm.display.flush()
+        self.reloads += 1
+        reload_time = (perf_counter() - started_at) * 1000
+        logger.info(
+            f"Config reloaded in {reload_time:.2f} ms. "
+            + f"Keys grabbed: {grabbed}, released: {released}",
+        )
+        return True
+
+    def close(self) -> None:
+        """Stop watching config."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+def reload_config(wm: Any) -> None:
+    """
+    Key action to reload user config.
+
+    :param wm: an S3WM instance. (Used Any to avoid circular deps)
+    """
+    wm.config_reloader.reload()
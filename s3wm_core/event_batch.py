@@ -0,0 +1,73 @@
+from typing import Any, Dict, Hashable, List, Optional
+
+from Xlib import X
+
+CROSSING_EVENTS = frozenset((X.EnterNotify, X.LeaveNotify))
+# Enter and Leave events supersede each other.
+CROSSING_KEY = "crossing"
+
+
+class EventBatchStats:
+    """Counters for received and coalesced events."""
+
+    def __init__(self) -> None:
+        self.batches = 0
+        self.received = 0
+        self.coalesced = 0
+
+    def record(self, received: int, dispatched: int) -> None:
+        """
+        Record handled batch.
+
+        :param received: number of events read from X server.
+        :param dispatched: number of events left after coalescing.
+        """
+        self.batches += 1
+        self.received += received
+        self.coalesced += received - dispatched
+
+    def __str__(self) -> str:
+        return (
+            f"<EventBatchStats batches={self.batches} "
+            f"received={self.received} coalesced={self.coalesced}>"
+        )
+
+
+def get_coalesce_key(event: Any) -> Optional[Hashable]:
+    """
+    Get key of events that supersede each other.
+
+    :param event: X11 event.
+    :return: key shared by superseded events or None
+        if the event is always dispatched.
+    """
+    if event.type in CROSSING_EVENTS:
+        return CROSSING_KEY
+    if event.type == X.ConfigureNotify:
+        return (X.ConfigureNotify, event.window.id)
+    return None
+
+
+def coalesce_events(events: List[Any]) -> List[Any]:
+    """
+    Drop events superseded by later events in the same batch.
+
+    Only the last crossing (EnterNotify or LeaveNotify) event is kept,
+    because focus follows the pointer and only its final position matters.
+    Only the last ConfigureNotify is kept for every window.
+    Order of other events is preserved.
+
+    :param events: events in order they were received.
+    :return: events to dispatch.
+    """
+    keys = [get_coalesce_key(event) for event in events]
+    last_index: Dict[Hashable, int] = {}
+    for index, key in enumerate(keys):
+        if key is not None:
+            last_index[key] = index
+    kept = set(last_index.values())
+    return [
+        event
+        for index, (event, key) in enumerate(zip(events, keys))
+        if key is None or index in kept
+    ]
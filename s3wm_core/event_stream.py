@@ -0,0 +1,120 @@
+"""
+State change notifications for external tools.
+
+Handlers emit events, subscribers collect the ones they are
+interested in. Every subscriber has a bounded queue:
+when a consumer is too slow, the oldest events are dropped
+instead of blocking the WM.
+"""
+from collections import deque
+from typing import Any, Deque, Dict, FrozenSet, Iterable, List, Optional
+
+TAB_CHANGED = "tab_changed"
+WINDOW_MAPPED = "window_mapped"
+WINDOW_UNMAPPED = "window_unmapped"
+FOCUS_CHANGED = "focus_changed"
+LAYOUT_RETILED = "layout_retiled"
+
+EVENT_TYPES = frozenset(
+    (TAB_CHANGED, WINDOW_MAPPED, WINDOW_UNMAPPED, FOCUS_CHANGED, LAYOUT_RETILED),
+)
+DEFAULT_QUEUE_SIZE = 256
+
+
+class Subscriber:
+    """Queue of events of chosen types."""
+
+    def __init__(self, event_types: FrozenSet[str], maxsize: int) -> None:
+        self.event_types = event_types
+        self.queue: Deque[Dict[str, Any]] = deque(maxlen=maxsize)
+        # Events dropped since the last `take`.
+        self.dropped = 0
+
+    def put(self, event: Dict[str, Any]) -> None:
+        """
+        Add event, dropping the oldest one if the queue is full.
+
+        :param event: event to add.
+        """
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(event)
+
+    def take(self) -> List[Dict[str, Any]]:
+        """
+        Empty the queue.
+
+        If some events were dropped, the first returned event
+        tells how many of them.
+
+        :return: queued events.
+        """
+        events = list(self.queue)
+        self.queue.clear()
+        if self.dropped:
+            events.insert(0, {"event": "dropped", "count": self.dropped})
+            self.dropped = 0
+        return events
+
+
+class EventStream:
+    """Dispatches events to subscribers by event type."""
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        self._by_type: Dict[str, List[Subscriber]] = {}
+
+    def subscribe(self, event_types: Optional[Iterable[str]] = None) -> Subscriber:
+        """
+        Start collecting events.
+
+        :param event_types: event types, all types if not passed.
+        :raises ValueError: if event type is unknown.
+        :return: new subscriber.
+        """
+        types = EVENT_TYPES if event_types is None else frozenset(event_types)
+        unknown = types - EVENT_TYPES
+        if unknown:
+            raise ValueError(f"Unknown event types: {', '.join(sorted(unknown))}")
+        subscriber = Subscriber(types, self.queue_size)
+        for event_type in types:
+            self._by_type.setdefault(event_type, []).append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """
+        Stop collecting events.
+
+        :param subscriber: subscriber to remove.
+        """
+        for event_type in subscriber.event_types:
+            subscribers = self._by_type.get(event_type, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            if not subscribers:
+                self._by_type.pop(event_type, None)
+
+    def wants(self, event_type: str) -> bool:
+        """
+        Check if anyone is subscribed to event type.
+
+        Use it to skip building expensive events.
+
+        :param event_type: event type.
+        :return: True if event would be delivered.
+        """
+        return event_type in self._by_type
+
+    def emit(self, event_type: str, **data: Any) -> None:
+        """
+        Send event to subscribers.
+
+        :param event_type: one of EVENT_TYPES.
+        :param data: JSON serializable event fields.
+        """
+        subscribers = self._by_type.get(event_type)
+        if not subscribers:
+            return
+        event = {"event": event_type, **data}
+        for subscriber in subscribers:
+            subscriber.put(event)
@@ -0,0 +1,248 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from queue import Empty, SimpleQueue
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+_current_job = threading.local()
+
+
+class BackgroundAction:
+    """
+    Action that runs outside of the X event loop.
+
+    Background actions are executed in a thread pool,
+    so they can do slow things such as network requests
+    without freezing the window manager.
+    They must not touch X11 or the layout directly,
+    use `wm.executor.call_in_loop` for that.
+    """
+
+    def __init__(
+        self,
+        action: Callable[[Any], Any],
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.action = action
+        self.timeout = timeout
+
+    def __call__(self, wm: Any) -> Any:
+        return self.action(wm)
+
+    def __repr__(self) -> str:
+        return f"<BackgroundAction {self.action!r} timeout={self.timeout}>"
+
+
+def background(
+    action: Callable[[Any], Any],
+    timeout: Optional[float] = None,
+) -> BackgroundAction:
+    """
+    Mark action to run in background.
+
+    :param action: function that accepts window manager.
+    :param timeout: seconds after which action is cancelled.
+    :return: background action.
+    """
+    return BackgroundAction(action, timeout)
+
+
+def is_cancelled() -> bool:
+    """
+    Check if current background action was cancelled.
+
+    Long running actions can call it to stop early.
+
+    :return: True if action was cancelled or timed out.
+    """
+    cancel_event: Optional[threading.Event] = getattr(_current_job, "cancel", None)
+    return cancel_event is not None and cancel_event.is_set()
+
+
+class ActionExecutor:
+    """
+    Thread pool for background actions.
+
+    Actions send their effects back to the event loop
+    through a command queue. The loop waits on `fileno`
+    and calls `run_pending` when it becomes readable.
+    """
+
+    def __init__(self, max_workers: int = 4) -> None:
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="s3wm-action",
+        )
+        self._commands: "SimpleQueue[Tuple[threading.Event, Callable[[], Any]]]"
+        self._commands = SimpleQueue()
+        self._jobs: Dict["Future[Any]", Tuple[threading.Event, Optional[float]]] = {}
+        self._jobs_lock = threading.Lock()
+        self._read_fd, self._write_fd = os.pipe()
+        os.set_blocking(self._read_fd, False)
+        os.set_blocking(self._write_fd, False)
+
+    def fileno(self) -> int:
+        """
+        File descriptor that becomes readable when commands are queued.
+
+        :return: file descriptor.
+        """
+        return self._read_fd
+
+    def submit(self, action: BackgroundAction, wm: Any) -> "Future[Any]":
+        """
+        Run action in background.
+
+        :param action: background action.
+        :param wm: window manager passed to the action.
+        :return: future of the action.
+        """
+        cancel_event = threading.Event()
+        deadline = None
+        if action.timeout is not None:
+            deadline = time.monotonic() + action.timeout
+        future = self._pool.submit(self._run, action, wm, cancel_event)
+        with self._jobs_lock:
+            self._jobs[future] = (cancel_event, deadline)
+        future.add_done_callback(self._job_done)
+        return future
+
+    def call_in_loop(self, command: Callable[..., Any], *args: Any) -> None:
+        """
+        Queue a command to run in the event loop.
+
+        Commands from cancelled actions are dropped.
+
+        :param command: function to call.
+        :param args: function arguments.
+        """
+        cancel_event = getattr(_current_job, "cancel", None) or threading.Event()
+        if cancel_event.is_set():
+            return
+        self._commands.put((cancel_event, lambda: command(*args)))
+        try:
+            os.write(self._write_fd, b"\0")
+        except BlockingIOError:
+            # Pipe is full, so the loop is going to wake up anyway.
+            logger.debug("Executor wakeup pipe is full")
+
+    def run_pending(self) -> int:
+        """
+        Run queued commands and cancel timed out actions.
+
+        :return: number of commands executed.
+        """
+        with suppress(BlockingIOError):
+            os.read(self._read_fd, 4096)  # noqa: WPS432
+        self._cancel_expired()
+        executed = 0
+        while True:
+            try:
+                cancel_event, command = self._commands.get_nowait()
+            except Empty:
+                return executed
+            if self._run_command(cancel_event, command):
+                executed += 1
+
+    def _run_command(
+        self,
+        cancel_event: threading.Event,
+        command: Callable[[], Any],
+    ) -> bool:
+        """
+        Run queued command unless its action was cancelled.
+
+        Errors are logged, so one failed command doesn't
+        stop the rest of the queue.
+
+        :param cancel_event: cancel event of the action.
+        :param command: command to run.
+        :return: whether the command was executed.
+        """
+        if cancel_event.is_set():
+            return False
+        try:
+            command()
+        except Exception as exc:
+            logger.exception(exc)
+        return True
+
+    def next_timeout(self) -> Optional[float]:
+        """
+        Time until the nearest action deadline.
+
+        :return: seconds to wait or None if there are no deadlines.
+        """
+        with self._jobs_lock:
+            deadlines = [
+                deadline
+                for cancel_event, deadline in self._jobs.values()
+                if deadline is not None and not cancel_event.is_set()
+            ]
+        if not deadlines:
+            return None
+        return max(0, min(deadlines) - time.monotonic())
+
+    def cancel_all(self) -> None:
+        """Cancel all running and queued actions."""
+        with self._jobs_lock:
+            jobs = list(self._jobs.items())
+        for future, (cancel_event, _) in jobs:
+            cancel_event.set()
+            future.cancel()
+
+    def shutdown(self) -> None:
+        """Cancel actions and stop worker threads."""
+        self.cancel_all()
+        self._pool.shutdown(wait=False)
+        os.close(self._read_fd)
+        os.close(self._write_fd)
+
+    def _cancel_expired(self) -> None:
+        """Cancel actions that are running longer than their timeout."""
+        now = time.monotonic()
+        with self._jobs_lock:
+            jobs = list(self._jobs.items())
+        for future, (cancel_event, deadline) in jobs:
+            if deadline is not None and deadline <= now and not cancel_event.is_set():
+                logger.warning("Background action timed out")
+                cancel_event.set()
+                future.cancel()
+
+    def _job_done(self, future: "Future[Any]") -> None:
+        """
+        Forget finished action and log its error.
+
+        :param future: finished action.
+        """
+        with self._jobs_lock:
+            self._jobs.pop(future, None)
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            logger.opt(exception=exc).error("Background action failed")
+
+    @staticmethod
+    def _run(
+        action: BackgroundAction,
+        wm: Any,
+        cancel_event: threading.Event,
+    ) -> Any:
+        """
+        Run action in a worker thread.
+
+        :param action: background action.
+        :param wm: window manager.
+        :param cancel_event: event that is set when action is cancelled.
+        :return: action result.
+        """
+        _current_job.cancel = cancel_event
+        try:
+            return action(wm)
+        finally:
+            _current_job.cancel = None
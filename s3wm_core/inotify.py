@@ -0,0 +1,138 @@
+"""Minimal inotify bindings for watching directories."""
+import ctypes
+import ctypes.util
+import os
+import struct
+from typing import Dict, List, NamedTuple, Optional
+
+from loguru import logger
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyEvent(NamedTuple):
+    """Change in a watched directory."""
+
+    path: str  # Watched directory.
+    mask: int
+    name: str  # File name inside the directory.
+
+
+class Inotify:
+    """
+    Non blocking inotify instance.
+
+    Use `is_available` to check if inotify
+    is supported on current system.
+    """
+
+    _libc: Optional[ctypes.CDLL] = None
+
+    def __init__(self) -> None:
+        libc = self._load_libc()
+        if libc is None:
+            raise OSError("inotify is not available")
+        self._libc = libc
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "Can't initialize inotify")
+        self.fd: int = fd
+        self._paths: Dict[int, str] = {}
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+        Check if inotify can be used.
+
+        :return: True if libc has inotify functions.
+        """
+        return cls._load_libc() is not None
+
+    def fileno(self) -> int:
+        """
+        File descriptor that becomes readable when events arrive.
+
+        :return: file descriptor.
+        """
+        return self.fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """
+        Start watching a directory.
+
+        :param path: path to a directory.
+        :param mask: events to watch.
+        :raises OSError: if directory can't be watched.
+        :return: watch descriptor.
+        """
+        libc: ctypes.CDLL = self._libc  # type: ignore
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Can't watch {path}")
+        self._paths[wd] = path
+        return int(wd)
+
+    def read_events(self) -> List[InotifyEvent]:
+        """
+        Read all queued events without blocking.
+
+        :return: events in order they were generated.
+        """
+        events: List[InotifyEvent] = []
+        while True:
+            try:
+                buffer = os.read(self.fd, 65536)  # noqa: WPS432
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = buffer[offset : offset + length]
+                offset += length
+                name = os.fsdecode(raw_name.rstrip(b"\0"))
+                path = self._paths.get(wd, "")
+                if mask & IN_IGNORED:
+                    self._paths.pop(wd, None)
+                events.append(InotifyEvent(path, mask, name))
+
+    def close(self) -> None:
+        """Stop watching."""
+        os.close(self.fd)
+
+    @classmethod
+    def _load_libc(cls) -> Optional[ctypes.CDLL]:
+        """
+        Load libc with inotify functions.
+
+        :return: libc or None.
+        """
+        if cls._libc is not None:
+            return cls._libc
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            return None
+        try:
+            libc = ctypes.CDLL(libc_name, use_errno=True)
+        except OSError as err:
+            logger.debug(f"Can't load libc. Cause: {err}")
+            return None
+        if not hasattr(libc, "inotify_init1"):
+            return None
+        cls._libc = libc
+        return libc
@@ -0,0 +1,500 @@
+"""
+Control channel for scripting running WM.
+
+Clients connect to a Unix socket and send JSON requests,
+one per line. A request is an object like
+`{"command": "change_tab", "args": [1]}` or a list of such objects.
+Every request line gets exactly one response line:
+`{"ok": true, "result": ...}`, `{"ok": false, "error": "..."}`
+or a list of them for a list of commands.
+
+Commands are applied to in-memory state, queries never touch
+X server. Pending layout changes are sent to X11 once
+after all received requests are handled.
+
+After `{"command": "subscribe", "args": ["tab_changed", ...]}`
+the connection also receives events as separate lines
+like `{"event": "tab_changed", "tab": 1, "previous": 0}`.
+"""
+import json
+import os
+import selectors
+import socket
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, cast
+
+from loguru import logger
+
+from s3wm_core.event_stream import Subscriber
+
+SOCKET_ENV = "S3WM_SOCKET"
+# Clients that send too long lines or don't read
+# their responses are disconnected.
+MAX_LINE_SIZE = 1024 * 1024
+MAX_OUTPUT_SIZE = 4 * 1024 * 1024
+READ_SIZE = 65536
+
+
+def get_socket_path() -> Path:
+    """
+    Get path of the control socket for current display.
+
+    :return: path from S3WM_SOCKET variable or
+        a path in user's runtime directory.
+    """
+    env_path = os.environ.get(SOCKET_ENV)
+    if env_path:
+        return Path(env_path)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"  # noqa: S108
+    display = os.environ.get("DISPLAY", ":0").replace("/", "_")
+    return Path(runtime_dir) / f"s3wm-{os.getuid()}-{display}.sock"
+
+
+class IpcClient:
+    """Connection to the control socket."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.socket = sock
+        self.input = bytearray()
+        self.output = bytearray()
+        self.subscriber: Optional[Subscriber] = None
+
+
+class IpcServer:
+    """
+    Unix socket server that runs commands in the WM process.
+
+    Listening socket and all clients are watched
+    by a single selector, so the WM loop only watches `fileno`.
+    """
+
+    def __init__(self, wm: Any) -> None:
+        """
+        Create server.
+
+        :param wm: an S3WM instance. (Used Any to avoid circular deps)
+        """
+        self.wm = wm
+        self.path: Optional[Path] = None
+        self.clients: Dict[int, IpcClient] = {}
+        self.requests = 0
+        self._listener: Optional[socket.socket] = None
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._builtin_commands: Dict[str, Callable[..., Any]] = {
+            "get_commands": self.get_commands,
+            "get_windows": self.get_windows,
+            "get_metrics": wm.metrics_snapshot,
+            "reload_config": lambda: wm.config_reloader.reload(),
+            "toggle_profiler": lambda: wm.toggle_profiler(),
+            "get_memory_report": lambda: wm.memory_report(),
+        }
+        # Commands that receive the client as the first argument.
+        self._client_commands: Dict[str, Callable[..., Any]] = {
+            "subscribe": self.subscribe,
+            "unsubscribe": self.unsubscribe,
+        }
+
+    @property
+    def is_listening(self) -> bool:
+        """
+        Whether the server is started.
+
+        :return: True if clients can connect.
+        """
+        return self._listener is not None
+
+    def listen(self, path: Optional[Path] = None) -> bool:
+        """
+        Start accepting clients.
+
+        Socket path is exported as S3WM_SOCKET,
+        so programs started by the WM can find it.
+
+        :param path: socket path, see `get_socket_path` for default.
+        :return: True if server is started.
+        """
+        path = path or get_socket_path()
+        if not self._remove_stale_socket(path):
+            return False
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            # Socket is never accessible by other users, even briefly.
+            umask = os.umask(0o077)  # noqa: WPS432
+            try:
+                listener.bind(str(path))
+            finally:
+                os.umask(umask)
+            listener.listen()
+        except OSError as err:
+            logger.warning(f"Can't start control socket. Cause: {err}")
+            listener.close()
+            return False
+        listener.setblocking(False)
+        selector = selectors.DefaultSelector()
+        selector.register(listener, selectors.EVENT_READ)
+        self._listener = listener
+        self._selector = selector
+        self.path = path
+        os.environ[SOCKET_ENV] = str(path)
+        logger.info(f"Listening for commands on {path}")
+        return True
+
+    def fileno(self) -> int:
+        """
+        File descriptor that becomes readable when clients need attention.
+
+        :return: file descriptor.
+        """
+        selector: Any = self._selector
+        return int(selector.fileno())
+
+    def handle_events(self) -> None:
+        """Accept clients, run their requests and send responses."""
+        if self._selector is None:
+            return
+        handled = self.requests
+        for key, mask in self._selector.select(0):
+            if key.fileobj is self._listener:
+                self._accept()
+            else:
+                self._handle_client(key.fd, mask)
+        if self.requests != handled:
+            self.wm.sync_x()
+
+    def send_events(self) -> None:
+        """Send queued events to subscribed clients."""
+        for client in list(self.clients.values()):
+            if client.subscriber is not None and client.subscriber.queue:
+                self._send_queued(client)
+
+    def subscribe(self, client: IpcClient, *event_types: str) -> List[str]:
+        """
+        Send events of given types to the client.
+
+        :param client: subscribing client.
+        :param event_types: event types, all types if not passed.
+        :return: subscribed event types.
+        """
+        self.unsubscribe(client)
+        events = self.wm.events
+        client.subscriber = events.subscribe(event_types or None)
+        return sorted(client.subscriber.event_types)
+
+    def unsubscribe(self, client: IpcClient) -> None:
+        """
+        Stop sending events to the client.
+
+        :param client: subscribed client.
+        """
+        if client.subscriber is not None:
+            self.wm.events.unsubscribe(client.subscriber)
+            client.subscriber = None
+
+    def get_commands(self) -> List[str]:
+        """
+        List available commands.
+
+        :return: command names.
+        """
+        commands = {
+            **self.wm.layout.get_commands(),
+            **self._builtin_commands,
+            **self._client_commands,
+        }
+        return sorted(commands)
+
+    def get_windows(self) -> List[int]:
+        """
+        List managed windows.
+
+        :return: X11 ids of windows.
+        """
+        return [window.id for window in self.wm.windows]
+
+    def run_request(self, request: Any, client: Optional[IpcClient] = None) -> Any:
+        """
+        Run a single request or a list of requests.
+
+        :param request: decoded request.
+        :param client: client that sent the request.
+        :return: response or list of responses.
+        """
+        if isinstance(request, list):
+            return [self.run_command(command, client) for command in request]
+        return self.run_command(request, client)
+
+    def run_command(  # noqa: C901
+        self,
+        request: Any,
+        client: Optional[IpcClient] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run command and build response.
+
+        :param request: object with command name and optional args.
+        :param client: client that sent the request.
+        :return: response.
+        """
+        self.requests += 1
+        if not isinstance(request, dict) or not isinstance(request.get("command"), str):
+            return {"ok": False, "error": "Request must be an object with a command"}
+        response: Dict[str, Any] = {}
+        if "id" in request:
+            response["id"] = request["id"]
+        name = request["command"]
+        args = request.get("args", [])
+        command = self._builtin_commands.get(name)
+        if name in self._client_commands and client is not None:
+            args = [client, *args] if isinstance(args, list) else args
+            command = self._client_commands[name]
+        if command is None:
+            command = self.wm.layout.get_commands().get(name)
+        if command is None:
+            response.update(ok=False, error=f"Unknown command: {name}")
+        elif not isinstance(args, list):
+            response.update(ok=False, error="Args must be a list")
+        else:
+            try:
+                response.update(ok=True, result=command(*args))
+            except Exception as exc:
+                logger.debug(f"Command {name} failed. Cause: {exc}")
+                response.update(ok=False, error=f"{exc.__class__.__name__}: {exc}")
+        return response
+
+    def close(self) -> None:
+        """Disconnect all clients and remove the socket."""
+        for client in list(self.clients.values()):
+            self._disconnect(client)
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+            self.path = None
+
+    def _remove_stale_socket(self, path: Path) -> bool:
+        """
+        Remove socket left by a WM that has exited.
+
+        :param path: socket path.
+        :return: False if the socket is used by a running WM
+            or can't be removed.
+        """
+        if not path.exists():
+            return True
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            return self._unlink_socket(path)
+        finally:
+            probe.close()
+        logger.warning(f"Another WM is listening on {path}")
+        return False
+
+    def _unlink_socket(self, path: Path) -> bool:
+        """
+        Remove socket file.
+
+        :param path: socket path.
+        :return: True if the path is free.
+        """
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as err:
+            logger.warning(f"Can't remove stale socket {path}. Cause: {err}")
+            return False
+        return True
+
+    def _accept(self) -> None:
+        """Accept new client."""
+        listener: Any = self._listener
+        selector: Any = self._selector
+        try:
+            sock, _ = listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        sock.setblocking(False)
+        client = IpcClient(sock)
+        self.clients[sock.fileno()] = client
+        selector.register(sock, selectors.EVENT_READ)
+
+    def _handle_client(self, fd: int, mask: int) -> None:
+        """
+        Read from or write to the ready client.
+
+        :param fd: client socket descriptor.
+        :param mask: selector events of the socket.
+        """
+        client = self.clients.get(fd)
+        if client is None:
+            return
+        if mask & selectors.EVENT_READ:
+            self._read(client)
+        if mask & selectors.EVENT_WRITE and fd in self.clients:
+            self._send_queued(client)
+
+    def _read(self, client: IpcClient) -> None:
+        """
+        Read requests of the client.
+
+        :param client: client with incoming data.
+        """
+        chunk = self._receive(client)
+        if chunk is None:
+            return
+        lines = self._take_lines(client, chunk)
+        if lines is None:
+            self._disconnect(client)
+            return
+        for line in lines:
+            if not line.strip():
+                continue
+            if not self.send(client, self._handle_line(client, line)):
+                return
+
+    def _receive(self, client: IpcClient) -> Optional[bytes]:
+        """
+        Read available data from the client socket.
+
+        :param client: client with incoming data.
+        :return: received data, empty if the client disconnected
+            or None if there's nothing to read yet.
+        """
+        try:
+            return client.socket.recv(READ_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return None
+        except OSError:
+            return b""
+
+    def _take_lines(self, client: IpcClient, chunk: bytes) -> Optional[List[bytes]]:
+        """
+        Add received data to the client input and take complete lines.
+
+        :param client: client that sent the data.
+        :param chunk: received data, empty if the client disconnected.
+        :return: complete lines or None if the client must be disconnected.
+        """
+        if not chunk:
+            return None
+        client.input.extend(chunk)
+        *lines, rest = client.input.split(b"\n")
+        if len(rest) > MAX_LINE_SIZE:
+            logger.warning("Control client sent too long request")
+            return None
+        client.input = bytearray(rest)
+        return [bytes(line) for line in lines]
+
+    def _handle_line(self, client: IpcClient, line: bytes) -> Any:
+        """
+        Decode and run request.
+
+        :param client: client that sent the line.
+        :param line: request line.
+        :return: response.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as err:
+            return {"ok": False, "error": f"Invalid JSON: {err}"}
+        return self.run_request(request, client)
+
+    def send(self, client: IpcClient, message: Any) -> bool:
+        """
+        Send JSON line to the client.
+
+        Data that doesn't fit in the socket buffer is sent
+        when the client is ready to read it.
+
+        :param client: receiver.
+        :param message: JSON serializable message.
+        :return: False if the client was disconnected.
+        """
+        client.output.extend(json.dumps(message, default=str).encode())
+        client.output.extend(b"\n")
+        if len(client.output) > MAX_OUTPUT_SIZE:
+            logger.warning("Control client doesn't read responses")
+            self._disconnect(client)
+            return False
+        return self._write(client)
+
+    def _send_queued(self, client: IpcClient) -> bool:
+        """
+        Send buffered data and queued events.
+
+        Events are taken from the queue only when previous data
+        is sent, so the queue limits memory used by slow clients.
+
+        :param client: receiver.
+        :return: False if the client was disconnected.
+        """
+        subscriber = client.subscriber
+        if not client.output and subscriber is not None and subscriber.queue:
+            for event in subscriber.take():
+                client.output.extend(json.dumps(event).encode())
+                client.output.extend(b"\n")
+        return self._write(client)
+
+    def _write(self, client: IpcClient) -> bool:
+        """
+        Send buffered data.
+
+        :param client: receiver.
+        :return: False if the client was disconnected.
+        """
+        selector: Any = self._selector
+        try:
+            sent = client.socket.send(client.output)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._disconnect(client)
+            return False
+        del client.output[:sent]  # noqa: WPS420
+        events = selectors.EVENT_READ
+        if client.output:
+            events |= selectors.EVENT_WRITE
+        selector.modify(client.socket, events)
+        return True
+
+    def _disconnect(self, client: IpcClient) -> None:
+        """
+        Close client connection.
+
+        :param client: client to disconnect.
+        """
+        self.unsubscribe(client)
+        fd = client.socket.fileno()
+        self.clients.pop(fd, None)
+        if self._selector is not None:
+            self._selector.unregister(client.socket)
+        client.socket.close()
+
+
+def send_commands(
+    commands: List[Dict[str, Any]],
+    path: Optional[Path] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Send commands to running WM.
+
+    Example:
+
+        send_commands([
+            {"command": "change_tab", "args": [2]},
+            {"command": "get_focused_window"},
+        ])
+
+    :param commands: commands to run in a single batch.
+    :param path: socket path, see `get_socket_path` for default.
+    :return: responses in the same order.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path or get_socket_path()))
+        sock.sendall(json.dumps(commands).encode() + b"\n")
+        with sock.makefile("rb") as response:
+            return cast(List[Dict[str, Any]], json.loads(response.readline()))
@@ -2,6 +2,8 @@ from typing import Any, Callable, Optional, Union
 
 from Xlib import XK, X
 
+from s3wm_core.launcher import Command
+
 
 class KeyCombination:
     """Used to add global key combinations."""
@@ -19,6 +21,9 @@ class KeyCombination:
         if isinstance(key, str):
             self.key = XK.string_to_keysym(key)
         self.action = action  # Action to perform when event pressed
+        self.command: Optional[Command] = None  # Parsed shell action
+        if isinstance(action, str):
+            self.command = Command(action)
 
     def __repr__(self) -> str:
         return f"{{key:{self.key} mod:{self.modifiers}"
@@ -1,13 +1,36 @@
-from typing import Any, Callable, Dict, Optional, Tuple, Union
+import os
+import sys
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from loguru import logger
-from Xlib import X
+from Xlib import XK, X
 from Xlib.display import Display
-from Xlib.protocol.event import KeyPress
+from Xlib.protocol.event import KeyPress, MappingNotify
 
 from s3wm_core.key_combination import KeyCombination
 
+# Compiled dispatch table. Modifiers are stored without lock bits.
 keycode_mapping: Dict[Tuple[int, int], KeyCombination] = {}
+# Passive grabs registered in X11, including lock variants.
+grabbed_keys: Set[Tuple[int, int]] = set()
+# Combinations the dispatch table was built from.
+bound_combinations: List[KeyCombination] = []
+# Modifiers of CapsLock, NumLock and ScrollLock.
+lock_mask = X.LockMask
+# Bits of KeyPress state that are used for matching.
+state_mask = 0xFF & ~lock_mask  # noqa: WPS432
+
+LOCK_KEYSYMS = (XK.XK_Num_Lock, XK.XK_Scroll_Lock)
 
 
 def kill_wm(wm: Any) -> None:
@@ -15,10 +38,45 @@ def kill_wm(wm: Any) -> None:
 
     :param wm: an S3WM instance. (Used Any to avoid circular deps)
     """
+    wm.save_session()
+    wm.ipc.close()
+    wm.executor.shutdown()
     wm.display.close()
     exit(0)  # noqa: WPS421
 
 
+def get_restart_args() -> List[str]:
+    """
+    Get command line that started the WM.
+
+    `sys.argv` alone doesn't tell whether the WM was started by the `s3wm`
+    script or with `python -m s3wm.main`, `sys.orig_argv` is used if
+    available (Python 3.10+).
+
+    :return: arguments for `os.execv`.
+    """
+    orig_argv = getattr(sys, "orig_argv", None)
+    if orig_argv:
+        return [sys.executable, *orig_argv[1:]]
+    return [sys.executable, "-m", "s3wm.main", *sys.argv[1:]]
+
+
+def restart_wm(wm: Any) -> None:
+    """Restart WM process keeping windows in their tabs.
+
+    :param wm: an S3WM instance. (Used Any to avoid circular deps)
+    """
+    wm.save_session()
+    wm.ipc.close()
+    if wm.profiler is not None:
+        # Exit handlers don't run on exec.
+        wm.profiler.stop()
+        wm.profiler.dump()
+    wm.executor.shutdown()
+    wm.display.close()
+    os.execv(sys.executable, get_restart_args())  # noqa: S606
+
+
 def init_keymap(display: Display) -> None:
     """
     Sends requests to the X Server to listen for specific key events.
@@ -42,20 +100,160 @@ def init_keymap(display: Display) -> None:
         )
 
     # Registering all keybindings to X11.
+    set_lock_mask(get_lock_mask(display))
+    update_keymap(display, combinations)
+
+
+def get_lock_mask(display: Display) -> int:
+    """
+    Find modifiers used by lock keys on current keyboard.
+
+    CapsLock is always Lock, NumLock and ScrollLock
+    are usually bound to Mod2 and Mod5, but it depends on the keymap.
+
+    :param display: current display.
+    :return: mask of lock modifiers.
+    """
+    lock_codes: Set[int] = set()
+    for keysym in LOCK_KEYSYMS:
+        lock_codes.update(code for code, _ in display.keysym_to_keycodes(keysym))
+    mask: int = X.LockMask
+    for index, codes in enumerate(display.get_modifier_mapping()):
+        if lock_codes.intersection(codes):
+            mask |= 1 << index
+    return mask
+
+
+def set_lock_mask(mask: int) -> None:
+    """
+    Set modifiers ignored while matching keys.
+
+    :param mask: mask of lock modifiers.
+    """
+    global lock_mask, state_mask  # noqa: WPS420
+    lock_mask = mask
+    state_mask = 0xFF & ~mask  # noqa: WPS432
+
+
+def get_lock_variants() -> List[int]:
+    """
+    Get all combinations of lock modifiers.
+
+    Passive grabs match modifiers exactly,
+    so every key is grabbed once for each of them.
+    With the core protocol it's the smallest set of grabs:
+    the only alternative, AnyModifier, would also take
+    the key without the combination's modifiers from clients.
+    Ignoring lock modifiers in the server needs XKB,
+    which python-xlib doesn't implement.
+    Only locks present on the keyboard are used,
+    so usually it's 4 grabs per key (CapsLock and NumLock).
+
+    :return: masks from 0 to `lock_mask`.
+    """
+    variants = []
+    # Iterate over all submasks of lock_mask.
+    submask = lock_mask
+    while True:
+        variants.append(submask)
+        if not submask:
+            return variants
+        submask = (submask - 1) & lock_mask
+
+
+def build_keycode_mapping(
+    display: Display,
+    combinations: Iterable[KeyCombination],
+) -> Dict[Tuple[int, int], KeyCombination]:
+    """
+    Map keycodes on current keyboard to combinations.
+
+    :param display: Used to manipulate keysym to keycode transitions.
+    :param combinations: key combinations from config.
+    :return: combinations by keycode and modifiers without lock bits.
+    """
+    mapping = {}
     for combination in combinations:
+        modifiers = combination.modifiers & state_mask
         # Getting code for key on current keyboard.
         codes = {code for code, index in display.keysym_to_keycodes(combination.key)}
-
         for code in codes:
-            logger.debug(combination)
-            display.screen().root.grab_key(
-                code,
-                combination.modifiers,
-                1,
-                X.GrabModeAsync,
-                X.GrabModeAsync,
-            )
-            keycode_mapping[(code, combination.modifiers)] = combination
+            mapping[(code, modifiers)] = combination
+    return mapping
+
+
+def update_keymap(
+    display: Display,
+    combinations: Iterable[KeyCombination],
+) -> Tuple[int, int]:
+    """
+    Grab keys for new combinations and release keys that aren't used anymore.
+
+    Keys that stay bound only get their new combination,
+    no requests are sent to X11 for them.
+
+    :param display: Used to manipulate keysym to keycode transitions.
+    :param combinations: key combinations from config.
+    :return: number of grabbed and released keys.
+    """
+    root = display.screen().root
+    combinations = list(combinations)
+    new_mapping = build_keycode_mapping(display, combinations)
+    variants = get_lock_variants()
+    new_grabs = {
+        (code, modifiers | lock)
+        for code, modifiers in new_mapping
+        for lock in variants
+    }
+    released = grabbed_keys - new_grabs
+    grabbed = new_grabs - grabbed_keys
+    for code, modifiers in released:
+        root.ungrab_key(code, modifiers)
+    for code, modifiers in grabbed:  # noqa: WPS440
+        root.grab_key(
+            code,
+            modifiers,
+            1,
+            X.GrabModeAsync,
+            X.GrabModeAsync,
+        )
+    grabbed_keys.clear()
+    grabbed_keys.update(new_grabs)
+    keycode_mapping.clear()
+    keycode_mapping.update(new_mapping)
+    bound_combinations[:] = combinations
+    logger.debug(f"Keys grabbed: {len(grabbed)}, released: {len(released)}")
+    return len(grabbed), len(released)
+
+
+def handle_mapping_notify(display: Display, event: MappingNotify) -> None:
+    """
+    Rebuild dispatch table after keyboard mapping is changed.
+
+    Only keys with changed keycodes or lock modifiers
+    are grabbed and released again.
+
+    :param display: current display.
+    :param event: X11 MappingNotify event.
+    """
+    display.refresh_keyboard_mapping(event)
+    if event.request == X.MappingModifier:
+        set_lock_mask(get_lock_mask(display))
+    elif event.request != X.MappingKeyboard:
+        return
+    update_keymap(display, bound_combinations)
+
+
+def get_key_combination(key_event: KeyPress) -> Optional[KeyCombination]:
+    """
+    Function to get the combination defined in `combinations` by keypress event.
+
+    Lock modifiers and mouse buttons are ignored.
+
+    :param key_event: event generated by X11.
+    :return: combination associated with keypress event.
+    """
+    return keycode_mapping.get((key_event.detail, key_event.state & state_mask))
 
 
 def get_key_action(  # noqa: WPS234
@@ -67,9 +265,7 @@ def get_key_action(  # noqa: WPS234
     :param key_event: event generated by X11.
     :return: Action associated with keypress event.
     """
-    key = key_event.detail
-    modifiers = key_event.state
-    combination = keycode_mapping.get((key, modifiers))
+    combination = get_key_combination(key_event)
     if combination:
         return combination.action
     return None
@@ -0,0 +1,218 @@
+import os
+import shlex
+import shutil
+import signal
+import threading
+import time
+from asyncio import AbstractEventLoop
+from typing import Any, List, Optional, Set, Union
+
+from loguru import logger
+
+from s3wm_core.signals import SignalQueue
+
+# Characters that only a shell can interpret.
+SHELL_SYNTAX = frozenset("|&;<>()$`\\*?[]{}~#\n")
+
+
+def parse_command(command: str) -> Optional[List[str]]:
+    """
+    Split command into arguments if it can run without a shell.
+
+    :param command: command line.
+    :return: arguments or None if command needs a shell.
+    """
+    if SHELL_SYNTAX.intersection(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    # Commands like `VAR=value app` set environment in a shell.
+    if not argv or "=" in argv[0]:
+        return None
+    return argv
+
+
+class Command:
+    """Command line parsed once to be started many times."""
+
+    __slots__ = ("source", "argv", "path")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.argv = parse_command(source)
+        self.path: Optional[str] = None
+
+    def get_args(self) -> List[str]:
+        """
+        Arguments to start the process with.
+
+        :return: process arguments.
+        """
+        if self.argv is None:
+            return ["/bin/sh", "-c", self.source]
+        return self.argv
+
+    def get_path(self) -> Optional[str]:
+        """
+        Find executable once and remember it.
+
+        Searching PATH in the forked process is
+        noticeably slower than spawning by absolute path.
+
+        :return: path to executable if found.
+        """
+        if self.path is None:
+            self.path = shutil.which(self.get_args()[0])
+        return self.path
+
+    @property
+    def uses_shell(self) -> bool:
+        """
+        Whether command is started with /bin/sh.
+
+        :return: True if command has shell syntax.
+        """
+        return self.argv is None
+
+    def __str__(self) -> str:
+        return self.source
+
+
+class Launcher:
+    """
+    Starts processes and reaps finished children.
+
+    Commands without shell syntax are started directly
+    with posix_spawn, others are passed to /bin/sh.
+    """
+
+    def __init__(self) -> None:
+        self.children: Set[int] = set()
+        # Processes may be started from background actions,
+        # the lock keeps pid registration and reaping apart.
+        self._lock = threading.Lock()
+        self.spawned = 0
+        self.reaped = 0
+        self.measured = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+
+    def spawn(
+        self,
+        command: Union[Command, str],
+        started_at: Optional[float] = None,
+    ) -> Optional[int]:
+        """
+        Start a process.
+
+        :param command: command to run.
+        :param started_at: perf_counter value when the launch was requested,
+            used to measure launch latency.
+        :return: pid of a new process or None if it can't be started.
+        """
+        if isinstance(command, str):
+            command = Command(command)
+        path = command.get_path()
+        if path is None:
+            logger.error(f"Can't run '{command}'. Executable is not found.")
+            return None
+        with self._lock:
+            try:
+                pid = os.posix_spawn(path, command.get_args(), os.environ)
+            except OSError as err:
+                # Executable might be moved, search for it next time.
+                command.path = None
+                logger.error(f"Can't run '{command}'. Cause: {err}")
+                return None
+            self.children.add(pid)
+        self.spawned += 1
+        if started_at is not None:
+            self._record_latency(time.perf_counter() - started_at)
+        logger.debug(f"Started '{command}' with pid {pid}")
+        return pid
+
+    def reap(self, *_: Any) -> int:
+        """
+        Collect exit statuses of finished children.
+
+        Only processes started by the launcher are reaped,
+        so `subprocess` users in config still get their exit codes.
+
+        :return: number of reaped processes.
+        """
+        finished = set()
+        with self._lock:
+            for pid in list(self.children):
+                try:
+                    reaped_pid, _status = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    reaped_pid = pid
+                if reaped_pid:
+                    finished.add(pid)
+            self.children -= finished
+        self.reaped += len(finished)
+        return len(finished)
+
+    def install(
+        self,
+        signals: SignalQueue,
+        loop: Optional[AbstractEventLoop] = None,
+    ) -> None:
+        """
+        Reap children on SIGCHLD.
+
+        Children are reaped from the event loop, never in the signal
+        context, so a process can't exit unnoticed between
+        `posix_spawn` and adding its pid to `children`.
+
+        :param signals: signal queue of the blocking event loop.
+        :param loop: asyncio loop to handle the signal in, if any.
+        """
+        if loop is not None:
+            loop.add_signal_handler(signal.SIGCHLD, self.reap)
+        else:
+            signals.add_handler(signal.SIGCHLD, self.reap)
+        # Reap children that exited before the handler was installed.
+        self.reap()
+
+    @property
+    def mean_latency(self) -> float:
+        """
+        Mean launch latency.
+
+        :return: latency in seconds.
+        """
+        if not self.measured:
+            return 0
+        return self.total_latency / self.measured
+
+    def _record_latency(self, latency: float) -> None:
+        """
+        Remember launch latency.
+
+        :param latency: latency in seconds.
+        """
+        self.measured += 1
+        self.last_latency = latency
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        logger.debug(f"Launch latency: {latency * 1000:.2f} ms")
+
+
+launcher = Launcher()
+
+
+def spawn(command: str) -> Optional[int]:
+    """
+    Start a process without waiting for it.
+
+    Can be used in config instead of `subprocess.Popen`,
+    started processes are reaped by the window manager.
+
+    :param command: command line.
+    :return: pid of a new process.
+    """
+    return launcher.spawn(command)
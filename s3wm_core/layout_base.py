@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, List
+from typing import Any, Callable, Dict, List, Set
 
 from s3wm_core.key_combination import KeyCombination
 from s3wm_core.s3window import S3window
@@ -20,6 +20,18 @@ class AbstractLayoutManager(ABC):
         :param window: added window
         """
 
+    def will_show_window(self, window: S3window) -> bool:
+        """
+        Check if a window is going to be visible after `add_window`.
+
+        Windows that go to a hidden part of the layout
+        are not mapped, so they don't flash on screen.
+
+        :param window: window that is going to be added.
+        :return: True if window must be mapped.
+        """
+        return True
+
     @abstractmethod
     def remove_window(self, window: S3window) -> None:
         """
@@ -28,6 +40,64 @@ class AbstractLayoutManager(ABC):
         :param window: window that was removed.
         """
 
+    def flush_layout(self) -> None:
+        """
+        Apply postponed layout changes.
+
+        This method is called after every batch of events
+        and after windows are adopted at startup, so layouts
+        can update window positions once instead of after every change.
+        """
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get layout counters for metrics.
+
+        :return: counters by name.
+        """
+        return {}
+
+    def get_window_ids(self) -> Set[int]:
+        """
+        Get ids of all windows held by the layout.
+
+        Used to find windows that were destroyed
+        without the WM being notified.
+
+        :return: X11 window ids.
+        """
+        return set()
+
+    def get_commands(self) -> Dict[str, Callable[..., Any]]:
+        """
+        Get layout operations available through the control socket.
+
+        Commands are called with JSON arguments
+        and must return JSON serializable results.
+        Queries must use in-memory state only.
+
+        :return: commands by name.
+        """
+        return {}
+
+    def dump_state(self) -> Any:
+        """
+        Get layout state to restore after WM restart.
+
+        :return: JSON serializable state or None.
+        """
+        return None
+
+    def load_state(self, state: Any) -> None:
+        """
+        Restore state saved by `dump_state`.
+
+        This method is called before existing windows are adopted.
+        Saved windows that don't exist anymore must be ignored.
+
+        :param state: saved state.
+        """
+
     @classmethod
     def get_keys(cls) -> List[KeyCombination]:
         """Get Keys specific to your layout.
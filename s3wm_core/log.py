@@ -0,0 +1,49 @@
+"""
+Logging for code that runs on every event.
+
+loguru checks the level only after the message is built,
+so `logger.debug(f"Event info: {event}")` formats the whole event
+even when debug messages are dropped. `hot_log` checks a flag set
+once from the configured level and passes arguments to loguru
+unformatted, so disabled messages cost a single method call.
+"""
+from typing import Any
+
+from loguru import logger
+
+DEBUG_LEVEL = 10
+
+
+class HotLog:
+    """Level-gated debug logging."""
+
+    __slots__ = ("debug_enabled",)
+
+    def __init__(self) -> None:
+        # loguru prints debug messages until it's configured.
+        self.debug_enabled = True
+
+    def configure(self, level: int) -> None:
+        """
+        Set the lowest level accepted by log sinks.
+
+        :param level: numeric log level.
+        """
+        self.debug_enabled = level <= DEBUG_LEVEL
+
+    def debug(self, message: str, *args: Any) -> None:
+        """
+        Log debug message if debug level is enabled.
+
+        Example:
+
+            hot_log.debug("Event info: {}", event)
+
+        :param message: message with `{}` placeholders for args.
+        :param args: values formatted only if the message is logged.
+        """
+        if self.debug_enabled:
+            logger.opt(depth=1).debug(message, *args)
+
+
+hot_log = HotLog()
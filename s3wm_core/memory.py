@@ -0,0 +1,199 @@
+"""
+Memory diagnostics for long-running sessions.
+
+Allocations are traced with tracemalloc. Snapshots are taken
+periodically and compared with the previous one, so steady growth
+shows up in logs with the line that allocates it.
+Sizes of WM registries are compared with windows
+that exist in X server to find leaked windows.
+"""
+import tracemalloc
+from time import monotonic
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from s3wm_core import keymap
+from s3wm_core.s3window import S3window
+from s3wm_core.window_geometry import window_geometry_cache
+
+DEFAULT_INTERVAL = 300.0
+DEFAULT_FRAMES = 10
+DEFAULT_LIMIT = 10
+# Growth smaller than this is not logged.
+GROWTH_THRESHOLD = 64 * 1024
+
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    """
+    Take snapshot without allocations of import machinery.
+
+    :return: filtered snapshot.
+    """
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+def format_statistic(stat: Any) -> Dict[str, Any]:
+    """
+    Convert tracemalloc statistic to JSON serializable dict.
+
+    :param stat: Statistic or StatisticDiff.
+    :return: allocation site, its size and number of blocks.
+    """
+    frame = stat.traceback[0]
+    described = {
+        "location": f"{frame.filename}:{frame.lineno}",
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count,
+    }
+    if hasattr(stat, "size_diff"):  # noqa: WPS421
+        described["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+        described["count_diff"] = stat.count_diff
+    return described
+
+
+class MemoryTracker:
+    """
+    Periodic allocation snapshots and registry checks.
+
+    Checks run after a batch of events once the interval
+    has passed, so an idle WM doesn't wake up for them.
+    """
+
+    def __init__(
+        self,
+        wm: Any,
+        interval: float = DEFAULT_INTERVAL,
+        frames: int = DEFAULT_FRAMES,
+    ) -> None:
+        """
+        Create tracker.
+
+        :param wm: an S3WM instance. (Used Any to avoid circular deps)
+        :param interval: seconds between checks.
+        :param frames: number of frames stored for every allocation.
+        """
+        self.wm = wm
+        self.interval = interval
+        self.frames = frames
+        self.checks = 0
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._next_check = 0.0
+        # Tracing started by someone else is left running.
+        self._owns_tracing = False
+
+    def start(self) -> None:
+        """Start tracing allocations."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracing = True
+        self._baseline = take_snapshot()
+        self._previous = self._baseline
+        self._next_check = monotonic() + self.interval
+
+    def maybe_check(self) -> None:
+        """Run check if the interval has passed."""
+        if self._previous is not None and monotonic() >= self._next_check:
+            self.check()
+
+    def check(self) -> List[Dict[str, Any]]:
+        """
+        Log allocation growth since the last check.
+
+        :return: allocation sites that grew the most.
+        """
+        self._next_check = monotonic() + self.interval
+        self.checks += 1
+        snapshot = take_snapshot()
+        growth: List[Dict[str, Any]] = []
+        if self._previous is not None:
+            growth = self._get_growth(self._previous, snapshot)
+        self._previous = snapshot
+        for stat in growth:
+            logger.info(
+                f"Memory grew by {stat['size_diff_kb']} KiB "
+                + f"({stat['count_diff']} blocks) at {stat['location']}",
+            )
+        return growth
+
+    def get_counts(self) -> Dict[str, int]:
+        """
+        Count objects held by the WM.
+
+        :return: sizes of registries and caches.
+        """
+        counts = {
+            "s3windows_alive": len(S3window._instances),  # noqa: WPS437
+            "registry_windows": len(self.wm.windows),
+            "layout_windows": len(self.wm.layout.get_window_ids()),
+            "geometry_cache": len(window_geometry_cache),
+            "keycode_mapping": len(keymap.keycode_mapping),
+            "grabbed_keys": len(keymap.grabbed_keys),
+            "internal_windows": len(self.wm.internal_windows),
+        }
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            counts["traced_kb"] = current // 1024
+            counts["traced_peak_kb"] = peak // 1024
+        return counts
+
+    def report(self, limit: int = DEFAULT_LIMIT) -> Dict[str, Any]:
+        """
+        Build report with top allocators.
+
+        :param limit: number of allocation sites.
+        :return: JSON serializable report.
+        """
+        existing = self.wm.get_existing_windows()
+        report: Dict[str, Any] = {
+            "counts": self.get_counts(),
+            "x_windows": len(existing),
+            "stale_windows": sorted(self.wm.get_stale_windows(existing)),
+        }
+        if not tracemalloc.is_tracing():
+            return report
+        snapshot = take_snapshot()
+        report["top_allocators"] = [
+            format_statistic(stat)
+            for stat in snapshot.statistics("lineno")[:limit]
+        ]
+        if self._baseline is not None:
+            report["growth_since_start"] = [
+                format_statistic(stat)
+                for stat in snapshot.compare_to(self._baseline, "lineno")[:limit]
+            ]
+        return report
+
+    def stop(self) -> None:
+        """Stop tracing allocations if it was started by the tracker."""
+        self._baseline = None
+        self._previous = None
+        if self._owns_tracing:
+            self._owns_tracing = False
+            tracemalloc.stop()
+
+    def _get_growth(
+        self,
+        previous: tracemalloc.Snapshot,
+        snapshot: tracemalloc.Snapshot,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find allocation sites that grew noticeably.
+
+        :param previous: older snapshot.
+        :param snapshot: newer snapshot.
+        :return: allocation sites, largest growth first.
+        """
+        return [
+            format_statistic(stat)
+            for stat in snapshot.compare_to(previous, "lineno")[:DEFAULT_LIMIT]
+            if stat.size_diff >= GROWTH_THRESHOLD
+        ]
@@ -0,0 +1,273 @@
+import os
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Set
+
+from loguru import logger
+
+from s3wm_core.inotify import (
+    IN_ATTRIB,
+    IN_CREATE,
+    IN_DELETE,
+    IN_DELETE_SELF,
+    IN_MOVE_SELF,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    IN_ONLYDIR,
+    IN_Q_OVERFLOW,
+    Inotify,
+    InotifyEvent,
+)
+
+WATCH_MASK = (
+    IN_CREATE
+    | IN_DELETE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_ATTRIB
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+
+def is_executable(path: str) -> bool:
+    """
+    Check if path is an executable file.
+
+    :param path: path to a file.
+    :return: True if file can be executed.
+    """
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def fuzzy_match(query: str, name: str) -> bool:
+    """
+    Check if all query characters appear in name in the same order.
+
+    :param query: search query.
+    :param name: executable name.
+    :return: True if name matches.
+    """
+    position = 0
+    for char in query:
+        position = name.find(char, position) + 1
+        if not position:
+            return False
+    return True
+
+
+class ExecutableIndex:
+    """
+    In-memory index of executables in $PATH.
+
+    Names are kept in a sorted list, so prefix search is a binary search.
+    Directories are watched with inotify and the index
+    is updated incrementally when `refresh` is called.
+    If inotify is not available, directories are rescanned
+    when their modification time changes.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.names: List[str] = []
+        self._dirs: List[str] = []
+        # Directories which contain executable with this name.
+        self._owners: Dict[str, Set[str]] = {}
+        self._contents: Dict[str, Set[str]] = {}
+        self._mtimes: Dict[str, float] = {}
+        self._inotify: Optional[Inotify] = None
+        self._scanned = False
+
+    def refresh(self) -> None:
+        """Build index on the first call and apply changes afterwards."""
+        if not self._scanned:
+            self._scan()
+            return
+        if self._inotify is not None:
+            self._apply_events()
+            return
+        for directory in self._dirs:
+            if self._get_mtime(directory) != self._mtimes.get(directory):
+                self._scan_dir(directory)
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Find executables by query.
+
+        Names starting with the query go first,
+        then names containing query characters in the same order.
+
+        :param query: search query.
+        :param limit: maximum number of results.
+        :return: matching names.
+        """
+        if not query:
+            return self.names[:limit]
+        found = self._search_prefix(query, limit)
+        if len(found) >= limit:
+            return found
+        prefixed = set(found)
+        for name in self.names:
+            if name not in prefixed and fuzzy_match(query, name):
+                found.append(name)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def close(self) -> None:
+        """Stop watching directories."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _search_prefix(self, query: str, limit: int) -> List[str]:
+        """
+        Find names starting with query.
+
+        :param query: search query.
+        :param limit: maximum number of results.
+        :return: matching names in sorted order.
+        """
+        index = bisect_left(self.names, query)
+        found: List[str] = []
+        while index < len(self.names) and len(found) < limit:
+            if not self.names[index].startswith(query):
+                break
+            found.append(self.names[index])
+            index += 1
+        return found
+
+    def _scan(self) -> None:
+        """Scan all directories from PATH."""
+        self._dirs = self._get_dirs()
+        if Inotify.is_available():
+            self._inotify = Inotify()
+            for watched in self._dirs:
+                try:
+                    self._inotify.add_watch(watched, WATCH_MASK)
+                except OSError as err:
+                    logger.debug(f"Can't watch {watched}. Cause: {err}")
+        for scanned in self._dirs:
+            self._scan_dir(scanned)
+        self._scanned = True
+
+    def _get_dirs(self) -> List[str]:
+        """
+        Get existing directories from PATH without duplicates.
+
+        :return: real paths of directories.
+        """
+        path = self.path
+        if path is None:
+            path = os.environ.get("PATH", os.defpath)
+        dirs: List[str] = []
+        for directory in path.split(os.pathsep):
+            directory = os.path.realpath(directory or ".")  # noqa: WPS440
+            if directory not in dirs and os.path.isdir(directory):
+                dirs.append(directory)
+        return dirs
+
+    def _scan_dir(self, directory: str) -> None:
+        """
+        Rescan single directory.
+
+        :param directory: directory from PATH.
+        """
+        self._mtimes[directory] = self._get_mtime(directory)
+        found = self._list_executables(directory)
+        old = self._contents.get(directory, set())
+        for removed in old - found:
+            self._remove(directory, removed)
+        for added in found - old:
+            self._add(directory, added)
+
+    def _apply_events(self) -> None:
+        """Update index from inotify events."""
+        inotify: Inotify = self._inotify  # type: ignore
+        for event in inotify.read_events():
+            if event.mask & IN_Q_OVERFLOW:
+                for directory in self._dirs:
+                    self._scan_dir(directory)
+                return
+            self._apply_event(event)
+
+    def _apply_event(self, event: InotifyEvent) -> None:
+        """
+        Update index from a single inotify event.
+
+        :param event: change in a watched directory.
+        """
+        if event.mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            for name in list(self._contents.get(event.path, ())):
+                self._remove(event.path, name)
+            return
+        if not event.name:
+            return
+        removed = event.mask & (IN_DELETE | IN_MOVED_FROM)
+        if removed or not is_executable(os.path.join(event.path, event.name)):
+            self._remove(event.path, event.name)
+        else:
+            self._add(event.path, event.name)
+
+    def _add(self, directory: str, name: str) -> None:
+        """
+        Add executable to the index.
+
+        :param directory: directory containing the executable.
+        :param name: executable name.
+        """
+        self._contents.setdefault(directory, set()).add(name)
+        owners = self._owners.setdefault(name, set())
+        if not owners:
+            insort(self.names, name)
+        owners.add(directory)
+
+    def _remove(self, directory: str, name: str) -> None:
+        """
+        Remove executable from the index.
+
+        :param directory: directory that contained the executable.
+        :param name: executable name.
+        """
+        self._contents.get(directory, set()).discard(name)
+        owners = self._owners.get(name)
+        if not owners or directory not in owners:
+            return
+        owners.discard(directory)
+        if owners:
+            return
+        del self._owners[name]  # noqa: WPS420
+        index = bisect_left(self.names, name)
+        if index < len(self.names) and self.names[index] == name:
+            self.names.pop(index)
+
+    @staticmethod
+    def _list_executables(directory: str) -> Set[str]:
+        """
+        Get names of executables in a directory.
+
+        :param directory: path to a directory.
+        :return: executable names, empty if directory can't be read.
+        """
+        found: Set[str] = set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and os.access(entry.path, os.X_OK):
+                        found.add(entry.name)
+        except OSError as err:
+            logger.debug(f"Can't scan {directory}. Cause: {err}")
+        return found
+
+    @staticmethod
+    def _get_mtime(directory: str) -> float:
+        """
+        Get directory modification time.
+
+        :param directory: path to a directory.
+        :return: modification time or 0 if directory is missing.
+        """
+        try:
+            return os.stat(directory).st_mtime
+        except OSError:
+            return 0
@@ -0,0 +1,259 @@
+"""
+CPU profilers for the event loop.
+
+Both profilers attribute time to the type of the handled event,
+so `update_layout` called for a MapRequest and for a KeyPress
+are reported separately.
+
+`CProfileProfiler` traces every call made while events are handled,
+`SamplingProfiler` periodically records the stack of the main thread
+and costs almost nothing for the WM itself.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Union, cast
+
+from loguru import logger
+
+DEFAULT_SAMPLING_INTERVAL = 0.005
+# Number of functions in text reports.
+REPORT_LIMIT = 25
+
+
+class CProfileProfiler:
+    """Deterministic profiler with separate stats for every event type."""
+
+    def __init__(self, output: str) -> None:
+        """
+        Create profiler.
+
+        :param output: path for pstats file, text report is written next to it.
+        """
+        self.output = output
+        self.is_running = False
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.calls: Counter[str] = Counter()
+        self._active: Optional[cProfile.Profile] = None
+
+    def start(self) -> None:
+        """Start collecting stats."""
+        self.is_running = True
+
+    def stop(self) -> None:
+        """Stop collecting stats."""
+        self.leave()
+        self.is_running = False
+
+    def enter(self, name: str) -> None:
+        """
+        Start profiling an event handler.
+
+        :param name: event type.
+        """
+        if not self.is_running or self._active is not None:
+            return
+        profile = self.profiles.get(name)
+        if profile is None:
+            profile = cProfile.Profile()
+            self.profiles[name] = profile
+        self.calls[name] += 1
+        self._active = profile
+        profile.enable()
+
+    def leave(self) -> None:
+        """Stop profiling current event handler."""
+        if self._active is not None:
+            self._active.disable()
+            self._active = None
+
+    def dump(self) -> None:
+        """Write stats of all events and a text report with top functions."""
+        if not self.profiles:
+            return
+        profiles = list(self.profiles.values())
+        try:
+            pstats.Stats(*profiles).dump_stats(self.output)
+        except OSError as err:
+            logger.error(f"Can't write profile. Cause: {err}")
+            return
+        report = io.StringIO()
+        for name, profile in sorted(self.profiles.items()):
+            stats = pstats.Stats(profile, stream=report)
+            report.write(f"=== {name}: {self.calls[name]} calls ===\n")
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_LIMIT)
+        write_report(f"{self.output}.txt", report.getvalue())
+        logger.info(f"CPU profile is written to {self.output}")
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler that samples the main thread.
+
+    Samples are stored as collapsed stacks prefixed with
+    the event type, the format used by flamegraph tools.
+    Samples taken while the WM waits for events are only counted.
+    """
+
+    def __init__(
+        self,
+        output: str,
+        interval: float = DEFAULT_SAMPLING_INTERVAL,
+    ) -> None:
+        """
+        Create profiler.
+
+        :param output: path for collapsed stacks,
+            text report is written next to it.
+        :param interval: seconds between samples.
+        """
+        self.output = output
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self.idle_samples = 0
+        # Set by the main thread, read by the sampling thread.
+        self.current: Optional[str] = None
+        # Main thread is always started, so its ident is set.
+        self._thread_id = cast(int, threading.main_thread().ident)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Whether samples are collected.
+
+        :return: True if sampling thread is running.
+        """
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Start sampling thread."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="s3wm-sampler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling thread."""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def enter(self, name: str) -> None:
+        """
+        Mark start of an event handler.
+
+        :param name: event type.
+        """
+        self.current = name
+
+    def leave(self) -> None:
+        """Mark end of an event handler."""
+        self.current = None
+
+    def dump(self) -> None:
+        """Write collapsed stacks and a report with the hottest functions."""
+        with self._lock:
+            samples = dict(self.samples)
+            idle = self.idle_samples
+        if not samples:
+            return
+        folded = "".join(
+            f"{stack} {count}\n" for stack, count in sorted(samples.items())
+        )
+        write_report(self.output, folded)
+        write_report(f"{self.output}.txt", format_samples(samples, idle))
+        logger.info(f"CPU samples are written to {self.output}")
+
+    def sample(self) -> None:
+        """Record current stack of the main thread."""
+        label = self.current
+        frame = sys._current_frames().get(self._thread_id)  # noqa: WPS437
+        if label is None or frame is None:
+            with self._lock:
+                self.idle_samples += 1
+            return
+        stack: List[str] = []
+        while frame is not None:
+            stack.append(get_frame_name(frame))
+            frame = frame.f_back
+        stack.append(label)
+        stack.reverse()
+        with self._lock:
+            self.samples[";".join(stack)] += 1
+
+    def _run(self) -> None:
+        """Take samples until profiler is stopped."""
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+
+Profiler = Union[CProfileProfiler, SamplingProfiler]
+
+
+def get_frame_name(frame: Any) -> str:
+    """
+    Get function name for a collapsed stack.
+
+    :param frame: python frame.
+    :return: function name, module file and line.
+    """
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def format_samples(samples: Dict[str, int], idle: int) -> str:
+    """
+    Summarize collapsed stacks.
+
+    :param samples: number of samples by collapsed stack.
+    :param idle: number of samples taken while waiting for events.
+    :return: samples by event type and functions with most samples.
+    """
+    by_event: Counter[str] = Counter()
+    own: Counter[str] = Counter()
+    total: Counter[str] = Counter()
+    for stack, count in samples.items():
+        frames = stack.split(";")
+        by_event[frames[0]] += count
+        own[frames[-1]] += count
+        for function in set(frames[1:]):
+            total[function] += count
+    busy = sum(by_event.values())
+    lines = [f"Samples: {busy} busy, {idle} idle", "", "By event type:"]
+    lines.extend(f"{count:>8} {name}" for name, count in by_event.most_common())
+    lines.extend(["", "Own samples:"])
+    lines.extend(f"{count:>8} {name}" for name, count in own.most_common(REPORT_LIMIT))
+    lines.extend(["", "Total samples:"])
+    lines.extend(
+        f"{count:>8} {name}" for name, count in total.most_common(REPORT_LIMIT)
+    )
+    return "\n".join(lines) + "\n"
+
+
+def write_report(path: str, report: str) -> None:
+    """
+    Write profile report, errors are logged.
+
+    :param path: file path.
+    :param report: report text.
+    """
+    try:
+        with open(path, "w") as report_file:
+            report_file.write(report)
+    except OSError as err:
+        logger.error(f"Can't write profile report. Cause: {err}")
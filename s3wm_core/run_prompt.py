@@ -0,0 +1,220 @@
+from time import perf_counter
+from typing import Any, List, Optional
+from weakref import WeakKeyDictionary
+
+from loguru import logger
+from Xlib import XK, X
+from Xlib.xobject.drawable import Window
+
+from s3wm_core.launcher import launcher
+from s3wm_core.path_index import ExecutableIndex
+
+executable_index = ExecutableIndex()
+
+PROMPT = "> "
+MAX_MATCHES = 20
+BACKGROUND = 0x222222
+FOREGROUND = 0xBBBBBB
+SELECTED_BACKGROUND = 0x005577
+SELECTED_FOREGROUND = 0xEEEEEE
+PADDING = 4
+
+
+class RunPrompt:
+    """
+    Built-in application launcher.
+
+    A line at the top of the screen, similar to dmenu.
+    Type to search executables from $PATH,
+    Tab completes, arrows change selection,
+    Return starts the program and Escape closes the prompt.
+    """
+
+    def __init__(self, wm: Any) -> None:
+        self.wm = wm
+        self.display = wm.display
+        self.index = executable_index
+        self.query = ""
+        self.matches: List[str] = []
+        self.selected = 0
+        self.font = self.display.open_font("fixed")
+        font_info = self.font.query()
+        self.ascent = font_info.font_ascent
+        self.char_width = font_info.max_bounds.character_width
+        self.height = font_info.font_ascent + font_info.font_descent + PADDING * 2
+        root = self.display.screen().root
+        self.normal_gc = root.create_gc(
+            font=self.font,
+            foreground=FOREGROUND,
+            background=BACKGROUND,
+        )
+        self.selected_gc = root.create_gc(
+            font=self.font,
+            foreground=SELECTED_FOREGROUND,
+            background=SELECTED_BACKGROUND,
+        )
+        self.window: Optional[Window] = None
+        self.is_open = False
+
+    def open(self) -> None:
+        """Show prompt and grab keyboard."""
+        if self.is_open:
+            return
+        started_at = perf_counter()
+        self.index.refresh()
+        self.query = ""
+        self.selected = 0
+        window = self._show_window()
+        grab_status = window.grab_keyboard(
+            False,
+            X.GrabModeAsync,
+            X.GrabModeAsync,
+            X.CurrentTime,
+        )
+        if grab_status != X.GrabSuccess:
+            logger.error("Can't grab keyboard for run prompt")
+            window.unmap()
+            return
+        self.is_open = True
+        self.wm.internal_windows[window.id] = self.handle_event
+        self._search()
+        self._draw()
+        self.display.flush()
+        open_time = (perf_counter() - started_at) * 1000
+        logger.debug(f"Run prompt opened in {open_time:.2f} ms")
+
+    def close(self) -> None:
+        """Hide prompt and release keyboard."""
+        if self.window is None or not self.is_open:
+            return
+        self.is_open = False
+        self.wm.internal_windows.pop(self.window.id, None)
+        self.display.ungrab_keyboard(X.CurrentTime)
+        self.window.unmap()
+        self.display.flush()
+
+    def handle_event(self, event: Any) -> None:
+        """
+        Handle events for prompt window.
+
+        :param event: X11 event.
+        """
+        if event.type == X.KeyPress:
+            self._handle_key(event)
+        elif event.type == X.Expose and event.count == 0:
+            self._draw()
+
+    def _handle_key(self, event: Any) -> None:  # noqa: C901
+        """
+        Edit query or run selected program.
+
+        :param event: X11 KeyPress event.
+        """
+        shifted = 1 if event.state & X.ShiftMask else 0
+        keysym = self.display.keycode_to_keysym(event.detail, shifted)
+        if keysym == XK.XK_Escape:
+            self.close()
+            return
+        if keysym in {XK.XK_Return, XK.XK_KP_Enter}:
+            self._run()
+            return
+        if keysym == XK.XK_BackSpace:
+            self.query = self.query[:-1]
+        elif keysym == XK.XK_Tab and self.matches:
+            self.query = self.matches[self.selected]
+        elif keysym in {XK.XK_Left, XK.XK_Up}:
+            self.selected = max(self.selected - 1, 0)
+            self._draw()
+            return
+        elif keysym in {XK.XK_Right, XK.XK_Down}:
+            self.selected = min(self.selected + 1, max(len(self.matches) - 1, 0))
+            self._draw()
+            return
+        else:
+            char = self.display.lookup_string(keysym)
+            if not char or not char.isprintable():
+                return
+            self.query += char
+        self.selected = 0
+        self._search()
+        self._draw()
+
+    def _search(self) -> None:
+        """Update matches for current query."""
+        # Arguments are not searched, only the program name.
+        if " " in self.query:
+            self.matches = []
+            return
+        self.matches = self.index.search(self.query, MAX_MATCHES)
+
+    def _run(self) -> None:
+        """Start selected program."""
+        command = self.query.strip()
+        if self.matches:
+            command = self.matches[self.selected]
+        self.close()
+        if command:
+            launcher.spawn(command)
+
+    def _show_window(self) -> Window:
+        """
+        Show prompt window at the top of the screen.
+
+        Window is created once and reused.
+
+        :return: mapped window.
+        """
+        width = self.wm.screen.geom.width
+        if self.window is None:
+            screen = self.display.screen()
+            self.window = screen.root.create_window(
+                0,
+                0,
+                width,
+                self.height,
+                0,
+                screen.root_depth,
+                X.InputOutput,
+                X.CopyFromParent,
+                background_pixel=BACKGROUND,
+                override_redirect=True,
+                event_mask=X.KeyPressMask | X.ExposureMask,
+            )
+        else:
+            self.window.configure(width=width, stack_mode=X.Above)
+        self.window.map()
+        return self.window
+
+    def _draw(self) -> None:
+        """Draw query and matches."""
+        window = self.window
+        if window is None or not self.is_open:
+            return
+        normal = self.normal_gc
+        window.clear_area()
+        baseline = PADDING + self.ascent
+        text = f"{PROMPT}{self.query}"
+        window.image_text(normal, PADDING, baseline, text)
+        offset = PADDING + self.char_width * (max(len(text), 24) + 2)
+        for index, name in enumerate(self.matches):
+            gc = self.selected_gc if index == self.selected else normal
+            label = f" {name} "
+            window.image_text(gc, offset, baseline, label)
+            offset += self.char_width * len(label)
+        self.display.flush()
+
+
+_prompts: "WeakKeyDictionary[Any, RunPrompt]" = WeakKeyDictionary()
+
+
+def run_prompt(wm: Any) -> None:
+    """
+    Key action to open built-in application launcher.
+
+    :param wm: an S3WM instance. (Used Any to avoid circular deps)
+    """
+    prompt = _prompts.get(wm)
+    if prompt is None:
+        prompt = RunPrompt(wm)
+        _prompts[wm] = prompt
+    prompt.open()
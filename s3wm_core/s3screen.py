@@ -1,13 +1,15 @@
 from Xlib.protocol.display import Screen
 from Xlib.xobject.drawable import Window
 
-from s3wm_core.utils import get_screen_size
+from s3wm_core.screen_geometry import screen_geometry_cache
 from s3wm_core.x_models import ScreenGeometry
 
 
 class S3screen:
     """Screen abstraction for S3wm."""
 
+    __slots__ = ("screen",)
+
     def __init__(self, screen: Screen):
         self.screen = screen
 
@@ -18,11 +20,7 @@ class S3screen:
 
         :return: screen geometry.
         """
-        width, height = get_screen_size(self.screen)
-        return ScreenGeometry(
-            width=width,
-            height=height,
-        )
+        return screen_geometry_cache.get(self.screen)
 
     @property
     def root_window(self) -> Window:
@@ -52,3 +50,7 @@ class S3screen:
         :return: Screen height in pixels.
         """
         return int(self.screen.height_in_pixels)
+
+    def flush(self) -> None:
+        """Send all queued requests to the X server."""
+        self.screen.root.display.flush()
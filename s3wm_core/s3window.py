@@ -1,4 +1,5 @@
-from typing import Any, Optional
+from typing import Optional
+from weakref import WeakValueDictionary
 
 from loguru import logger
 from Xlib.error import XError
@@ -6,31 +7,65 @@ from Xlib.X import BadWindow, CurrentTime, RevertToParent
 from Xlib.xobject.drawable import Window
 
 from s3wm_core.s3screen import S3screen
-from s3wm_core.utils import get_window_geometry
+from s3wm_core.window_geometry import window_geometry_cache
 from s3wm_core.x_models import WindowGeometry, XWindowAttributes, XWMState
 
 
 class S3window(object):
-    """Main window abstraction for S3WM."""
-
-    def __init__(
-        self,
+    """
+    Main window abstraction for S3WM.
+
+    There is only one S3window for every X11 window id
+    while something holds a reference to it,
+    so windows can be compared by identity.
+    """
+
+    __slots__ = (
+        "id",
+        "window",
+        "screen",
+        "parent",
+        "mapped",
+        "pending_unmaps",
+        "__weakref__",
+    )
+
+    _instances: "WeakValueDictionary[int, S3window]" = WeakValueDictionary()
+
+    id: int  # X11 resource ID allocated for this window.
+    window: Window
+    screen: S3screen
+    parent: Optional[Window]
+    mapped: bool  # Window was mapped by the WM.
+    # Number of UnmapNotify events caused by the WM itself.
+    pending_unmaps: int
+
+    def __new__(
+        cls,
         window: Window,
         screen: S3screen,
         parent: Optional[Window] = None,
-    ):
-        self.parent = parent
-        self.window = window
-        self.screen = screen
-
-    @property
-    def id(self) -> int:
-        """
-        X11 resource ID allocated for this window.
-
-        :return: unique window ID.
-        """
-        return int(self.window.id)
+    ) -> "S3window":
+        """
+        Get window wrapper for X11 window.
+
+        :param window: X11 window.
+        :param screen: screen this window belongs to.
+        :param parent: parent window.
+        :return: existing wrapper for this window id or a new one.
+        """
+        window_id = int(window.id)
+        instance = cls._instances.get(window_id)
+        if instance is None:
+            instance = super().__new__(cls)
+            instance.id = window_id
+            instance.window = window
+            instance.screen = screen
+            instance.parent = parent
+            instance.mapped = False
+            instance.pending_unmaps = 0
+            cls._instances[window_id] = instance
+        return instance
 
     @property
     def is_root(self) -> bool:
@@ -48,7 +83,7 @@ class S3window(object):
 
         :return: Window geometry
         """
-        return get_window_geometry(self.window)
+        return window_geometry_cache.get(self.window)
 
     @property
     def attributes(self) -> Optional[XWindowAttributes]:
@@ -59,7 +94,7 @@ class S3window(object):
         """
         try:
             attrs = self.window.get_attributes()
-            return XWindowAttributes.from_orm(attrs)
+            return XWindowAttributes.from_reply(attrs)
         except XError as err:
             logger.debug(f"Can't get window attributes. Cause: {err}")
             return None
@@ -106,12 +141,40 @@ class S3window(object):
 
     def map(self) -> None:
         """Maps window in X11."""
+        self.mapped = True
         self.window.map()
 
     def unmap(self) -> None:
-        """Unmap window in X11."""
+        """
+        Unmap window in X11.
+
+        UnmapNotify caused by this call is expected,
+        see `consume_unmap`.
+        """
+        if self.mapped:
+            self.mapped = False
+            self.pending_unmaps += 1
         self.window.unmap()
 
+    def consume_unmap(self) -> bool:
+        """
+        Check if UnmapNotify was caused by the WM.
+
+        Windows on hidden tabs are unmapped by the WM,
+        these events must not remove windows from their tabs.
+
+        :return: True if the event was expected.
+        """
+        if not self.pending_unmaps:
+            return False
+        self.pending_unmaps -= 1
+        return True
+
+    def mark_withdrawn(self) -> None:
+        """Forget map state after the window was unmapped by its client."""
+        self.mapped = False
+        self.pending_unmaps = 0
+
     def focus(self) -> None:
         """Set focus to window."""
         self.window.set_input_focus(
@@ -140,6 +203,7 @@ class S3window(object):
             width=win_width,
             height=win_height,
         )
+        window_geometry_cache.update(self.id, width=win_width, height=win_height)
 
     def move(self, x: int, y: int) -> None:  # noqa: WPS111
         """
@@ -152,6 +216,30 @@ class S3window(object):
             x=x,
             y=y,
         )
+        window_geometry_cache.update(self.id, x=x, y=y)
+
+    def configure(  # noqa: WPS211
+        self,
+        x: int,  # noqa: WPS111
+        y: int,  # noqa: WPS111
+        width: int,
+        height: int,
+    ) -> None:
+        """
+        Move and resize window with a single request.
+
+        :param x: top left corner x coordinate.
+        :param y: top left corner y coordinate.
+        :param width: new width.
+        :param height: new height.
+        """
+        self.window.configure(
+            x=x,
+            y=y,
+            width=width,
+            height=height,
+        )
+        window_geometry_cache.store(self.id, x=x, y=y, width=width, height=height)
 
     def destroy(self) -> None:
         """Kill window from X11."""
@@ -159,8 +247,3 @@ class S3window(object):
 
     def __str__(self) -> str:
         return f"<S3Window {self.id}>"
-
-    def __eq__(self, other: Any) -> bool:
-        if not isinstance(other, S3window):
-            return False
-        return self.id == other.id
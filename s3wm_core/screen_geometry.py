@@ -0,0 +1,129 @@
+from typing import Any, Optional
+
+from loguru import logger
+from Xlib.display import Display
+from Xlib.error import XError
+from Xlib.ext import randr
+from Xlib.protocol.display import Screen
+
+from s3wm_core.x_models import ScreenGeometry
+
+
+class ScreenGeometryCache:
+    """
+    Cached screen geometry.
+
+    Geometry is requested from the RANDR extension once
+    and kept in memory until RANDR tells us that screen
+    configuration was changed.
+    """
+
+    def __init__(self) -> None:
+        self.display: Optional[Display] = None
+        self._geometry: Optional[ScreenGeometry] = None
+        self._screen_change_type: Optional[int] = None
+        self._notify_type: Optional[int] = None
+
+    def setup(self, display: Display) -> None:
+        """
+        Subscribe to RANDR notifications.
+
+        If RANDR extension is not available,
+        core screen size is used.
+
+        :param display: current display.
+        """
+        self.display = display
+        self._geometry = None
+        if not display.has_extension(randr.extname):
+            logger.warning("RANDR extension is not available.")
+            return
+        display.screen().root.xrandr_select_input(
+            randr.RRScreenChangeNotifyMask | randr.RRCrtcChangeNotifyMask,
+        )
+        first_event = display.extension_event.ScreenChangeNotify
+        self._screen_change_type = first_event
+        self._notify_type = first_event + randr.RRNotify
+
+    def get(self, screen: Screen) -> ScreenGeometry:
+        """
+        Get current screen geometry.
+
+        :param screen: current screen.
+        :return: cached screen geometry.
+        """
+        if self._geometry is None:
+            self._geometry = self._query(screen)
+            logger.debug(f"Screen geometry updated: {self._geometry}")
+        return self._geometry
+
+    def invalidate(self) -> None:
+        """Drop cached geometry."""
+        self._geometry = None
+
+    def handle_event(self, event: Any) -> bool:
+        """
+        Invalidate cache if event is a RANDR notification.
+
+        :param event: X11 event.
+        :return: True if event was a RANDR notification.
+        """
+        if self._screen_change_type is None:
+            return False
+        if event.type == self._screen_change_type:
+            self.invalidate()
+            return True
+        if event.type == self._notify_type:
+            if event.sub_code == randr.RRNotify_CrtcChange:
+                self.invalidate()
+            return True
+        return False
+
+    def _query(self, screen: Screen) -> ScreenGeometry:
+        """
+        Request screen geometry from the X server.
+
+        Primary output's CRTC is used if any,
+        otherwise the first active CRTC is used.
+
+        :param screen: current screen.
+        :return: screen geometry.
+        """
+        geometry = ScreenGeometry(
+            width=screen.width_in_pixels,
+            height=screen.height_in_pixels,
+        )
+        if self.display is None or self._screen_change_type is None:
+            return geometry
+        try:
+            crtc = self._find_crtc(screen)
+        except XError as err:
+            logger.debug(f"Can't get RANDR info. Cause: {err}")
+            return geometry
+        if crtc is None:
+            return geometry
+        return ScreenGeometry(width=crtc.width, height=crtc.height)
+
+    def _find_crtc(self, screen: Screen) -> Any:
+        """
+        Find CRTC to use as a screen.
+
+        :param screen: current screen.
+        :return: CRTC info or None.
+        """
+        display: Any = self.display
+        resources = screen.root.xrandr_get_screen_resources_current()
+        timestamp = resources.config_timestamp
+        primary = screen.root.xrandr_get_output_primary().output
+        if primary:
+            output = display.xrandr_get_output_info(primary, timestamp)
+            if output.crtc:
+                return display.xrandr_get_crtc_info(output.crtc, timestamp)
+        for crtc_id in resources.crtcs:
+            crtc = display.xrandr_get_crtc_info(crtc_id, timestamp)
+            if crtc.mode:
+                return crtc
+        return None
+
+
+screen_geometry_cache = ScreenGeometryCache()
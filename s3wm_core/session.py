@@ -0,0 +1,63 @@
+"""
+Session snapshot for WM restarts.
+
+Snapshot is stored as compact JSON in a root window property.
+It lives as long as the X11 session and is read by the next
+S3WM instance, so windows return to the same tabs after a restart.
+"""
+import json
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from Xlib import X
+from Xlib.display import Display
+
+SESSION_PROPERTY = "_S3WM_SESSION"
+SESSION_VERSION = 1
+
+
+def save_session(display: Display, session: Dict[str, Any]) -> None:
+    """
+    Save session snapshot on the root window.
+
+    :param display: current display.
+    :param session: JSON serializable session state.
+    """
+    snapshot = json.dumps(
+        {"version": SESSION_VERSION, **session},
+        separators=(",", ":"),
+    )
+    root = display.screen().root
+    root.change_property(
+        display.get_atom(SESSION_PROPERTY),
+        display.get_atom("UTF8_STRING"),
+        8,
+        snapshot.encode(),
+    )
+    logger.debug(f"Saved session snapshot ({len(snapshot)} bytes)")
+
+
+def load_session(display: Display) -> Optional[Dict[str, Any]]:
+    """
+    Read and remove session snapshot.
+
+    Snapshot is removed, so it's used only once.
+
+    :param display: current display.
+    :return: session state if there is a valid snapshot.
+    """
+    root = display.screen().root
+    atom = display.get_atom(SESSION_PROPERTY)
+    prop = root.get_full_property(atom, X.AnyPropertyType, sizehint=4096)
+    if prop is None:
+        return None
+    root.delete_property(atom)
+    try:
+        session = json.loads(bytes(prop.value))
+    except ValueError as err:
+        logger.error(f"Can't read session snapshot. Cause: {err}")
+        return None
+    if not isinstance(session, dict) or session.get("version") != SESSION_VERSION:
+        logger.error("Unsupported session snapshot.")
+        return None
+    return session
@@ -0,0 +1,113 @@
+"""
+Signal handling in the blocking event loop.
+
+Python signal handlers run between any two bytecodes of the main thread,
+so a handler that logs or prints may enter a lock that is already held
+by the interrupted code. Here handlers do nothing, the interpreter writes
+signal numbers to a pipe (`signal.set_wakeup_fd`) and the event loop
+calls real handlers once the pipe becomes readable.
+"""
+import os
+import signal
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+
+def _ignore_signal(*_: Any) -> None:
+    """Python handler is required for the wakeup fd to be written."""
+
+
+class SignalQueue:
+    """Runs signal handlers from the event loop."""
+
+    def __init__(self) -> None:
+        self.handlers: Dict[int, Callable[[], Any]] = {}
+        self._read_fd: Optional[int] = None
+        self._write_fd: Optional[int] = None
+
+    @property
+    def is_listening(self) -> bool:
+        """
+        Whether signals are delivered to the pipe.
+
+        :return: True if `start` was called.
+        """
+        return self._read_fd is not None
+
+    def add_handler(self, signum: int, handler: Callable[[], Any]) -> None:
+        """
+        Call handler in the event loop when signal is received.
+
+        :param signum: signal number.
+        :param handler: function without arguments.
+        """
+        self.handlers[signum] = handler
+        signal.signal(signum, _ignore_signal)
+
+    def start(self) -> None:
+        """Start writing signal numbers to the pipe."""
+        if self._read_fd is not None:
+            return
+        self._read_fd, self._write_fd = os.pipe()
+        os.set_blocking(self._read_fd, False)
+        os.set_blocking(self._write_fd, False)
+        signal.set_wakeup_fd(self._write_fd, warn_on_full_buffer=False)
+
+    def stop(self) -> None:
+        """Stop writing signals to the pipe and close it."""
+        if self._read_fd is None:
+            return
+        signal.set_wakeup_fd(-1)
+        os.close(self._read_fd)
+        os.close(self._write_fd)  # type: ignore
+        self._read_fd = None
+        self._write_fd = None
+
+    def fileno(self) -> int:
+        """
+        File descriptor that becomes readable when signals arrive.
+
+        :return: file descriptor.
+        """
+        read_fd: int = self._read_fd  # type: ignore
+        return read_fd
+
+    def handle_signals(self) -> int:
+        """
+        Call handlers of received signals.
+
+        A signal received several times before the loop
+        woke up is handled once.
+
+        :return: number of handled signals.
+        """
+        received: List[int] = []
+        for signum in self._read_signals():
+            if signum in self.handlers and signum not in received:
+                received.append(signum)
+        for signum in received:
+            try:
+                self.handlers[signum]()
+            except Exception as exc:
+                logger.exception(exc)
+        return len(received)
+
+    def _read_signals(self) -> bytes:
+        """
+        Empty the pipe.
+
+        :return: signal numbers, one byte for every signal.
+        """
+        if self._read_fd is None:
+            return b""
+        chunks = []
+        while True:  # noqa: WPS457
+            try:
+                chunk = os.read(self._read_fd, 512)  # noqa: WPS432
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
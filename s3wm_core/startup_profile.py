@@ -0,0 +1,66 @@
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+
+class StartupProfile:
+    """
+    Timings of startup phases.
+
+    Each call to `mark` ends the current phase,
+    the next phase starts right after it.
+    """
+
+    def __init__(self, started_at: Optional[float] = None) -> None:
+        """
+        Start measuring.
+
+        :param started_at: perf_counter value when startup began.
+        """
+        if started_at is None:
+            started_at = perf_counter()
+        self.started_at = started_at
+        self.phases: List[Tuple[str, float]] = []
+        self.first_window_at: Optional[float] = None
+        self._phase_started_at = started_at
+
+    def mark(self, phase: str) -> None:
+        """
+        Finish a phase.
+
+        :param phase: name of the finished phase.
+        """
+        now = perf_counter()
+        self.phases.append((phase, now - self._phase_started_at))
+        self._phase_started_at = now
+
+    def mark_first_window(self) -> None:
+        """Remember when managed windows were sent to X11."""
+        if self.first_window_at is None:
+            self.first_window_at = perf_counter()
+
+    @property
+    def total(self) -> float:
+        """
+        Time spent in all finished phases.
+
+        :return: time in seconds.
+        """
+        return self._phase_started_at - self.started_at
+
+    def report(self) -> str:
+        """
+        Human readable breakdown.
+
+        :return: one line per phase.
+        """
+        first_window_label = "first window"
+        labels = [phase for phase, _ in self.phases]
+        width = max(map(len, [*labels, first_window_label]))
+        lines = ["Startup profile:"]
+        for phase, duration in self.phases:
+            lines.append(f"  {phase:<{width}}  {duration * 1000:8.2f} ms")
+        if self.first_window_at is not None:
+            first_window = (self.first_window_at - self.started_at) * 1000
+            lines.append(f"  {first_window_label:<{width}}  {first_window:8.2f} ms")
+        lines.append(f"  {'total':<{width}}  {self.total * 1000:8.2f} ms")
+        return "\n".join(lines)
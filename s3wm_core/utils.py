@@ -1,11 +1,11 @@
-import re
-import subprocess
 from typing import Optional, Tuple
 
 from loguru import logger
 from Xlib.protocol.display import Screen
 from Xlib.xobject.drawable import Window
 
+from s3wm_core.log import hot_log
+from s3wm_core.screen_geometry import screen_geometry_cache
 from s3wm_core.x_models import WindowGeometry
 
 
@@ -38,7 +38,7 @@ def get_window_geometry(window: Window) -> Optional[WindowGeometry]:
     :returns: WindowGeomerty wrapper around X11 geometry type.
     """
     try:
-        return WindowGeometry.from_orm(window.get_geometry())
+        return WindowGeometry.from_reply(window.get_geometry())
     except Exception as exc:
         logger.exception(exc)
         logger.error(f"Can't get window geometry. Cause: {exc}")
@@ -50,21 +50,15 @@ def get_screen_size(screen: Screen) -> Tuple[int, int]:
     Get current screen size.
 
     Return the dimension (WIDTH, HEIGHT) of the current screen as a
-    tuple in pixels.  If xrandr command exists and either DP (DisplayPort)
-    or HDMI output is active, return its dimensions instead of the current X11 display
-    size.
+    tuple in pixels. Dimensions are taken from the primary RANDR output
+    and cached until the screen configuration changes.
 
     :param screen: current screen.
     :returns: Width and height of current screen.
     """
-    width, height = screen.width_in_pixels, screen.height_in_pixels
-    output = subprocess.getoutput("xrandr --current")
-    # pick the last line including DP- or HDMI-
-    match = re.search(r"(DP-?\d|HDMI-?\d) connected (\d+)x(\d+)", output)
-    if match:
-        width = int(match.group(2))
-        height = int(match.group(3))
-    logger.debug(f"get_screen_size -> w:{width} h:{height}")
+    geom = screen_geometry_cache.get(screen)
+    width, height = geom.width, geom.height
+    hot_log.debug("get_screen_size -> w:{} h:{}", width, height)
     return width, height
 
 
@@ -80,5 +74,5 @@ def get_usable_screen_size(screen: Screen) -> Tuple[int, int]:
     :returns: Width and height of current screen.
     """
     width, height = get_screen_size(screen)
-    logger.debug(f"get_usable_screen_size -> w:{width} h:{height}")
+    hot_log.debug("get_usable_screen_size -> w:{} h:{}", width, height)
     return width, height
@@ -0,0 +1,116 @@
+from typing import Any, Dict, Optional
+
+from Xlib.xobject.drawable import Window
+
+from s3wm_core.utils import get_window_geometry
+from s3wm_core.x_models import WindowGeometry
+
+
+class WindowGeometryCache:
+    """
+    Cached geometry of windows.
+
+    Geometry is updated from ConfigureNotify events
+    and from configure requests sent by the WM itself.
+    The X server is asked only if a window is not in the cache.
+    """
+
+    def __init__(self) -> None:
+        self._geometry: Dict[int, WindowGeometry] = {}
+
+    def get(self, window: Window) -> Optional[WindowGeometry]:
+        """
+        Get window geometry.
+
+        :param window: target window.
+        :return: window geometry.
+        """
+        geom = self._geometry.get(window.id)
+        if geom is None:
+            geom = get_window_geometry(window)
+            if geom is not None:
+                self._geometry[window.id] = geom
+        return geom
+
+    def update(self, window_id: int, **changes: int) -> None:
+        """
+        Update cached window geometry.
+
+        Windows that are not in the cache are skipped,
+        they will be requested from the server on the next read.
+
+        :param window_id: id of a window.
+        :param changes: geometry fields to update.
+        """
+        geom = self._geometry.get(window_id)
+        if geom is not None:
+            self._geometry[window_id] = geom._replace(**changes)  # noqa: WPS437
+
+    def store(  # noqa: WPS211
+        self,
+        window_id: int,
+        x: int,  # noqa: WPS111
+        y: int,  # noqa: WPS111
+        width: int,
+        height: int,
+        border_width: Optional[int] = None,
+    ) -> None:
+        """
+        Save window rectangle.
+
+        Unlike `update`, windows that are not in the cache are added.
+        Border width, depth and sequence number of new entries
+        are unknown and set to zero, unless border width is passed.
+
+        :param window_id: id of a window.
+        :param x: top left corner x coordinate.
+        :param y: top left corner y coordinate.
+        :param width: window width.
+        :param height: window height.
+        :param border_width: window border width, kept if not passed.
+        """
+        geom = self._geometry.get(window_id)
+        if geom is None:
+            geom = WindowGeometry(
+                x=x,
+                y=y,
+                width=width,
+                height=height,
+                border_width=border_width or 0,
+                depth=0,
+                sequence_number=0,
+            )
+        else:
+            geom = geom._replace(x=x, y=y, width=width, height=height)  # noqa: WPS437
+            if border_width is not None:
+                geom = geom._replace(border_width=border_width)  # noqa: WPS437
+        self._geometry[window_id] = geom
+
+    def handle_configure(self, event: Any) -> None:
+        """
+        Save geometry from ConfigureNotify event.
+
+        :param event: X11 ConfigureNotify event.
+        """
+        self.store(
+            event.window.id,
+            x=event.x,
+            y=event.y,
+            width=event.width,
+            height=event.height,
+            border_width=event.border_width,
+        )
+
+    def forget(self, window_id: int) -> None:
+        """
+        Remove window from the cache.
+
+        :param window_id: id of a window.
+        """
+        self._geometry.pop(window_id, None)
+
+    def __len__(self) -> int:
+        return len(self._geometry)
+
+
+window_geometry_cache = WindowGeometryCache()
@@ -0,0 +1,184 @@
+"""
+Pipelined queries for many windows.
+
+Every request for all windows is sent before any reply is read,
+so querying N windows costs about one round trip instead of 3N.
+"""
+from typing import (
+    Any,
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from loguru import logger
+from Xlib import Xatom
+from Xlib.error import XError
+from Xlib.protocol import request
+from Xlib.xobject.drawable import Window
+
+from s3wm_core.x_models import XMapState, XWindowAttributes, XWMState
+
+T = TypeVar("T")
+
+# WM_STATE is two CARD32: state and icon window.
+WM_STATE_LENGTH = 2
+
+
+class WindowInfo(NamedTuple):
+    """Attributes and ICCCM properties of a window."""
+
+    window: Window
+    attributes: Optional[XWindowAttributes]
+    wm_state: Optional[XWMState]
+    transient_for: Optional[Window]
+    # First error received for this window, if any.
+    error: Optional[XError]
+
+    @property
+    def is_viewable(self) -> bool:
+        """
+        Whether window is visible or minimized by its client.
+
+        :return: True if window should be managed.
+        """
+        if self.attributes is None or self.wm_state is None:
+            return False
+        return (  # noqa: WPS337
+            self.attributes.map_state == XMapState.IsViewable
+            or self.wm_state == XWMState.IconicState
+        )
+
+
+def parse_wm_state(reply: Any) -> Optional[XWMState]:
+    """
+    Get state from WM_STATE property reply.
+
+    :param reply: X11 GetProperty reply.
+    :return: window state if property is set and valid.
+    """
+    if not reply.property_type:
+        return None
+    value_format, value = reply.value
+    if value_format != 32 or len(value) < WM_STATE_LENGTH:  # noqa: WPS432
+        return None
+    try:
+        return XWMState(value[0])
+    except ValueError:
+        return None
+
+
+def parse_window_id(reply: Any) -> Optional[int]:
+    """
+    Get window id from a WINDOW property reply.
+
+    :param reply: X11 GetProperty reply.
+    :return: window id if property is set.
+    """
+    if not reply.property_type:
+        return None
+    value_format, value = reply.value
+    if value_format != 32 or not value or not value[0]:  # noqa: WPS432
+        return None
+    return int(value[0])
+
+
+def send_queries(window: Window, wm_state_atom: int) -> Tuple[Any, Any, Any]:
+    """
+    Send requests for a window without waiting for replies.
+
+    :param window: X11 window.
+    :param wm_state_atom: WM_STATE atom.
+    :return: deferred GetWindowAttributes, WM_STATE
+        and WM_TRANSIENT_FOR requests.
+    """
+    display = window.display
+    return (
+        request.GetWindowAttributes(
+            display=display,
+            defer=True,
+            window=window.id,
+        ),
+        request.GetProperty(
+            display=display,
+            defer=True,
+            delete=False,
+            window=window.id,
+            property=wm_state_atom,
+            type=wm_state_atom,
+            long_offset=0,
+            long_length=WM_STATE_LENGTH,
+        ),
+        request.GetProperty(
+            display=display,
+            defer=True,
+            delete=False,
+            window=window.id,
+            property=Xatom.WM_TRANSIENT_FOR,
+            type=Xatom.WINDOW,
+            long_offset=0,
+            long_length=1,
+        ),
+    )
+
+
+def read_reply(
+    deferred: Any,
+    parse: Callable[[Any], Optional[T]],
+) -> Tuple[Optional[T], Optional[XError]]:
+    """
+    Wait for reply of a deferred request and parse it.
+
+    :param deferred: request sent with `defer=True`.
+    :param parse: function that converts the reply.
+    :return: parsed reply or the error received instead.
+    """
+    try:
+        deferred.reply()
+    except XError as err:
+        return None, err
+    return parse(deferred), None
+
+
+def collect_info(window: Window, queries: Tuple[Any, Any, Any]) -> WindowInfo:
+    """
+    Read replies for a window.
+
+    :param window: X11 window.
+    :param queries: requests returned by `send_queries`.
+    :return: information about the window.
+    """
+    attrs_request, state_request, transient_request = queries
+    attributes, attrs_err = read_reply(attrs_request, XWindowAttributes.from_reply)
+    wm_state, state_err = read_reply(state_request, parse_wm_state)
+    transient_id, transient_err = read_reply(transient_request, parse_window_id)
+    transient_for = None
+    if transient_id is not None:
+        window_class = window.display.get_resource_class("window", Window)
+        transient_for = window_class(window.display, transient_id)
+    error = attrs_err or state_err or transient_err
+    if error is not None:
+        logger.debug(f"Can't query window {window.id}. Cause: {error}")
+    return WindowInfo(window, attributes, wm_state, transient_for, error)
+
+
+def query_windows(windows: Sequence[Window]) -> List[WindowInfo]:
+    """
+    Get attributes, WM_STATE and WM_TRANSIENT_FOR of windows.
+
+    Errors, like BadWindow for windows that were
+    destroyed meanwhile, are returned in `WindowInfo.error`
+    instead of being raised.
+
+    :param windows: X11 windows from the same display.
+    :return: information about windows in the same order.
+    """
+    if not windows:
+        return []
+    wm_state_atom = windows[0].display.get_atom("WM_STATE")
+    pending = [(window, send_queries(window, wm_state_atom)) for window in windows]
+    return [collect_info(window, queries) for window, queries in pending]
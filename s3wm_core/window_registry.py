@@ -0,0 +1,74 @@
+from typing import Any, Dict, Iterator, Optional
+
+from s3wm_core.s3window import S3window
+
+
+class WindowRegistry:
+    """
+    Registry of managed windows.
+
+    Maps X11 window id to the canonical S3window
+    and to the object that owns it (e.g. layout's tab).
+    """
+
+    def __init__(self) -> None:
+        self._windows: Dict[int, S3window] = {}
+        self._owners: Dict[int, Any] = {}
+
+    def add(self, window: S3window) -> S3window:
+        """
+        Register window.
+
+        :param window: new window.
+        :return: canonical window for this id.
+        """
+        return self._windows.setdefault(window.id, window)
+
+    def get(self, window_id: int) -> Optional[S3window]:
+        """
+        Find registered window by id.
+
+        :param window_id: X11 window id.
+        :return: registered window if any.
+        """
+        return self._windows.get(window_id)
+
+    def remove(self, window_id: int) -> Optional[S3window]:
+        """
+        Remove window from the registry.
+
+        :param window_id: X11 window id.
+        :return: removed window if any.
+        """
+        self._owners.pop(window_id, None)
+        return self._windows.pop(window_id, None)
+
+    def get_owner(self, window_id: int) -> Any:
+        """
+        Get an object that owns the window.
+
+        :param window_id: X11 window id.
+        :return: window owner or None.
+        """
+        return self._owners.get(window_id)
+
+    def set_owner(self, window_id: int, owner: Any) -> None:
+        """
+        Set an owner of the window.
+
+        :param window_id: X11 window id.
+        :param owner: new owner. None removes current owner.
+        """
+        if owner is None:
+            self._owners.pop(window_id, None)
+        elif window_id in self._windows:
+            self._owners[window_id] = owner
+
+    def __contains__(self, window_id: object) -> bool:
+        return window_id in self._windows
+
+    def __iter__(self) -> Iterator[S3window]:
+        return iter(list(self._windows.values()))
+
+    def __len__(self) -> int:
+        return len(self._windows)
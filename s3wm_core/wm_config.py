@@ -2,12 +2,20 @@
 import sys
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
+from types import ModuleType
+from typing import Optional
 
 from loguru import logger
 from Xlib import X
 
 from s3wm.layouts import DefaultTile
-from s3wm_core import KeyCombination, kill_wm
+from s3wm_core import (
+    KeyCombination,
+    kill_wm,
+    reload_config,
+    restart_wm,
+    run_prompt,
+)
 
 
 def startup() -> None:
@@ -37,28 +45,77 @@ combinations = [
         key="q",
         action=kill_wm,
     ),
+    KeyCombination(
+        modifiers=KeyCombination.default_mod_key | X.ShiftMask,
+        key="r",
+        action=restart_wm,
+    ),
+    KeyCombination(
+        modifiers=KeyCombination.default_mod_key | X.ShiftMask,
+        key="e",
+        action=reload_config,
+    ),
     KeyCombination(
         modifiers=KeyCombination.default_mod_key,
         key="d",
-        action="dmenu_run",
+        action=run_prompt,
     ),
     *layout.get_keys(),
 ]
 
 
+# Kept to be used if reloaded user config doesn't define combinations.
+default_combinations = combinations
+
 # Importing user_config bt absolute path.
 module_name = "user_config"
 conf_path = Path("~/.s3wm_conf.py").expanduser()
 
-try:
+
+def load_user_config() -> Optional[ModuleType]:
+    """
+    Execute user config in a fresh module.
+
+    :return: executed module or None if there is no config.
+    """
     if not conf_path.exists():
-        raise ImportError
+        return None
     spec = spec_from_file_location(module_name, str(conf_path))
+    if spec is None or not spec.loader:
+        return None
     module = module_from_spec(spec)
-    if not spec.loader:
-        raise ImportError
+    previous = sys.modules.get(module_name)
     sys.modules[module_name] = module
-    spec.loader.exec_module(module)  # type: ignore
-    from user_config import *  # noqa: F401, F403, WPS347, WPS433
-except ImportError:
-    logger.error("Can't import user config. Initialized with default.")
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        # Broken config must not replace the working one.
+        if previous is None:
+            sys.modules.pop(module_name, None)
+        else:
+            sys.modules[module_name] = previous
+        raise
+    return module
+
+
+def apply_user_config() -> bool:
+    """
+    Override defaults with names from user config.
+
+    It's called by the WM at startup, so importing this module
+    doesn't execute user code.
+
+    :return: True if user config was loaded.
+    """
+    try:
+        module = load_user_config()
+    except ImportError:
+        module = None
+    if module is None:
+        logger.error("Can't import user config. Initialized with default.")
+        return False
+    names = getattr(module, "__all__", None)
+    if names is None:
+        names = [name for name in vars(module) if not name.startswith("_")]
+    globals().update({name: getattr(module, name) for name in names})
+    return True
@@ -1,11 +1,10 @@
 from enum import Enum, unique
-from typing import Union
+from typing import Any, NamedTuple, Union
 
-from pydantic import BaseConfig, BaseModel
 from Xlib.xobject.colormap import Colormap
 
 
-class WindowGeometry(BaseModel):
+class WindowGeometry(NamedTuple):
     """X11 window geometry abstraction."""
 
     x: int  # noqa: WPS111
@@ -16,23 +15,31 @@ class WindowGeometry(BaseModel):
     depth: int
     sequence_number: int
 
-    class Config(BaseConfig):
-        """Model config."""
-
-        orm_mode = True
-
-
-class ScreenGeometry(BaseModel):
+    @classmethod
+    def from_reply(cls, reply: Any) -> "WindowGeometry":
+        """
+        Build geometry from X11 GetGeometry reply.
+
+        :param reply: X11 reply.
+        :return: window geometry.
+        """
+        return cls(
+            reply.x,
+            reply.y,
+            reply.width,
+            reply.height,
+            reply.border_width,
+            reply.depth,
+            reply.sequence_number,
+        )
+
+
+class ScreenGeometry(NamedTuple):
     """Screen geometry parameters."""
 
     width: int
     height: int
 
-    class Config(BaseConfig):
-        """Model config."""
-
-        orm_mode = True
-
 
 @unique
 class XMapState(Enum):
@@ -52,7 +59,7 @@ class XWMState(Enum):
     IconicState = 3  # application wants to start as an icon
 
 
-class XWindowAttributes(BaseModel):
+class XWindowAttributes(NamedTuple):
     """X11 window attributes."""
 
     backing_store: int
@@ -71,8 +78,28 @@ class XWindowAttributes(BaseModel):
     your_event_mask: int
     do_not_propagate_mask: int
 
-    class Config(BaseConfig):
-        """Model config."""
-
-        orm_mode = True
-        arbitrary_types_allowed = True
+    @classmethod
+    def from_reply(cls, reply: Any) -> "XWindowAttributes":
+        """
+        Build attributes from X11 GetWindowAttributes reply.
+
+        :param reply: X11 reply.
+        :return: window attributes.
+        """
+        return cls(
+            reply.backing_store,
+            reply.sequence_number,
+            reply.visual,
+            reply.bit_gravity,
+            reply.win_gravity,
+            reply.backing_bit_planes,
+            reply.backing_pixel,
+            reply.save_under,
+            reply.map_is_installed,
+            XMapState(reply.map_state),
+            bool(reply.override_redirect),
+            reply.colormap,
+            reply.all_event_masks,
+            reply.your_event_mask,
+            reply.do_not_propagate_mask,
+        )